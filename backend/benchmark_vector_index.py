@@ -0,0 +1,69 @@
+"""
+Script to benchmark the occupation vector index.
+
+Queries are synthetic resumes: a few task statements and technologies of a
+random occupation. Reports, for each number of probed IVF cells, recall@k
+against brute-force search over the same vectors and the mean search time,
+plus how often the source occupation ranks in the top k.
+"""
+import os
+import sys
+import random
+import time
+
+# Allow running as `python backend/benchmark_vector_index.py` from the repo root
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.onet_service import OnetService
+
+
+def synthetic_resumes(service, count=500, tasks=4, technologies=6, seed=0):
+    """(occupation code, resume text) pairs"""
+    rng = random.Random(seed)
+    codes = [code for code in service.occupations if service.tasks.get(code)]
+    resumes = []
+    for code in rng.sample(codes, min(count, len(codes))):
+        statements = service.tasks[code]
+        lines = rng.sample(statements, min(tasks, len(statements)))
+        lines.append(", ".join(service.technology_index.technology_names(code)[:technologies]))
+        resumes.append((code, "\n".join(lines)))
+    return resumes
+
+
+def mean_microseconds(search, queries):
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / max(len(queries), 1) * 1e6
+
+
+def benchmark(k=10, probes=(1, 2, 4, 8, 12, 16)):
+    service = OnetService()
+    index = service.vector_index
+    if not len(index):
+        print(f"No O*NET data loaded ({service.load_error}); nothing to benchmark.")
+        return False
+    print(f"Index: {index.info()}")
+
+    resumes = synthetic_resumes(service)
+    start = time.perf_counter()
+    queries = [index.vectorize(text) for _, text in resumes]
+    print(f"Vectorize: {(time.perf_counter() - start) / len(resumes) * 1e6:.0f}us per resume")
+    pairs = [(code, query) for (code, _), query in zip(resumes, queries) if query is not None]
+    queries = [query for _, query in pairs]
+
+    exact_us = mean_microseconds(lambda q: index.search_vector(q, k, exact=True), queries)
+    hits = sum(code in {m.occupation_code for m in index.search_vector(query, k, exact=True)}
+               for code, query in pairs)
+    print(f"Brute force: {exact_us:.0f}us, source occupation in top {k}: {hits / len(pairs):.3f}")
+    for n in probes:
+        if n > len(index.centroids):
+            break
+        recall = index.recall(queries, k, n)
+        ivf_us = mean_microseconds(lambda q: index.search_vector(q, k, n, exact=False), queries)
+        print(f"IVF probes={n:>2}/{len(index.centroids)}: recall@{k} {recall:.3f}, {ivf_us:.0f}us")
+    return True
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,55 @@
+"""
+Script to compile the O*NET data into a binary snapshot.
+
+The snapshot is memory-mapped by OnetService at start-up instead of parsing
+the source files. Re-run after updating the O*NET data; a snapshot built
+from other source files (by name, size and modification time) is detected
+and ignored. The payload checksum is verified here, not at every start-up.
+With --if-stale, an existing up-to-date snapshot is kept.
+"""
+import os
+import sys
+import time
+import argparse
+
+# Allow running as `python backend/build_onet_snapshot.py` from the repo root
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.onet_service import OnetService, SNAPSHOT_PATH
+
+
+def build_snapshot(path=SNAPSHOT_PATH):
+    start = time.perf_counter()
+    service = OnetService(use_snapshot=False)
+    if not service.occupations:
+        print(f"No O*NET data loaded ({service.load_error}); snapshot not written.")
+        return False
+
+    service.write_snapshot(path)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {path} ({path.stat().st_size:,} bytes) in {elapsed:.2f}s")
+
+    start = time.perf_counter()
+    OnetService()
+    print(f"Snapshot cold load: {(time.perf_counter() - start) * 1000:.1f}ms")
+    return True
+
+
+def ensure_snapshot():
+    """Map the snapshot, compiling it only if missing or stale, as each worker does at start-up"""
+    start = time.perf_counter()
+    service = OnetService()
+    print(f"O*NET data from {service.data_path} in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return bool(service.occupations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--if-stale", action="store_true", help="keep an up-to-date snapshot")
+    args = parser.parse_args(argv)
+    return ensure_snapshot() if args.if_stale else build_snapshot()
+
+
+if __name__ == "__main__":
+    # A missing snapshot is not fatal: OnetService falls back to the source files
+    main()
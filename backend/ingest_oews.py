@@ -0,0 +1,91 @@
+"""
+Script to load the BLS OEWS national wage table into the local BLS store.
+
+Download the national XLSX release (oesm<yy>nat.zip) from
+https://www.bls.gov/oes/tables.htm into backend/data/bls, or pass
+--download. A failed download falls back to the newest table already in
+backend/data/bls. Once loaded, wage lookups for every occupation are served
+from the store with no BLS API calls. Re-run when a new May release comes out.
+"""
+import os
+import sys
+import time
+import zipfile
+import argparse
+from pathlib import Path
+
+import requests
+
+# Allow running as `python backend/ingest_oews.py` from the repo root
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.bls_store import STORE_PATH, BLSStore
+from services.oews_loader import read_oews_table
+
+OEWS_URL = "https://www.bls.gov/oes/special-requests/oesm24nat.zip"
+DATA_DIR = STORE_PATH.parent
+
+
+def find_table(directory=DATA_DIR):
+    """Newest OEWS national table in `directory`, if any"""
+    candidates = sorted(
+        list(directory.glob("oesm*nat.zip")) + list(directory.glob("national_M*_dl.*")),
+        key=lambda p: p.stat().st_mtime, reverse=True
+    )
+    return candidates[0] if candidates else None
+
+
+def download_table(url=OEWS_URL, directory=DATA_DIR):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / url.rsplit("/", 1)[-1]
+    print(f"Downloading OEWS national table from {url}...")
+    # bls.gov rejects requests without an identifying User-Agent
+    response = requests.get(url, headers={"User-Agent": "KalmSkills/1.0 (contact@kalmskills.ai)"}, timeout=120)
+    response.raise_for_status()
+    # Written aside and checked first, so an error page never replaces a cached table
+    partial = path.with_name(path.name + ".part")
+    partial.write_bytes(response.content)
+    try:
+        if not zipfile.is_zipfile(partial):
+            raise ValueError(f"{url} did not return a zip archive")
+        partial.replace(path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return path
+
+
+def ingest(path, store_path=STORE_PATH):
+    start = time.perf_counter()
+    store = BLSStore(store_path)
+    count = store.replace_oews_wages(read_oews_table(path))
+    store.close()
+    print(f"Loaded {count} OEWS occupations from {path} in {time.perf_counter() - start:.2f}s")
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", nargs="?", type=Path, help="OEWS national .zip, .xlsx or .csv")
+    parser.add_argument("--download", action="store_true", help=f"fetch {OEWS_URL} first")
+    args = parser.parse_args(argv)
+
+    path = args.path
+    if path is None and args.download:
+        try:
+            path = download_table()
+        except (OSError, ValueError, requests.RequestException) as e:
+            print(f"Could not download the OEWS table ({e}); using the cached table if any.")
+    try:
+        path = path or find_table()
+        if path is None:
+            print(f"No OEWS table found in {DATA_DIR}; wages will come from the BLS API.")
+            return False
+        return ingest(path) > 0
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"Error loading OEWS table: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    # A missing wage table is not fatal: wage lookups fall back to the BLS API
+    main()
@@ -4,11 +4,15 @@ Provides REST API endpoints for React frontend
 NO API KEYS REQUIRED - Uses free public APIs
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from typing import Iterable, List, Optional
+from pydantic import BaseModel, ValidationError
+from dataclasses import asdict
 import logging
+import json
+import asyncio
 import sys
 import os
 
@@ -17,13 +21,17 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from services.onet_service import OnetService, Skill, Occupation
-    from services.sec_service import SECService, CompanyHealth
-    from services.bls_service import BLSService
+    from services.skill_matrix import SkillMatch
+    from services.batch_matcher import BatchMatcher, BatchStats
+    from services.sec_service import SECService, CompanyHealth, CompanyInfo
+    from services.bls_service import BLSService, WageData
 except ImportError:
     # Fallback for when running as a module from root
     from backend.services.onet_service import OnetService, Skill, Occupation
-    from backend.services.sec_service import SECService, CompanyHealth
-    from backend.services.bls_service import BLSService
+    from backend.services.skill_matrix import SkillMatch
+    from backend.services.batch_matcher import BatchMatcher, BatchStats
+    from backend.services.sec_service import SECService, CompanyHealth, CompanyInfo
+    from backend.services.bls_service import BLSService, WageData
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -53,6 +61,32 @@ app.add_middleware(
 onet_service = OnetService()
 sec_service = SECService()
 bls_service = BLSService()  # Works without key (25 queries/day)
+batch_matcher = BatchMatcher(onet_service)
+
+# The match pool is forked on the first /api/match/batch call, not here:
+# web workers that never serve a batch should not each hold a pool
+@app.on_event("shutdown")
+def shutdown_batch_matcher():
+    batch_matcher.shutdown()
+
+@app.on_event("startup")
+def start_company_refresh():
+    # Match workers forked later only run matrix code, never the directory
+    sec_service.directory.start_refresh()
+
+@app.on_event("shutdown")
+def stop_company_refresh():
+    sec_service.directory.stop_refresh()
+
+@app.on_event("startup")
+async def start_bls_refresher():
+    bls_service.start_refresher()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    bls_service.stop_refresher()
+    await sec_service.aclose()
+    await bls_service.aclose()
 
 # Pydantic models for API responses
 class SkillResponse(BaseModel):
@@ -136,27 +170,112 @@ async def debug_info():
         "onet_service": {
             "occupations_loaded": len(onet_service.occupations),
             "skills_loaded": len(onet_service.skills_data),
+            "elements_loaded": {category: len(table) for category, table in onet_service.elements.items()},
             "load_error": onet_service.load_error,
-            "data_path_used": onet_service.data_path
+            "data_path_used": onet_service.data_path,
+            "load_timings": onet_service.load_timings,
+            "related_occupations": onet_service.occupation_graph.info(),
+            "similar_occupations": onet_service.occupation_similarity.info(),
+            "title_index": onet_service.title_index.info(),
+            "technology_index": onet_service.technology_index.info(),
+            "task_index": onet_service.task_index.info(),
+            "vector_index": onet_service.vector_index.info(),
+            "skill_normalizer": onet_service.skill_normalizer.info()
         },
-        "test_search": onet_service.search_occupations("construction work")[:2]
+        "sec_service": {
+            "submissions_cache": sec_service.submissions_cache.info()
+        },
+        "bls_service": {
+            "batcher": bls_service.batcher.info(),
+            "store": bls_service.store.info()
+        },
+        "test_search": onet_service.search_occupations("construction work", limit=2)
     }
 
+# Streamed responses: "ndjson" sends one JSON document per line,
+# "json-array" one JSON array whose elements are flushed as they are made
+# (chunked transfer). Either way rows come from a generator, so the first
+# row goes out before the last is built and the payload is never held whole.
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "json-array": "application/json"}
+DEFAULT_LIMIT = 10  # results per page when not streaming
+
+def _check_format(format: str):
+    if format != "json" and format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400,
+                            detail=f"format must be json or one of {', '.join(STREAM_FORMATS)}")
+
+def _stream_chunk(row: dict, index: int, format: str) -> str:
+    """Row `index` of a stream: an NDJSON line, or the next array element"""
+    if format == "ndjson":
+        return json.dumps(row) + "\n"
+    return ("[" if index == 0 else ",\n") + json.dumps(row)
+
+def _stream_end(count: int, format: str) -> str:
+    if format == "ndjson":
+        return ""
+    return "]\n" if count else "[]\n"
+
+def _stream_rows(rows: Iterable[dict], format: str) -> StreamingResponse:
+    """
+    Stream rows from a (sync) generator; Starlette runs it in a worker
+    thread. An error after the first row can no longer change the status,
+    so it is sent as a final {"error"} row.
+    """
+    def chunks():
+        count = 0
+        try:
+            for row in rows:
+                yield _stream_chunk(row, count, format)
+                count += 1
+        except Exception as e:
+            logger.error(f"Error streaming results: {e}")
+            yield _stream_chunk({"error": str(e)}, count, format)
+            count += 1
+        yield _stream_end(count, format)
+
+    return StreamingResponse(chunks(), media_type=STREAM_FORMATS[format])
+
 # O*NET Endpoints
 @app.get("/api/occupations/search")
-async def search_occupations(q: str, limit: int = 10):
-    """Search for occupations by keyword"""
+async def search_occupations(q: str = "", limit: Optional[int] = None, offset: int = 0,
+                             include_skills: bool = False, format: str = "json"):
+    """
+    Search for occupations by keyword; a blank q lists every occupation
+
+    With format=ndjson or format=json-array the result rows are streamed,
+    and every match is returned unless a limit is given (so the full
+    occupation list is one request).
+    """
+    _check_format(format)
+    if format != "json":
+        return _stream_rows(onet_service.iter_occupations(
+            q, limit=None if limit is None else max(limit, 0), offset=max(offset, 0),
+            include_skills=include_skills
+        ), format)
     try:
-        results = onet_service.search_occupations(q)
+        results = onet_service.search_occupations(
+            q, limit=DEFAULT_LIMIT if limit is None else max(limit, 0), offset=max(offset, 0),
+            include_skills=include_skills
+        )
         return {
             "query": q,
-            "count": len(results[:limit]),
-            "results": results[:limit]
+            "offset": offset,
+            "count": len(results),
+            "results": results
         }
     except Exception as e:
         logger.error(f"Error searching occupations: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _serialize_element(skill: Skill) -> dict:
+    return {
+        "id": skill.id,
+        "name": skill.name,
+        "description": skill.description,
+        "level": skill.level,
+        "importance": skill.importance
+    }
+
 @app.get("/api/occupations/{onet_code}")
 async def get_occupation(onet_code: str):
     """Get detailed information about an occupation"""
@@ -170,16 +289,12 @@ async def get_occupation(onet_code: str):
             "title": occupation.title,
             "description": occupation.description,
             "education_level": occupation.education_level,
-            "skills": [
-                {
-                    "id": skill.id,
-                    "name": skill.name,
-                    "description": skill.description,
-                    "level": skill.level,
-                    "importance": skill.importance
-                }
-                for skill in occupation.skills
-            ]
+            "skills": [_serialize_element(skill) for skill in occupation.skills],
+            "knowledge": [_serialize_element(element) for element in occupation.knowledge],
+            "abilities": [_serialize_element(element) for element in occupation.abilities],
+            "work_styles": [_serialize_element(element) for element in occupation.work_styles],
+            "interests": [_serialize_element(element) for element in occupation.interests],
+            "tasks": occupation.tasks
         }
     except HTTPException:
         raise
@@ -212,37 +327,109 @@ async def get_occupation_skills(onet_code: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/occupations/{onet_code}/technology")
-async def get_technology_skills(onet_code: str):
-    """Get technology/tool skills for an occupation"""
+async def get_technology_skills(onet_code: str, include_tools: bool = False):
+    """Get technology/tool skills for an occupation, hot and in-demand first"""
     try:
-        tech_skills = onet_service.get_technology_skills(onet_code)
+        details = onet_service.get_technology_details(onet_code, include_tools)
         return {
             "occupation_code": onet_code,
-            "count": len(tech_skills),
-            "technologies": tech_skills
+            "count": len(details),
+            "technologies": [entry["name"] for entry in details],
+            "details": details
         }
     except Exception as e:
         logger.error(f"Error fetching technology skills: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/occupations/{onet_code}/related")
+async def get_related_occupations(onet_code: str, hops: int = 1, max_tier: Optional[str] = None,
+                                  limit: int = 50):
+    """Related occupations up to `hops` steps away (O*NET Related Occupations)"""
+    if not 1 <= hops <= 4:
+        raise HTTPException(status_code=400, detail="hops must be between 1 and 4")
+    try:
+        related = onet_service.get_related_occupations(onet_code, hops, max_tier, max(limit, 0))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "occupation_code": onet_code,
+        "hops": hops,
+        "count": len(related),
+        "results": related
+    }
+
+@app.get("/api/occupations/{onet_code}/similar")
+async def get_similar_occupations(onet_code: str, limit: int = 10):
+    """Occupations with the most similar skill and knowledge profiles (precomputed)"""
+    if onet_code not in onet_service.occupations:
+        raise HTTPException(status_code=404, detail="Occupation not found")
+    similar = onet_service.get_similar_occupations(onet_code, max(limit, 0))
+    return {
+        "occupation_code": onet_code,
+        "count": len(similar),
+        "results": similar
+    }
+
+@app.get("/api/occupations/{onet_code}/path/{target_code}")
+async def get_career_path(onet_code: str, target_code: str, max_tier: Optional[str] = None):
+    """Cheapest career path between two occupations through related occupations"""
+    try:
+        path = onet_service.get_career_path(onet_code, target_code, max_tier)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if path is None:
+        raise HTTPException(status_code=404, detail="No path between these occupations")
+    return {"from": onet_code, "to": target_code, **path}
+
+@app.get("/api/technologies/{name}/occupations")
+async def get_technology_occupations(name: str, hot_only: bool = False):
+    """Occupations that use a technology or tool (e.g. Kubernetes)"""
+    occupations = onet_service.find_occupations_by_technology(name, hot_only)
+    return {
+        "technology": name,
+        "count": len(occupations),
+        "results": occupations
+    }
+
 # SEC Endpoints
+def _serialize_company(company: CompanyInfo) -> dict:
+    return {
+        "cik": company.cik,
+        "name": company.name,
+        "ticker": company.ticker,
+        "industry": company.industry
+    }
+
+def _require_company_listing():
+    """
+    503 with Retry-After until the SEC company listing has loaded, so
+    clients don't cache "not found" for companies we just can't see yet
+    """
+    directory = sec_service.directory
+    if not directory.ready:
+        raise HTTPException(status_code=503,
+                            detail=directory.error or "SEC company listing is still loading",
+                            headers={"Retry-After": str(directory.retry_after())})
+
 @app.get("/api/companies/search")
-async def search_companies(q: str, limit: int = 10):
-    """Search for companies by name"""
+async def search_companies(q: str, limit: Optional[int] = None, format: str = "json"):
+    """
+    Search-as-you-type for companies by name or ticker, tolerating typos
+
+    format=ndjson or format=json-array streams the rows and, without a
+    limit, returns every match.
+    """
+    _check_format(format)
+    _require_company_listing()
+    if format != "json":
+        return _stream_rows((_serialize_company(c) for c in sec_service.iter_companies(
+            q, None if limit is None else max(limit, 0))), format)
     try:
-        companies = sec_service.search_companies(q, limit)
+        companies = sec_service.search_companies(q, DEFAULT_LIMIT if limit is None else max(limit, 0))
         return {
             "query": q,
             "count": len(companies),
-            "results": [
-                {
-                    "cik": c.cik,
-                    "name": c.name,
-                    "ticker": c.ticker,
-                    "industry": c.industry
-                }
-                for c in companies
-            ]
+            "results": [_serialize_company(c) for c in companies]
         }
     except Exception as e:
         logger.error(f"Error searching companies: {e}")
@@ -251,6 +438,7 @@ async def search_companies(q: str, limit: int = 10):
 @app.get("/api/companies/ticker/{ticker}")
 async def get_company_by_ticker(ticker: str):
     """Get company information by stock ticker"""
+    _require_company_listing()
     try:
         company = sec_service.get_company_by_ticker(ticker)
         if not company:
@@ -273,7 +461,7 @@ async def get_company_by_ticker(ticker: str):
 async def get_company_health(cik: str):
     """Analyze company health based on SEC filings"""
     try:
-        health = sec_service.analyze_company_health(cik)
+        health = await sec_service.analyze_company_health_async(cik)
         if not health:
             raise HTTPException(status_code=404, detail="Company data not found")
         
@@ -295,22 +483,61 @@ async def get_company_health(cik: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 # BLS Endpoints (works without key, limited to 25 queries/day)
+def _serialize_wages(wages: WageData) -> dict:
+    def annual(hourly):
+        return round(hourly * 2080, 2) if hourly is not None else None  # Convert hourly to annual
+    
+    return {
+        "occupation_code": wages.occupation_code,
+        "occupation_title": wages.occupation_title,
+        "median_hourly": wages.median_wage,
+        "median_annual": annual(wages.median_wage),
+        "mean_hourly": wages.mean_wage,
+        "mean_annual": annual(wages.mean_wage),
+        "percentiles_hourly": {
+            "10": wages.percentile_10,
+            "25": wages.percentile_25,
+            "50": wages.median_wage,
+            "75": wages.percentile_75,
+            "90": wages.percentile_90
+        },
+        "total_employment": wages.total_employment,
+        "year": wages.year
+    }
+
+@app.get("/api/wages")
+async def get_wages_bulk(codes: str):
+    """
+    Wage data for many occupations at once (comma-separated SOC or O*NET codes)
+    
+    Served entirely from the ingested OEWS table (backend/ingest_oews.py),
+    without BLS API calls; codes with no OEWS row are listed in "missing".
+    """
+    requested = list(dict.fromkeys(code.strip() for code in codes.split(",") if code.strip()))
+    if not requested:
+        raise HTTPException(status_code=400, detail="No occupation codes given")
+    if len(requested) > 2000:
+        raise HTTPException(status_code=400, detail="At most 2000 codes per request")
+    
+    wages = await asyncio.to_thread(bls_service.get_wages_bulk, requested)
+    return {
+        "count": len(wages),
+        "results": {code: _serialize_wages(w) for code, w in wages.items()},
+        "missing": [code for code in requested if code not in wages]
+    }
+
 @app.get("/api/wages/{occupation_code}")
 async def get_wages(occupation_code: str):
     """Get wage data for an occupation (BLS)"""
     try:
-        wages = bls_service.get_occupation_wages(occupation_code)
-        if not wages:
+        wages = await bls_service.get_occupation_wages_async(occupation_code)
+        if not wages or wages.median_wage is None:
             raise HTTPException(status_code=404, detail="Wage data not found")
         
-        annual_salary = wages.median_wage * 2080  # Convert hourly to annual
-        
         return {
-            "occupation_code": wages.occupation_code,
-            "occupation_title": wages.occupation_title,
-            "median_hourly": wages.median_wage,
-            "median_annual": round(annual_salary, 2),
-            "note": "Using BLS API without key (25 queries/day limit)"
+            **_serialize_wages(wages),
+            "note": (f"BLS OEWS national estimates, May {wages.year}" if wages.year
+                     else "Using BLS API without key (25 queries/day limit)")
         }
     except HTTPException:
         raise
@@ -322,7 +549,7 @@ async def get_wages(occupation_code: str):
 async def get_unemployment():
     """Get current national unemployment rate"""
     try:
-        rate = bls_service.get_unemployment_rate()
+        rate = await bls_service.get_unemployment_rate_async()
         if rate is None:
             raise HTTPException(status_code=503, detail="Unable to fetch unemployment data")
         
@@ -340,49 +567,54 @@ async def get_unemployment():
 class MatchRequest(BaseModel):
     resume_skills: List[str]
     target_occupation: Optional[str] = None
+    top_n: int = 10
+
+def _recommendation(match_score: int) -> str:
+    return "Strong match" if match_score >= 70 else "Consider upskilling" if match_score >= 40 else "Significant skill gap"
+
+def _serialize_match(match: SkillMatch) -> dict:
+    occupation = onet_service.occupations.get(match.occupation_code)
+    return {
+        "occupation_code": match.occupation_code,
+        "occupation_title": occupation["title"] if occupation else "Unknown",
+        "match_score": match.match_score,
+        "matched_skills": match.matched_skills,
+        "matched_technologies": match.matched_technologies,
+        "missing_skills": [gap.name for gap in match.missing_skills[:10]],  # Limit to top 10
+        "skill_gaps": [
+            {
+                "id": gap.id,
+                "name": gap.name,
+                "importance": gap.importance,
+                "level": gap.level,
+                "category": gap.category
+            }
+            for gap in match.missing_skills
+        ],
+        "recommendation": _recommendation(match.match_score)
+    }
 
 # Resume Matching Endpoint
 @app.post("/api/match")
 async def match_resume(request: MatchRequest):
     """
-    Match resume skills against target occupation
+    Match resume skills against every occupation (or a target occupation)
     
     Args:
-        request: MatchRequest with resume_skills and optional target_occupation
+        request: MatchRequest with resume_skills, optional target_occupation
+                 and top_n (number of ranked occupations to return)
     """
-    resume_skills = request.resume_skills
-    target_occupation = request.target_occupation
     try:
-        # If no target specified, search for best match
-        if not target_occupation:
-            # Simple keyword matching - could be enhanced with NLP
-            search_query = " ".join(resume_skills[:3])
-            occupations = onet_service.search_occupations(search_query)
-            if not occupations:
-                raise HTTPException(status_code=404, detail="No matching occupations found")
-            target_occupation = occupations[0]['code']
-        
-        # Get required skills for occupation
-        required_skills = onet_service.get_occupation_skills(target_occupation)
-        required_skill_names = {skill.name.lower() for skill in required_skills}
-        resume_skill_names = {skill.lower() for skill in resume_skills}
-        
-        # Calculate match
-        matched = list(resume_skill_names & required_skill_names)
-        missing = list(required_skill_names - resume_skill_names)
-        
-        match_score = int((len(matched) / len(required_skill_names)) * 100) if required_skill_names else 0
-        
-        # Get occupation details
-        occupation = onet_service.get_occupation_details(target_occupation)
-        
+        matches = onet_service.match_resumes(
+            [(request.resume_skills, request.target_occupation, request.top_n)]
+        )[0]
+        if not matches:
+            raise HTTPException(status_code=404, detail="No matching occupations found")
+
+        results = [_serialize_match(match) for match in matches]
         return {
-            "occupation_code": target_occupation,
-            "occupation_title": occupation.title if occupation else "Unknown",
-            "match_score": match_score,
-            "matched_skills": matched,
-            "missing_skills": missing[:10],  # Limit to top 10
-            "recommendation": "Strong match" if match_score >= 70 else "Consider upskilling" if match_score >= 40 else "Significant skill gap"
+            **results[0],
+            "matches": results
         }
     except HTTPException:
         raise
@@ -390,6 +622,225 @@ async def match_resume(request: MatchRequest):
         logger.error(f"Error matching resume: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+class TaskMatchRequest(BaseModel):
+    resume_text: str = ""
+    bullets: Optional[List[str]] = None
+    target_occupation: Optional[str] = None
+    top_n: int = 10
+    tasks_per_occupation: int = 5
+
+@app.post("/api/match/tasks")
+async def match_resume_tasks(request: TaskMatchRequest):
+    """
+    Match resume bullets against O*NET task statements
+    
+    Args:
+        request: TaskMatchRequest with resume_text (split into bullets) or
+                 bullets, optional target_occupation, top_n occupations and
+                 tasks_per_occupation aligned tasks to return for each
+    """
+    if not request.resume_text.strip() and not request.bullets:
+        raise HTTPException(status_code=400, detail="resume_text or bullets is required")
+    try:
+        matches = onet_service.match_tasks(
+            request.resume_text, request.bullets, max(request.top_n, 1),
+            max(request.tasks_per_occupation, 0), request.target_occupation
+        )
+        return {
+            "count": len(matches),
+            "matches": [
+                {
+                    "occupation_code": match.occupation_code,
+                    "occupation_title": onet_service.occupations.get(match.occupation_code, {}).get("title", "Unknown"),
+                    "match_score": int(round(match.score * 100)),
+                    "tasks": [asdict(task) for task in match.tasks]
+                }
+                for match in matches
+            ]
+        }
+    except Exception as e:
+        logger.error(f"Error matching resume tasks: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+class TextMatchRequest(BaseModel):
+    resume_text: str
+    top_n: int = 10
+
+@app.post("/api/match/text")
+async def match_resume_text(request: TextMatchRequest):
+    """
+    Match a whole resume, as free text, against every occupation's titles,
+    description, tasks and technologies (vector search)
+    
+    Args:
+        request: TextMatchRequest with resume_text and top_n occupations
+    """
+    if not request.resume_text.strip():
+        raise HTTPException(status_code=400, detail="resume_text is required")
+    try:
+        matches = onet_service.match_text(request.resume_text, max(request.top_n, 1))
+        return {
+            "count": len(matches),
+            "matches": [
+                {
+                    "occupation_code": match.occupation_code,
+                    "occupation_title": onet_service.occupations.get(match.occupation_code, {}).get("title", "Unknown"),
+                    "match_score": int(round(match.similarity * 100)),
+                    "similarity": match.similarity
+                }
+                for match in matches
+            ]
+        }
+    except Exception as e:
+        logger.error(f"Error matching resume text: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+class NormalizeRequest(BaseModel):
+    skills: List[str]
+
+@app.post("/api/skills/normalize")
+async def normalize_skills(request: NormalizeRequest):
+    """
+    Map raw resume skills ("k8s", "Progamming", "MS Excel") to the O*NET
+    elements and technologies they name
+    
+    Args:
+        request: NormalizeRequest with the skill strings
+    """
+    try:
+        skills = onet_service.normalize_skills(request.skills)
+        return {
+            "count": len(skills),
+            "matched": sum(1 for skill in skills if skill.method),
+            "skills": [asdict(skill) for skill in skills]
+        }
+    except Exception as e:
+        logger.error(f"Error normalizing skills: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Most match requests one batch may hold. Rows scored during an NDJSON
+# upload are buffered until it ends, so this bounds a batch's memory.
+MAX_BATCH_REQUESTS = int(os.environ.get("MATCH_BATCH_LIMIT", 5000))
+
+@app.post("/api/match/batch")
+async def match_resume_batch(request: Request, format: str = "ndjson"):
+    """
+    Match many resumes in one call
+
+    Body is either JSON ({"requests": [MatchRequest, ...]} or a bare list) or
+    NDJSON (Content-Type: application/x-ndjson) with one MatchRequest per
+    line; NDJSON is scored while it is still being uploaded. The response is
+    NDJSON: one {"index", "matches"} line per resume as each chunk finishes
+    (not in input order), then a final {"stats"} line with throughput.
+    format=json-array sends the same rows as the elements of one chunked
+    JSON array instead. A batch of more than MAX_BATCH_REQUESTS requests is
+    refused with 413.
+    """
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(STREAM_FORMATS)}")
+    content_type = request.headers.get("content-type", "")
+    errors = {}
+
+    def parse(index: int, data) -> tuple:
+        try:
+            item = MatchRequest.model_validate(data)
+            return (item.resume_skills, item.target_occupation, item.top_n)
+        except ValidationError as e:
+            errors[index] = e.errors(include_url=False)[0]["msg"]
+            return ([], None, 0)
+
+    # The body has to be read in full before the response starts: once it
+    # streams, Starlette listens for client disconnects on the same channel
+    body_read = asyncio.Event()
+    too_large = HTTPException(status_code=413,
+                              detail=f"A batch holds at most {MAX_BATCH_REQUESTS} match requests")
+    over_limit = False
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        async def items():
+            nonlocal over_limit
+            index, buffer = 0, b""
+            async for chunk in request.stream():
+                lines = (buffer + chunk).split(b"\n")
+                buffer = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        if index >= MAX_BATCH_REQUESTS:
+                            # Stop reading; the handler answers 413
+                            over_limit = True
+                            body_read.set()
+                            return
+                        yield parse(index, _loads_or_none(line))
+                        index += 1
+            if buffer.strip():
+                if index >= MAX_BATCH_REQUESTS:
+                    over_limit = True
+                else:
+                    yield parse(index, _loads_or_none(buffer))
+            body_read.set()
+        source = items()
+    else:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be JSON or NDJSON")
+        # An object without "requests" is malformed, not an empty batch
+        rows = body.get("requests") if isinstance(body, dict) else body
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400,
+                                detail='Expected a list of match requests or {"requests": [...]}')
+        if len(rows) > MAX_BATCH_REQUESTS:
+            raise too_large
+        source = [parse(i, row) for i, row in enumerate(rows)]
+        body_read.set()
+
+    # Scoring starts now, overlapping the rest of an NDJSON upload
+    rows: asyncio.Queue = asyncio.Queue()
+
+    async def score():
+        stats = BatchStats()
+        try:
+            async for result in batch_matcher.match_stream(source, stats):
+                for offset, matches in enumerate(result.matches):
+                    index = result.start + offset
+                    if index in errors:
+                        row = {"index": index, "error": errors[index]}
+                    elif not matches:
+                        row = {"index": index, "error": "No matching occupations found"}
+                    else:
+                        row = {"index": index, "matches": [_serialize_match(m) for m in matches]}
+                    rows.put_nowait(row)
+        except Exception as e:
+            logger.error(f"Error in batch match: {e}")
+            rows.put_nowait({"error": str(e)})
+        finally:
+            body_read.set()
+            rows.put_nowait({"stats": asdict(stats)})
+            rows.put_nowait(None)
+
+    task = asyncio.create_task(score())
+    await body_read.wait()
+    if over_limit:
+        task.cancel()
+        raise too_large
+
+    async def stream():
+        count = 0
+        try:
+            while (row := await rows.get()) is not None:
+                yield _stream_chunk(row, count, format)
+                count += 1
+            yield _stream_end(count, format)
+        finally:
+            task.cancel()
+
+    return StreamingResponse(stream(), media_type=STREAM_FORMATS[format])
+
+def _loads_or_none(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
 # Run with: uvicorn main:app --reload --host 0.0.0.0 --port 8000
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,154 @@
+"""
+KalmSkills Backend - Batch resume matching
+Scores large batches of resumes in chunks across a pool of worker processes
+"""
+
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# (resume_skills, target_occupation, limit)
+MatchItem = Tuple[List[str], Optional[str], int]
+
+DEFAULT_CHUNK_SIZE = 256
+
+# Worker processes per web worker unless MATCH_WORKERS says otherwise; kept
+# small because every gunicorn worker that serves a batch gets its own pool
+DEFAULT_WORKERS = 2
+
+# Service used by pool workers. Set in the parent before the pool forks, so
+# each worker inherits the already-loaded O*NET data copy-on-write instead
+# of loading (or unpickling) its own copy.
+_worker_service = None
+
+
+def _score_chunk(start: int, items: List[MatchItem]) -> Tuple[int, list]:
+    return start, _worker_service.match_resumes(items)
+
+
+@dataclass
+class BatchStats:
+    requests: int = 0
+    chunks: int = 0
+    workers: int = 0
+    seconds: float = 0.0
+    requests_per_second: float = 0.0
+
+
+@dataclass
+class ChunkResult:
+    start: int  # index of the chunk's first request within the batch
+    matches: list  # List[List[SkillMatch]], one entry per request
+
+
+class BatchMatcher:
+    """
+    Splits a stream of match requests into chunks and scores them in parallel.
+
+    Each chunk is a single matrix product inside OnetService.match_resumes.
+    Worker processes are forked from the loaded service on the first batch,
+    so web workers (and test clients) that never serve one never fork. Where
+    fork is not available (Windows), a thread pool is used instead; NumPy
+    releases the GIL during the matrix products.
+    """
+
+    def __init__(self, service, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.service = service
+        self.workers = workers or int(os.environ.get("MATCH_WORKERS", 0)) or min(DEFAULT_WORKERS, os.cpu_count() or 1)
+        self.chunk_size = max(chunk_size, 1)
+        self._executor: Optional[Executor] = None
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            global _worker_service
+            _worker_service = self.service
+            if "fork" in multiprocessing.get_all_start_methods():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("fork")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            logger.info(f"Started batch match pool with {self.workers} workers")
+        return self._executor
+
+    def start(self):
+        """
+        Fork all workers now rather than on the first batch. Forking while
+        another thread holds a lock can deadlock the child, so a server that
+        wants the pool up front should call this before starting threads.
+        """
+        pool = self._pool()
+        for future in [pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def match_stream(self, items: Union[Iterable[MatchItem], AsyncIterator[MatchItem]],
+                           stats: Optional[BatchStats] = None) -> AsyncIterator[ChunkResult]:
+        """
+        Score requests as they arrive, yielding each chunk as soon as it is done
+
+        Chunks finish out of order; ChunkResult.start locates them in the batch.
+        """
+        stats = stats if stats is not None else BatchStats()
+        stats.workers = self.workers
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        started = time.perf_counter()
+        pending = set()
+
+        async def collect(block: bool):
+            nonlocal pending
+            if not pending:
+                return
+            done, pending = await asyncio.wait(
+                pending, timeout=None if block else 0, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                start, matches = future.result()
+                yield ChunkResult(start, matches)
+
+        chunk: List[MatchItem] = []
+        count = 0
+        async for item in _aiter(items):
+            chunk.append(item)
+            count += 1
+            if len(chunk) >= self.chunk_size:
+                pending.add(loop.run_in_executor(pool, _score_chunk, count - len(chunk), chunk))
+                stats.chunks += 1
+                chunk = []
+                # Keep at most a couple of chunks queued per worker
+                async for result in collect(block=len(pending) >= self.workers * 2):
+                    yield result
+
+        if chunk:
+            pending.add(loop.run_in_executor(pool, _score_chunk, count - len(chunk), chunk))
+            stats.chunks += 1
+        while pending:
+            async for result in collect(block=True):
+                yield result
+
+        stats.requests = count
+        stats.seconds = round(time.perf_counter() - started, 4)
+        stats.requests_per_second = round(count / stats.seconds, 1) if stats.seconds else 0.0
+        logger.info(f"Batch matched {count} resumes in {stats.chunks} chunks: "
+                    f"{stats.seconds:.3f}s ({stats.requests_per_second}/s, {self.workers} workers)")
+
+
+async def _aiter(items):
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
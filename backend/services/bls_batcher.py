@@ -0,0 +1,118 @@
+"""
+KalmSkills Backend - BLS request batching
+Coalesces single-series lookups into multi-series BLS API calls
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# BLS v2 accepts up to 25 series per query without a key, 50 with one
+MAX_SERIES_UNREGISTERED = 25
+MAX_SERIES_REGISTERED = 50
+
+# How long the first request of a batch waits for others to join
+DEFAULT_WINDOW = 0.025
+
+# (series_ids, start_year, end_year) -> BLS timeseries response
+FetchSeries = Callable[[List[str], int, int], Awaitable[Dict]]
+
+
+@dataclass
+class BatcherStats:
+    requests: int = 0  # series lookups asked for
+    series_sent: int = 0  # distinct series sent upstream
+    upstream_calls: int = 0
+
+
+class _Batch:
+    def __init__(self, start_year: int, end_year: int):
+        self.start_year = start_year
+        self.end_year = end_year
+        self.futures: Dict[str, asyncio.Future] = {}
+
+
+class SeriesBatcher:
+    """
+    Micro-batcher for BLS time series lookups.
+
+    The first lookup for a year range opens a batch and schedules it to be
+    sent `window` seconds later; lookups arriving meanwhile join it (the
+    same series only once). A full batch is sent immediately. The combined
+    response is split back into one single-series response per caller, in
+    the same shape BLS returns, so callers parse it as if they had asked
+    alone. Each call costs one query against the BLS daily quota no matter
+    how many series it carries.
+    """
+
+    def __init__(self, fetch: FetchSeries, max_series: int = MAX_SERIES_UNREGISTERED,
+                 window: float = DEFAULT_WINDOW):
+        self.fetch = fetch
+        self.max_series = max_series
+        self.window = window
+        self.stats = BatcherStats()
+        self._pending: Dict[Tuple[int, int], _Batch] = {}
+        self._tasks = set()
+
+    async def get(self, series_id: str, start_year: int, end_year: int) -> Dict:
+        """Single-series BLS response for series_id, batched with concurrent lookups"""
+        self.stats.requests += 1
+        key = (start_year, end_year)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _Batch(start_year, end_year)
+            asyncio.get_running_loop().call_later(self.window, self._send, key, batch)
+
+        future = batch.futures.get(series_id)
+        if future is None:
+            future = batch.futures[series_id] = asyncio.get_running_loop().create_future()
+            if len(batch.futures) >= self.max_series:
+                self._send(key, batch)
+        # A cancelled caller must not cancel the result other callers share
+        return await asyncio.shield(future)
+
+    def _send(self, key: Tuple[int, int], batch: _Batch):
+        if self._pending.get(key) is not batch:
+            return  # already sent because it filled up
+        del self._pending[key]
+        task = asyncio.ensure_future(self._fetch_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch_batch(self, batch: _Batch):
+        series_ids = list(batch.futures)
+        self.stats.series_sent += len(series_ids)
+        self.stats.upstream_calls += 1
+        try:
+            data = await self.fetch(series_ids, batch.start_year, batch.end_year)
+        except Exception as e:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if len(series_ids) > 1:
+            logger.info(f"BLS batch: {len(series_ids)} series in one request "
+                        f"({batch.start_year}-{batch.end_year})")
+        results = data.get('Results') or {}
+        by_id = {series.get('seriesID'): series for series in results.get('series', [])}
+        for series_id, future in batch.futures.items():
+            if future.done():
+                continue
+            series = by_id.get(series_id)
+            future.set_result({
+                'status': data.get('status'),
+                'message': data.get('message', []),
+                'Results': {'series': [series] if series else []}
+            })
+
+    def info(self) -> Dict:
+        """Counters for debug endpoints"""
+        return {
+            **asdict(self.stats),
+            "pending_batches": len(self._pending),
+            "calls_saved": self.stats.requests - self.stats.upstream_calls
+        }
@@ -3,15 +3,33 @@ KalmSkills Backend - Bureau of Labor Statistics Integration
 Fetches employment and wage data from BLS API
 """
 
+import asyncio
+import httpx
 import requests
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
 import logging
 
+from .http_client import AsyncHTTPClient
+from .bls_batcher import MAX_SERIES_REGISTERED, MAX_SERIES_UNREGISTERED, SeriesBatcher
+from .bls_store import STORE_PATH, BLSStore
+from .oews_loader import normalize_soc_code
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# BLS v2 daily query limits
+DAILY_QUERIES_UNREGISTERED = 25
+DAILY_QUERIES_REGISTERED = 500
+# Queries the background refresh leaves for live lookups of new series
+REFRESH_QUERY_RESERVE = 5
+# Stored series are revalidated once they are this old; BLS publishes
+# monthly (CPS) or annually (OEWS)
+STORE_MAX_AGE = 24 * 60 * 60
+REFRESH_CHECK_INTERVAL = 60 * 60
+
 @dataclass
 class WageData:
     occupation_code: str
@@ -23,6 +41,7 @@ class WageData:
     percentile_75: Optional[float] = None
     percentile_90: Optional[float] = None
     total_employment: Optional[int] = None
+    year: Optional[int] = None  # OEWS reference year, when from the ingested table
 
 @dataclass
 class EmploymentTrend:
@@ -36,7 +55,7 @@ class BLSService:
     
     BASE_URL = "https://api.bls.gov/publicAPI/v2"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, store_path: Path = STORE_PATH):
         """
         Initialize BLS Service
         
@@ -44,12 +63,24 @@ class BLSService:
             api_key: BLS API key (register at https://data.bls.gov/registrationEngine/)
                     Without key: 25 queries per day, 10 years of data
                     With key: 500 queries per day, 20 years of data
+            store_path: SQLite file holding every series fetched so far
         """
         self.api_key = api_key
+        self.daily_query_limit = DAILY_QUERIES_REGISTERED if api_key else DAILY_QUERIES_UNREGISTERED
+        # Series are served from the local store and only fetched when missing
+        self.store = BLSStore(store_path)
+        self._refresher: Optional[asyncio.Task] = None
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json'
         })
+        # Non-blocking client for the async methods
+        self.http = AsyncHTTPClient(headers=dict(self.session.headers), per_host_limit=4)
+        # Concurrent single-series lookups share one multi-series request
+        self.batcher = SeriesBatcher(
+            self.get_timeseries_data_async,
+            max_series=MAX_SERIES_REGISTERED if api_key else MAX_SERIES_UNREGISTERED
+        )
     
     def get_timeseries_data(self, series_ids: List[str], 
                            start_year: Optional[int] = None,
@@ -62,23 +93,12 @@ class BLSService:
             start_year: Starting year (default: current year - 10)
             end_year: Ending year (default: current year)
         """
+        if not self.store.use_query(self.daily_query_limit):
+            logger.warning(f"BLS daily limit of {self.daily_query_limit} queries reached")
+            return {}
         try:
-            current_year = datetime.now().year
-            start_year = start_year or (current_year - 10)
-            end_year = end_year or current_year
-            
-            url = f"{self.BASE_URL}/timeseries/data/"
-            
-            payload = {
-                'seriesid': series_ids,
-                'startyear': str(start_year),
-                'endyear': str(end_year)
-            }
-            
-            if self.api_key:
-                payload['registrationkey'] = self.api_key
-            
-            response = self.session.post(url, json=payload)
+            response = self.session.post(f"{self.BASE_URL}/timeseries/data/",
+                                         json=self._timeseries_payload(series_ids, start_year, end_year))
             response.raise_for_status()
             
             return response.json()
@@ -86,6 +106,156 @@ class BLSService:
             logger.error(f"Error fetching BLS time series: {e}")
             return {}
     
+    async def get_timeseries_data_async(self, series_ids: List[str],
+                                        start_year: Optional[int] = None,
+                                        end_year: Optional[int] = None) -> Dict:
+        """Non-blocking get_timeseries_data, for the async API handlers"""
+        if not await asyncio.to_thread(self.store.use_query, self.daily_query_limit):
+            logger.warning(f"BLS daily limit of {self.daily_query_limit} queries reached")
+            return {}
+        try:
+            response = await self.http.post(f"{self.BASE_URL}/timeseries/data/",
+                                             json=self._timeseries_payload(series_ids, start_year, end_year))
+            response.raise_for_status()
+            
+            return response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching BLS time series: {e}")
+            return {}
+    
+    def get_series(self, series_id: str, start_year: Optional[int] = None,
+                   end_year: Optional[int] = None) -> Dict:
+        """
+        Get one series, from the local store when it covers the range
+        
+        Returns a single-series response in the BLS API format. If BLS
+        cannot be reached, whatever the store holds is returned.
+        """
+        start_year, end_year, fetch_start, fetch_end = self._series_range(start_year, end_year)
+        coverage = self.store.coverage(series_id)
+        if coverage is None or coverage.start_year > start_year:
+            data = self.get_timeseries_data([series_id], fetch_start, fetch_end)
+            if not self._save_series(series_id, fetch_start, data) and coverage is None:
+                return data
+        return self._stored_series(series_id, start_year, end_year)
+    
+    async def get_series_async(self, series_id: str, start_year: Optional[int] = None,
+                               end_year: Optional[int] = None) -> Dict:
+        """
+        Non-blocking get_series; missing series go through the request batcher
+        
+        Store reads and writes are sqlite calls, so they run in a worker thread
+        rather than on the event loop.
+        """
+        start_year, end_year, fetch_start, fetch_end = self._series_range(start_year, end_year)
+        coverage = await asyncio.to_thread(self.store.coverage, series_id)
+        if coverage is None or coverage.start_year > start_year:
+            data = await self.batcher.get(series_id, fetch_start, fetch_end)
+            saved = await asyncio.to_thread(self._save_series, series_id, fetch_start, data)
+            if not saved and coverage is None:
+                return data
+        return await asyncio.to_thread(self._stored_series, series_id, start_year, end_year)
+    
+    def _series_range(self, start_year: Optional[int], end_year: Optional[int]):
+        """
+        Requested range plus the range to fetch. Ranges inside the default
+        ten-year window fetch the whole window, so lookups for different
+        ranges share batched requests and later reads hit the store.
+        """
+        current_year = datetime.now().year
+        default_start = current_year - 10
+        start_year = start_year or default_start
+        end_year = end_year or current_year
+        if start_year >= default_start and end_year <= current_year:
+            return start_year, end_year, default_start, current_year
+        return start_year, end_year, start_year, end_year
+    
+    def _save_series(self, series_id: str, start_year: int, data: Dict) -> bool:
+        """Store a fetched single-series response; False if the fetch failed"""
+        if data.get('status') != 'REQUEST_SUCCEEDED':
+            return False
+        series = data['Results']['series']
+        # A series BLS has no data for is stored empty, so it isn't re-requested
+        self.store.write(series_id, start_year, series[0].get('data', []) if series else [])
+        return True
+    
+    def _stored_series(self, series_id: str, start_year: int, end_year: int) -> Dict:
+        return {
+            'status': 'REQUEST_SUCCEEDED',
+            'message': [],
+            'Results': {'series': [{'seriesID': series_id,
+                                    'data': self.store.read(series_id, start_year, end_year)}]}
+        }
+    
+    async def refresh_stored_series(self, max_age: float = STORE_MAX_AGE) -> int:
+        """
+        Revalidate stored series older than max_age; returns queries used
+        
+        Only years from the latest stored observation onwards are requested,
+        series with the same start year share requests, and REFRESH_QUERY_RESERVE
+        queries of the daily limit are left for live lookups.
+        """
+        current_year = datetime.now().year
+        by_start: Dict[int, List[str]] = {}
+        for coverage in await asyncio.to_thread(self.store.stale_series, max_age):
+            start = coverage.latest_year or coverage.start_year
+            by_start.setdefault(start, []).append(coverage.series_id)
+        
+        queries = 0
+        for start, series_ids in sorted(by_start.items()):
+            for i in range(0, len(series_ids), self.batcher.max_series):
+                used = await asyncio.to_thread(self.store.queries_today)
+                if used >= self.daily_query_limit - REFRESH_QUERY_RESERVE:
+                    logger.info("BLS refresh paused: daily query budget used")
+                    return queries
+                chunk = series_ids[i:i + self.batcher.max_series]
+                data = await self.get_timeseries_data_async(chunk, start, current_year)
+                queries += 1
+                if data.get('status') != 'REQUEST_SUCCEEDED':
+                    logger.warning(f"BLS refresh stopped: {data.get('message') or 'request failed'}")
+                    return queries
+                by_id = {item.get('seriesID'): item for item in data['Results']['series']}
+                for series_id in chunk:
+                    await asyncio.to_thread(self.store.write, series_id, start,
+                                            by_id.get(series_id, {}).get('data', []))
+        if queries:
+            logger.info(f"Refreshed stored BLS series with {queries} queries")
+        return queries
+    
+    def start_refresher(self):
+        """Periodically refresh stored series; call from a running event loop"""
+        if self._refresher is None:
+            self._refresher = asyncio.ensure_future(self._refresh_loop())
+    
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh_stored_series()
+            except Exception as e:
+                logger.error(f"Error refreshing stored BLS series: {e}")
+            await asyncio.sleep(REFRESH_CHECK_INTERVAL)
+    
+    def stop_refresher(self):
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+    
+    def _timeseries_payload(self, series_ids: List[str], start_year: Optional[int],
+                            end_year: Optional[int]) -> Dict:
+        current_year = datetime.now().year
+        start_year = start_year or (current_year - 10)
+        end_year = end_year or current_year
+        
+        payload = {
+            'seriesid': series_ids,
+            'startyear': str(start_year),
+            'endyear': str(end_year)
+        }
+        
+        if self.api_key:
+            payload['registrationkey'] = self.api_key
+        return payload
+    
     def get_occupation_wages(self, occupation_code: str) -> Optional[WageData]:
         """
         Get wage data for a specific occupation
@@ -94,30 +264,78 @@ class BLSService:
             occupation_code: BLS occupation code (e.g., '15-1252' for Software Developers)
         """
         try:
-            # Construct series ID for national wage data
-            # Format: OEUN000000000000{occupation_code}03
-            # 03 = median hourly wage
-            series_id = f"OEUN000000000000{occupation_code.replace('-', '')}03"
-            
-            data = self.get_timeseries_data([series_id])
-            
-            if data.get('status') == 'REQUEST_SUCCEEDED':
-                series_data = data['Results']['series'][0]['data']
-                if series_data:
-                    latest = series_data[0]  # Most recent data point
-                    
-                    return WageData(
-                        occupation_code=occupation_code,
-                        occupation_title=self._get_occupation_title(occupation_code),
-                        median_wage=float(latest['value']),
-                        mean_wage=float(latest['value']),  # Simplified
-                    )
-            
+            wages = self.get_wages_bulk([occupation_code]).get(occupation_code)
+            if wages:
+                return wages
+            data = self.get_series(self._wage_series_id(occupation_code))
+            return self._parse_wages(occupation_code, data)
+        except Exception as e:
+            logger.error(f"Error fetching wages for {occupation_code}: {e}")
             return None
+    
+    async def get_occupation_wages_async(self, occupation_code: str) -> Optional[WageData]:
+        try:
+            wages = (await asyncio.to_thread(self.get_wages_bulk, [occupation_code])).get(occupation_code)
+            if wages:
+                return wages
+            data = await self.get_series_async(self._wage_series_id(occupation_code))
+            return self._parse_wages(occupation_code, data)
         except Exception as e:
             logger.error(f"Error fetching wages for {occupation_code}: {e}")
             return None
     
+    def get_wages_bulk(self, occupation_codes: List[str]) -> Dict[str, WageData]:
+        """
+        Wage data for many occupations from the ingested OEWS table
+        
+        Never calls the BLS API; codes without a row (or before
+        ingest_oews.py has run) are left out. Accepts SOC ('15-1252') or
+        O*NET ('15-1252.00') codes and keys the result by the code as given.
+        
+        Args:
+            occupation_codes: Occupation codes to look up
+        """
+        soc_codes = {code: normalize_soc_code(code) for code in occupation_codes}
+        rows = self.store.oews_wages([soc for soc in soc_codes.values() if soc])
+        results = {}
+        for code, soc in soc_codes.items():
+            row = rows.get(soc)
+            if row:
+                results[code] = WageData(
+                    occupation_code=soc,
+                    occupation_title=row['title'],
+                    median_wage=row['hourly_median'],
+                    mean_wage=row['hourly_mean'],
+                    percentile_10=row['hourly_p10'],
+                    percentile_25=row['hourly_p25'],
+                    percentile_75=row['hourly_p75'],
+                    percentile_90=row['hourly_p90'],
+                    total_employment=row['total_employment'],
+                    year=row['year']
+                )
+        return results
+    
+    def _wage_series_id(self, occupation_code: str) -> str:
+        # Construct series ID for national wage data
+        # Format: OEUN000000000000{occupation_code}03
+        # 03 = median hourly wage
+        return f"OEUN000000000000{occupation_code.replace('-', '')}03"
+    
+    def _parse_wages(self, occupation_code: str, data: Dict) -> Optional[WageData]:
+        if data.get('status') == 'REQUEST_SUCCEEDED' and data['Results']['series']:
+            series_data = data['Results']['series'][0]['data']
+            if series_data:
+                latest = series_data[0]  # Most recent data point
+                
+                return WageData(
+                    occupation_code=occupation_code,
+                    occupation_title=self._get_occupation_title(occupation_code),
+                    median_wage=float(latest['value']),
+                    mean_wage=float(latest['value']),  # Simplified
+                )
+        
+        return None
+    
     def get_employment_trends(self, occupation_code: str, 
                             years: int = 5) -> List[EmploymentTrend]:
         """
@@ -128,65 +346,97 @@ class BLSService:
             years: Number of years of historical data
         """
         try:
-            # Construct series ID for employment
-            # Format: OEUS000000000000{occupation_code}01
-            # 01 = employment level
-            series_id = f"OEUS000000000000{occupation_code.replace('-', '')}01"
-            
             current_year = datetime.now().year
-            data = self.get_timeseries_data(
-                [series_id],
+            data = self.get_series(
+                self._employment_series_id(occupation_code),
                 start_year=current_year - years,
                 end_year=current_year
             )
-            
-            trends = []
-            if data.get('status') == 'REQUEST_SUCCEEDED':
-                series_data = data['Results']['series'][0]['data']
-                
-                for i, point in enumerate(series_data):
-                    year = int(point['year'])
-                    employment = int(float(point['value']) * 1000)  # Convert to actual numbers
-                    
-                    # Calculate year-over-year change
-                    change_percent = None
-                    if i < len(series_data) - 1:
-                        prev_employment = int(float(series_data[i + 1]['value']) * 1000)
-                        if prev_employment > 0:
-                            change_percent = ((employment - prev_employment) / prev_employment) * 100
-                    
-                    trends.append(EmploymentTrend(
-                        occupation_code=occupation_code,
-                        year=year,
-                        employment=employment,
-                        change_percent=change_percent
-                    ))
-            
-            return trends
+            return self._parse_trends(occupation_code, data)
+        except Exception as e:
+            logger.error(f"Error fetching employment trends for {occupation_code}: {e}")
+            return []
+    
+    async def get_employment_trends_async(self, occupation_code: str,
+                                          years: int = 5) -> List[EmploymentTrend]:
+        try:
+            current_year = datetime.now().year
+            data = await self.get_series_async(
+                self._employment_series_id(occupation_code),
+                start_year=current_year - years,
+                end_year=current_year
+            )
+            return self._parse_trends(occupation_code, data)
         except Exception as e:
             logger.error(f"Error fetching employment trends for {occupation_code}: {e}")
             return []
     
+    def _employment_series_id(self, occupation_code: str) -> str:
+        # Construct series ID for employment
+        # Format: OEUS000000000000{occupation_code}01
+        # 01 = employment level
+        return f"OEUS000000000000{occupation_code.replace('-', '')}01"
+    
+    def _parse_trends(self, occupation_code: str, data: Dict) -> List[EmploymentTrend]:
+        trends = []
+        if data.get('status') == 'REQUEST_SUCCEEDED' and data['Results']['series']:
+            series_data = data['Results']['series'][0]['data']
+            
+            for i, point in enumerate(series_data):
+                year = int(point['year'])
+                employment = int(float(point['value']) * 1000)  # Convert to actual numbers
+                
+                # Calculate year-over-year change
+                change_percent = None
+                if i < len(series_data) - 1:
+                    prev_employment = int(float(series_data[i + 1]['value']) * 1000)
+                    if prev_employment > 0:
+                        change_percent = ((employment - prev_employment) / prev_employment) * 100
+                
+                trends.append(EmploymentTrend(
+                    occupation_code=occupation_code,
+                    year=year,
+                    employment=employment,
+                    change_percent=change_percent
+                ))
+        
+        return trends
+    
+    # Series ID for national unemployment rate
+    UNEMPLOYMENT_SERIES = "LNS14000000"
+    
     def get_unemployment_rate(self) -> Optional[float]:
         """Get current national unemployment rate"""
         try:
-            # Series ID for national unemployment rate
-            series_id = "LNS14000000"
-            
-            data = self.get_timeseries_data([series_id])
-            
-            if data.get('status') == 'REQUEST_SUCCEEDED':
-                latest = data['Results']['series'][0]['data'][0]
-                return float(latest['value'])
-            
+            return self._parse_unemployment(self.get_series(self.UNEMPLOYMENT_SERIES))
+        except Exception as e:
+            logger.error(f"Error fetching unemployment rate: {e}")
             return None
+    
+    async def get_unemployment_rate_async(self) -> Optional[float]:
+        try:
+            return self._parse_unemployment(await self.get_series_async(self.UNEMPLOYMENT_SERIES))
         except Exception as e:
             logger.error(f"Error fetching unemployment rate: {e}")
             return None
     
+    def _parse_unemployment(self, data: Dict) -> Optional[float]:
+        if data.get('status') == 'REQUEST_SUCCEEDED' and data['Results']['series']:
+            latest = data['Results']['series'][0]['data'][0]
+            return float(latest['value'])
+        
+        return None
+    
+    async def aclose(self):
+        await self.http.aclose()
+    
     def _get_occupation_title(self, occupation_code: str) -> str:
-        """Get occupation title from code (simplified - would need lookup table)"""
-        # This is a simplified version - in production, maintain a lookup table
+        """Get occupation title from code, via the ingested OEWS table"""
+        soc_code = normalize_soc_code(occupation_code)
+        row = self.store.oews_wages([soc_code]).get(soc_code) if soc_code else None
+        if row:
+            return row['title']
+        # Fallback for a few common codes until ingest_oews.py has been run
         occupation_titles = {
             '15-1252': 'Software Developers',
             '15-1256': 'Software Developers and Software Quality Assurance Analysts and Testers',
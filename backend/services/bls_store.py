@@ -0,0 +1,196 @@
+"""
+KalmSkills Backend - BLS time-series store
+Local SQLite copy of the BLS series the API has served
+"""
+
+import time
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+STORE_PATH = Path(__file__).parent.parent / "data" / "bls" / "timeseries.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    series_id TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    period_name TEXT,
+    value TEXT NOT NULL,
+    PRIMARY KEY (series_id, year, period)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS series (
+    series_id TEXT PRIMARY KEY,
+    start_year INTEGER NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quota (
+    day TEXT PRIMARY KEY,
+    queries INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS oews_wages (
+    soc_code TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    occ_group TEXT,
+    year INTEGER,
+    total_employment INTEGER,
+    hourly_mean REAL,
+    hourly_p10 REAL,
+    hourly_p25 REAL,
+    hourly_median REAL,
+    hourly_p75 REAL,
+    hourly_p90 REAL
+) WITHOUT ROWID;
+"""
+
+OEWS_FIELDS = ("soc_code", "title", "occ_group", "year", "total_employment", "hourly_mean",
+               "hourly_p10", "hourly_p25", "hourly_median", "hourly_p75", "hourly_p90")
+
+
+@dataclass
+class SeriesCoverage:
+    series_id: str
+    start_year: int  # earliest year requested from BLS
+    checked_at: float  # when BLS was last asked for this series
+    latest_year: Optional[int]  # newest year with an observation
+
+
+class BLSStore:
+    """
+    Observations keyed by (series ID, year, period), plus, per series, how
+    far back it has been fetched and when BLS was last asked. A series
+    fetched with no data is still recorded, so known gaps don't cost
+    queries. Also counts upstream queries per UTC day against the quota,
+    and holds the ingested OEWS national wage table keyed by SOC code.
+
+    One connection is shared by the sync methods and the worker threads
+    the async paths run these calls in (asyncio.to_thread), serialized by
+    a lock; every statement is a short indexed lookup.
+    """
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def coverage(self, series_id: str) -> Optional[SeriesCoverage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT start_year, checked_at, "
+                "(SELECT MAX(year) FROM observations WHERE series_id = ?) "
+                "FROM series WHERE series_id = ?", (series_id, series_id)
+            ).fetchone()
+        return SeriesCoverage(series_id, *row) if row else None
+
+    def read(self, series_id: str, start_year: int, end_year: int) -> List[Dict]:
+        """Observations in BLS API format, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT year, period, period_name, value FROM observations "
+                "WHERE series_id = ? AND year BETWEEN ? AND ? ORDER BY year DESC, period DESC",
+                (series_id, start_year, end_year)
+            ).fetchall()
+        return [{'year': str(year), 'period': period, 'periodName': period_name, 'value': value}
+                for year, period, period_name, value in rows]
+
+    def write(self, series_id: str, start_year: int, data: List[Dict]):
+        """Upsert a fetched series; start_year is the first year that was requested"""
+        rows = [(series_id, int(point['year']), point['period'], point.get('periodName'), point['value'])
+                for point in data]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "INSERT INTO series VALUES (?, ?, ?) ON CONFLICT(series_id) DO UPDATE SET "
+                    "start_year = MIN(start_year, excluded.start_year), checked_at = excluded.checked_at",
+                    (series_id, start_year, time.time())
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def stale_series(self, max_age: float) -> List[SeriesCoverage]:
+        """Series not checked for max_age seconds, least recently checked first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.series_id, s.start_year, s.checked_at, MAX(o.year) FROM series s "
+                "LEFT JOIN observations o ON o.series_id = s.series_id "
+                "WHERE s.checked_at < ? GROUP BY s.series_id ORDER BY s.checked_at",
+                (time.time() - max_age,)
+            ).fetchall()
+        return [SeriesCoverage(*row) for row in rows]
+
+    def use_query(self, daily_limit: int) -> bool:
+        """Count one upstream query for today; False (and not counted) if over the limit"""
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO quota VALUES (?, 1) ON CONFLICT(day) DO UPDATE SET queries = queries + 1 "
+                "WHERE queries < ?", (day, daily_limit)
+            )
+            return cursor.rowcount > 0
+
+    def queries_today(self) -> int:
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        with self._lock:
+            row = self._conn.execute("SELECT queries FROM quota WHERE day = ?", (day,)).fetchone()
+        return row[0] if row else 0
+
+    def replace_oews_wages(self, wages: Iterable) -> int:
+        """Replace the OEWS table with `wages` (OewsWage rows); returns the row count"""
+        rows = [tuple(getattr(wage, name) for name in OEWS_FIELDS) for wage in wages]
+        placeholders = ", ".join("?" * len(OEWS_FIELDS))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM oews_wages")
+                # A code listed under several groups keeps its most detailed row
+                self._conn.executemany(f"INSERT OR IGNORE INTO oews_wages VALUES ({placeholders})",
+                                       sorted(rows, key=lambda row: row[2] != "detailed"))
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def oews_wages(self, soc_codes: Sequence[str]) -> Dict[str, Dict]:
+        """OEWS rows for the given SOC codes ('15-1252'), as dicts keyed by code"""
+        codes = list(dict.fromkeys(soc_codes))
+        results: Dict[str, Dict] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(codes), 500):
+                chunk = codes[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT * FROM oews_wages WHERE soc_code IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for row in rows:
+                    results[row[0]] = dict(zip(OEWS_FIELDS, row))
+        return results
+
+    def info(self) -> Dict:
+        with self._lock:
+            series, observations, oews = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM series), (SELECT COUNT(*) FROM observations), "
+                "(SELECT COUNT(*) FROM oews_wages)"
+            ).fetchone()
+        return {"path": str(self.path), "series": series, "observations": observations,
+                "oews_occupations": oews, "queries_today": self.queries_today()}
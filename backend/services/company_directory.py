@@ -0,0 +1,435 @@
+"""
+KalmSkills Backend - SEC company directory
+Local, periodically revalidated copy of SEC's ticker -> CIK listing
+"""
+
+import os
+import json
+import math
+import time
+import heapq
+import logging
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import requests
+
+from .search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).parent.parent / "data" / "sec" / "cache"
+TICKERS_CACHE = CACHE_DIR / "company_tickers.json"
+
+# Tried in order; the URL that answered is remembered and revalidated
+TICKER_URLS = (
+    "https://data.sec.gov/files/company_tickers_exchange.json",
+    "https://www.sec.gov/files/company_tickers.json",
+)
+
+# SEC republishes the listing about once a day
+REFRESH_INTERVAL = 24 * 60 * 60
+
+# After a failed first fetch, wait this long before trying again
+RETRY_INTERVAL = 60
+# Retry-After suggested to clients while the first load is still running
+LOADING_RETRY_AFTER = 5
+
+# A name token in a query also matches name tokens it is a prefix of
+MAX_PREFIX_EXPANSIONS = 256
+
+# Vocabulary tokens sharing the most trigrams with a misspelled word that
+# get the (comparatively slow) edit distance check
+MAX_FUZZY_CANDIDATES = 48
+
+# Per-token match scores; a company must match every query token
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.6  # plus up to 0.4 for how much of the token was typed
+FUZZY_SCORE = 0.5  # minus 0.15 per edit
+TICKER_EXACT_SCORE = 3.0
+TICKER_PREFIX_SCORE = 0.25
+# Added for SEC listing rank (roughly market cap), 0 for the last row
+POPULARITY_WEIGHT = 0.5
+
+
+def max_edits(term: str) -> int:
+    """Typos tolerated in a query token of this length"""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def trigrams(token: str) -> List[str]:
+    """Start-anchored character trigrams ("tesla" -> "$te", "tes", "esl", "sla")"""
+    padded = "$" + token
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def bounded_edit_distance(a: str, b: str, limit: int, prefix: bool = False) -> Optional[int]:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions) between a and b, or None if it exceeds `limit`
+
+    With prefix=True, the distance from a to the closest prefix of b, for
+    matching a partially typed word. Gives up as soon as a whole row of the
+    table exceeds the limit.
+    """
+    if prefix:
+        # The closest prefix is never more than `limit` longer than a
+        b = b[:len(a) + limit]
+    elif abs(len(a) - len(b)) > limit:
+        return None
+    previous: Optional[List[int]] = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(row[j] + 1, current[j - 1] + 1, row[j - 1] + cost)
+            if (previous is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == b[j - 1]):
+                value = min(value, previous[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return None
+        previous, row = row, current
+    distance = min(row) if prefix else row[-1]
+    return distance if distance <= limit else None
+
+
+class CompanyIndex:
+    """
+    Immutable in-memory indexes over the company listing, built for
+    search-as-you-type.
+
+    Rows keep SEC's order (largest companies first), which doubles as a
+    popularity ranking. Name tokens have sorted posting lists of rows; the
+    sorted vocabulary acts as a flattened trie, turning a typed prefix into
+    one bisect range. A trigram index over the vocabulary finds candidate
+    tokens for misspelled words, which are then confirmed with a bounded
+    edit distance. Tickers have their own hash and sorted prefix indexes.
+    """
+
+    def __init__(self, companies: List[Dict]):
+        self.companies = companies
+        self.by_ticker: Dict[str, int] = {}
+        self.by_cik: Dict[str, List[int]] = {}
+        postings: Dict[str, List[int]] = {}
+        for row, company in enumerate(companies):
+            ticker = (company.get('ticker') or '').upper()
+            if ticker:
+                self.by_ticker.setdefault(ticker, row)
+            self.by_cik.setdefault(str(company.get('cik_str', '')), []).append(row)
+            for token in dict.fromkeys(tokenize(company.get('title', ''))):
+                postings.setdefault(token, []).append(row)
+        self.vocabulary = sorted(postings)
+        self.postings = [postings[token] for token in self.vocabulary]
+        self.tickers = sorted(self.by_ticker)
+
+        grams: Dict[str, List[int]] = {}
+        for token_id, token in enumerate(self.vocabulary):
+            for gram in dict.fromkeys(trigrams(token)):
+                grams.setdefault(gram, []).append(token_id)
+        self.trigram_index = grams
+
+        log_rows = math.log1p(len(companies)) or 1.0
+        self._popularity = POPULARITY_WEIGHT * (1 - np.log1p(np.arange(len(companies))) / log_rows)
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    def get_by_ticker(self, ticker: str) -> Optional[Dict]:
+        row = self.by_ticker.get(ticker.strip().upper())
+        return self.companies[row] if row is not None else None
+
+    def get_by_cik(self, cik: str) -> List[Dict]:
+        """Every listed security of a company (one per ticker)"""
+        return [self.companies[row] for row in self.by_cik.get(str(cik).lstrip('0'), [])]
+
+    def _fuzzy_tokens(self, term: str, prefix: bool) -> List[Tuple[int, int]]:
+        """(token id, edits) for vocabulary tokens within max_edits of term"""
+        limit = max_edits(term)
+        if not limit:
+            return []
+        term_grams = trigrams(term)
+        # Each edit breaks at most three trigrams
+        needed = max(len(term_grams) - 3 * limit, 1)
+        shared: Dict[int, int] = {}
+        for gram in dict.fromkeys(term_grams):
+            for token_id in self.trigram_index.get(gram, ()):
+                shared[token_id] = shared.get(token_id, 0) + 1
+        candidates = [token_id for token_id, count in shared.items() if count >= needed]
+        if len(candidates) > MAX_FUZZY_CANDIDATES:
+            candidates = heapq.nlargest(MAX_FUZZY_CANDIDATES, candidates, key=shared.__getitem__)
+        matches = []
+        for token_id in candidates:
+            edits = bounded_edit_distance(term, self.vocabulary[token_id], limit, prefix)
+            if edits is not None:
+                matches.append((token_id, edits))
+        return matches
+
+    def _term_scores(self, term: str, prefix: bool) -> Dict[int, float]:
+        """Best match score per row for one query token"""
+        vocabulary = self.vocabulary
+        start = bisect_left(vocabulary, term)
+        if prefix:
+            end = bisect_left(vocabulary, term + "\uffff", start)
+            end = min(end, start + MAX_PREFIX_EXPANSIONS)
+        else:
+            end = start + (start < len(vocabulary) and vocabulary[start] == term)
+
+        matches = []
+        for token_id in range(start, end):
+            token = vocabulary[token_id]
+            if len(token) == len(term):
+                matches.append((EXACT_SCORE, token_id))
+            else:
+                matches.append((PREFIX_SCORE + (EXACT_SCORE - PREFIX_SCORE) * len(term) / len(token), token_id))
+        # Only look for typos when the word matches nothing as typed
+        if not matches:
+            matches = [(FUZZY_SCORE - 0.15 * edits, token_id)
+                       for token_id, edits in self._fuzzy_tokens(term, prefix)]
+
+        # Worst matches first, so a row's best match is written last
+        scores: Dict[int, float] = {}
+        for score, token_id in sorted(matches):
+            scores.update(dict.fromkeys(self.postings[token_id], score))
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Rank companies for a name or ticker as typed so far
+
+        Every query token must match a name token exactly, as a prefix or,
+        failing both, within a small edit distance. A query that is a ticker, or starts one, also
+        matches that company. Ties are broken by SEC listing rank.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+
+        scores: Optional[Dict[int, float]] = None
+        # Rarest terms first keeps the intersections small
+        for term in sorted(terms, key=len, reverse=True):
+            term_scores = self._term_scores(term, prefix=True)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {row: score + term_scores[row] for row, score in scores.items()
+                          if row in term_scores}
+            if not scores:
+                break
+        scores = scores or {}
+
+        ticker = query.strip().upper()
+        if ticker and " " not in ticker and (len(ticker) > 1 or ticker in self.by_ticker):
+            start = bisect_left(self.tickers, ticker)
+            end = min(bisect_left(self.tickers, ticker + "\uffff", start), start + MAX_PREFIX_EXPANSIONS)
+            for symbol in self.tickers[start:end]:
+                row = self.by_ticker[symbol]
+                bonus = TICKER_EXACT_SCORE if symbol == ticker else TICKER_PREFIX_SCORE
+                scores[row] = scores.get(row, 0.0) + bonus
+
+        if not scores:
+            return []
+        # Short prefixes match thousands of rows; rank them in one vector op
+        rows = np.fromiter(scores.keys(), dtype=np.intp, count=len(scores))
+        totals = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+        totals += self._popularity[rows]
+        if len(rows) > limit:
+            top = np.argpartition(-totals, limit - 1)[:limit]
+            rows, totals = rows[top], totals[top]
+        order = np.lexsort((rows, -totals))
+        return [self.companies[row] for row in rows[order].tolist()]
+
+
+EMPTY_INDEX = CompanyIndex([])
+
+
+class CompanyDirectory:
+    """
+    SEC company listing cached on disk and revalidated with ETag /
+    Last-Modified, so an unchanged listing costs a 304 instead of a
+    multi-megabyte download.
+
+    The listing is loaded on first use (from disk if possible) and can be
+    kept fresh by a background thread (start_refresh). Lookups always read
+    the current CompanyIndex, which a refresh replaces in one assignment.
+    Until a listing has loaded, `index` is empty and `ready` is False;
+    `error` holds the last failed fetch.
+    """
+
+    def __init__(self, session: requests.Session, cache_path: Path = TICKERS_CACHE,
+                 refresh_interval: float = REFRESH_INTERVAL):
+        self.session = session
+        self.cache_path = Path(cache_path)
+        self.refresh_interval = refresh_interval
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.source_url: Optional[str] = None
+        self.fetched_at = 0.0
+        self.error: Optional[str] = None
+        self._retry_at = 0.0
+        self._index: Optional[CompanyIndex] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def index(self) -> CompanyIndex:
+        """Current indexes, loading or fetching the listing on first use"""
+        if self._index is None:
+            # While the refresh thread loads the listing, answer empty rather
+            # than block the (async) caller on its download
+            if self._thread is not None or time.time() < self._retry_at:
+                return EMPTY_INDEX
+            with self._lock:
+                self._ensure_loaded_locked()
+                if self._index is None:
+                    self._retry_at = time.time() + RETRY_INTERVAL
+                    return EMPTY_INDEX
+        return self._index
+
+    @property
+    def ready(self) -> bool:
+        """Whether a listing has loaded (starting the first load, like `index`)"""
+        return self.index is not EMPTY_INDEX
+
+    def retry_after(self) -> int:
+        """Seconds a client should wait before asking again while not ready"""
+        if self._retry_at > time.time():
+            return max(int(self._retry_at - time.time()), 1)
+        return RETRY_INTERVAL if self.error else LOADING_RETRY_AFTER
+
+    def _ensure_loaded_locked(self):
+        if self._index is None:
+            self._load_cache()
+            if self._index is None or self.is_stale():
+                self._refresh_locked()
+
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at >= self.refresh_interval
+
+    def _load_cache(self):
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            self.etag = cached.get('etag')
+            self.last_modified = cached.get('last_modified')
+            self.source_url = cached.get('source_url')
+            self.fetched_at = cached.get('fetched_at', 0.0)
+            self._index = CompanyIndex(cached['companies'])
+            logger.info(f"Loaded {len(self._index)} SEC companies from {self.cache_path}")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable SEC company cache {self.cache_path}: {e}")
+
+    def _save_cache(self, companies: List[Dict]):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'source_url': self.source_url,
+                    'etag': self.etag,
+                    'last_modified': self.last_modified,
+                    'fetched_at': self.fetched_at,
+                    'companies': companies
+                }, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write SEC company cache {self.cache_path}: {e}")
+
+    def refresh(self) -> bool:
+        """Revalidate the listing with SEC; returns True if it changed"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        urls = [self.source_url] if self.source_url else []
+        urls += [url for url in TICKER_URLS if url != self.source_url]
+        for url in urls:
+            headers = {}
+            if url == self.source_url and self._index is not None:
+                if self.etag:
+                    headers['If-None-Match'] = self.etag
+                if self.last_modified:
+                    headers['If-Modified-Since'] = self.last_modified
+            try:
+                response = self.session.get(url, headers=headers, timeout=30)
+                if response.status_code == 404:
+                    continue
+                if response.status_code == 304:
+                    self.fetched_at = time.time()
+                    self.error = None
+                    self._save_cache(self._index.companies)
+                    logger.info("SEC company listing unchanged")
+                    return False
+                response.raise_for_status()
+                companies = parse_company_listing(response.json())
+            except (requests.RequestException, ValueError) as e:
+                self.error = f"Error refreshing SEC company listing from {url}: {e}"
+                logger.error(self.error)
+                return False
+
+            self.source_url = url
+            self.etag = response.headers.get('ETag')
+            self.last_modified = response.headers.get('Last-Modified')
+            self.fetched_at = time.time()
+            self.error = None
+            self._index = CompanyIndex(companies)
+            self._save_cache(companies)
+            logger.info(f"Fetched {len(companies)} SEC companies from {url}")
+            return True
+
+        self.error = "SEC company listing not found at any known URL"
+        logger.error(self.error)
+        return False
+
+    def start_refresh(self):
+        """Revalidate the listing every refresh_interval in a daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            with self._lock:
+                self._ensure_loaded_locked()
+            while not self._stop.wait(max(self.refresh_interval - (time.time() - self.fetched_at), 60)):
+                self.refresh()
+
+        self._thread = threading.Thread(target=run, name="sec-company-refresh", daemon=True)
+        self._thread.start()
+
+    def stop_refresh(self):
+        self._stop.set()
+        self._thread = None
+
+
+def parse_company_listing(payload) -> List[Dict]:
+    """
+    Normalize either SEC listing format to {'cik_str', 'ticker', 'title'} rows
+
+    company_tickers.json is {"0": {"cik_str", "ticker", "title"}, ...};
+    company_tickers_exchange.json is {"fields": [...], "data": [[...], ...]}.
+    """
+    if isinstance(payload, dict) and 'fields' in payload and 'data' in payload:
+        fields: Sequence[str] = payload['fields']
+        cik, name, ticker = fields.index('cik'), fields.index('name'), fields.index('ticker')
+        exchange = fields.index('exchange') if 'exchange' in fields else None
+        return [{
+            'cik_str': row[cik],
+            'ticker': row[ticker] or '',
+            'title': row[name] or '',
+            'exchange': row[exchange] if exchange is not None else None
+        } for row in payload['data']]
+    if isinstance(payload, dict):
+        return [
+            {'cik_str': c.get('cik_str'), 'ticker': c.get('ticker') or '', 'title': c.get('title') or ''}
+            for c in payload.values()
+        ]
+    raise ValueError("Unrecognized SEC company listing format")
@@ -0,0 +1,90 @@
+"""
+KalmSkills Backend - Async HTTP client
+Pooled, non-blocking HTTP for the upstream data APIs (SEC, BLS)
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (enables httpx's HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class AsyncHTTPClient:
+    """
+    One shared httpx.AsyncClient per upstream service.
+
+    Connections are kept alive and reused across requests (and multiplexed
+    over HTTP/2 when the h2 package is installed). On top of the pool-wide
+    connection limit, each host gets its own concurrency limit, so a burst
+    of requests queues in the event loop instead of tripping the
+    upstream's fair-access rules.
+
+    An AsyncClient's connections and an asyncio.Semaphore belong to the
+    event loop they were first used on, so each loop that makes requests
+    (the app's, a reloaded app's, asyncio.run() in a script or test) gets
+    its own client and limits, dropped when that loop is garbage collected.
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, per_host_limit: int = 8,
+                 max_connections: int = 64, timeout: float = 30.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.headers = headers or {}
+        self.per_host_limit = per_host_limit
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_connections)
+        self.timeout = timeout
+        self.transport = transport
+        # event loop -> (client, host -> concurrency limit)
+        self._loops: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _loop_state(self) -> Tuple[httpx.AsyncClient, Dict[str, asyncio.Semaphore]]:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None or state[0].is_closed:
+            client = httpx.AsyncClient(
+                headers=self.headers,
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                follow_redirects=True,
+                transport=self.transport
+            )
+            state = self._loops[loop] = (client, {})
+        return state
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The running event loop's client"""
+        return self._loop_state()[0]
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        client, host_limits = self._loop_state()
+        host = urlsplit(url).netloc
+        limit = host_limits.get(host)
+        if limit is None:
+            limit = host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        async with limit:
+            return await client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        """Close the running loop's client (e.g. on app shutdown)"""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].aclose()
@@ -0,0 +1,230 @@
+"""
+KalmSkills Backend - Related-occupation graph
+O*NET "Related Occupations" as a weighted directed graph in compact arrays
+"""
+
+import heapq
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Relatedness tiers, closest first; an edge costs its tier's cost plus a
+# little for its position in the source occupation's list (1-20)
+TIERS = ("Primary-Short", "Primary-Long", "Supplemental")
+TIER_COSTS = (1.0, 2.0, 3.0)
+RANK_COST = 0.01
+
+
+@dataclass
+class RelatedOccupation:
+    code: str
+    hops: int  # fewest steps from the source occupation
+    cost: float  # cheapest path cost within the hop limit
+    tier: str  # tier of the last step on that path
+
+
+@dataclass
+class CareerPath:
+    codes: List[str]  # source first, target last
+    tiers: List[str]  # tier of each step, len(codes) - 1
+    cost: float
+
+
+class OccupationGraph:
+    """
+    Adjacency lists in CSR form: the edges of node i are
+    targets[offsets[i]:offsets[i + 1]], in O*NET's order (closest tier
+    first), with their tier index and cost in the parallel `tiers` and
+    `weights` columns. Edges point from an occupation to the ones O*NET
+    lists as related to it, so paths read as suggested career moves.
+
+    The columns may be arrays or snapshot memoryviews and are not copied;
+    the reverse adjacency that path queries also need is built on first use.
+    """
+
+    def __init__(self, nodes: Sequence[str], offsets: Sequence[int], targets: Sequence[int],
+                 tiers: Sequence[int], weights: Sequence[float]):
+        self.nodes = list(nodes)
+        self.node_index = {code: i for i, code in enumerate(self.nodes)}
+        self.offsets = offsets
+        self.targets = targets
+        self.tiers = tiers
+        self.weights = weights
+        self._reversed = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, str, str]]) -> "OccupationGraph":
+        """Build from (code, related code, relatedness tier, index) rows"""
+        tier_index = {name: i for i, name in enumerate(TIERS)}
+        edges: Dict[str, List[Tuple[int, str, int]]] = {}
+        for code, related, tier, rank in rows:
+            if tier in tier_index and related != code:
+                edges.setdefault(code, []).append((int(rank), related, tier_index[tier]))
+
+        nodes = sorted(set(edges) | {related for out in edges.values() for _, related, _ in out})
+        node_index = {code: i for i, code in enumerate(nodes)}
+        offsets, targets, tiers, weights = array("I", [0]), array("I"), array("B"), array("f")
+        for code in nodes:
+            for rank, related, tier in sorted(edges.get(code, [])):
+                targets.append(node_index[related])
+                tiers.append(tier)
+                weights.append(TIER_COSTS[tier] + RANK_COST * rank)
+            offsets.append(len(targets))
+        return cls(nodes, offsets, targets, tiers, weights)
+
+    def resolve(self, code: str) -> Optional[int]:
+        """Node index for an O*NET code ('15-1252.00') or SOC code ('15-1252')"""
+        node = self.node_index.get(code)
+        if node is None and len(code) == 7:
+            node = self.node_index.get(f"{code}.00")
+        return node
+
+    @staticmethod
+    def tier_limit(name: Optional[str]) -> int:
+        """Index of a tier name (case-insensitive); None allows every tier"""
+        if name is None:
+            return len(TIERS) - 1
+        for i, tier in enumerate(TIERS):
+            if tier.lower() == name.strip().lower():
+                return i
+        raise ValueError(f"Unknown relatedness tier '{name}' (expected one of {', '.join(TIERS)})")
+
+    def related(self, code: str, max_tier: int = len(TIERS) - 1) -> List[str]:
+        """Directly related occupations, closest first"""
+        node = self.resolve(code)
+        if node is None:
+            return []
+        return [self.nodes[self.targets[e]]
+                for e in range(self.offsets[node], self.offsets[node + 1]) if self.tiers[e] <= max_tier]
+
+    def neighborhood(self, code: str, hops: int = 1, max_tier: int = len(TIERS) - 1,
+                     limit: Optional[int] = None) -> List[RelatedOccupation]:
+        """
+        Occupations within `hops` steps, cheapest first
+
+        Relaxes edges one hop at a time, so each cost is the cheapest over
+        paths of at most `hops` steps; only nodes improved in the previous
+        round are expanded again.
+        """
+        source = self.resolve(code)
+        if source is None:
+            return []
+        offsets, targets, tiers, weights = self.offsets, self.targets, self.tiers, self.weights
+        cost = {source: 0.0}
+        first_hop: Dict[int, int] = {}
+        last_tier: Dict[int, int] = {}
+        frontier = [source]
+        for hop in range(1, hops + 1):
+            improved = {}
+            for node in frontier:
+                base = cost[node]
+                for e in range(offsets[node], offsets[node + 1]):
+                    tier = tiers[e]
+                    if tier > max_tier:
+                        continue
+                    target = targets[e]
+                    c = base + weights[e]
+                    if target != source and c < cost.get(target, float("inf")):
+                        cost[target] = c
+                        last_tier[target] = tier
+                        first_hop.setdefault(target, hop)
+                        improved[target] = True
+            if not improved:
+                break
+            frontier = list(improved)
+
+        del cost[source]
+        ranked = sorted(cost.items(), key=lambda item: item[1])
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [RelatedOccupation(self.nodes[node], first_hop[node], round(c, 4), TIERS[last_tier[node]])
+                for node, c in ranked]
+
+    def shortest_path(self, source_code: str, target_code: str,
+                      max_tier: int = len(TIERS) - 1) -> Optional[CareerPath]:
+        """
+        Cheapest chain of related-occupation steps, or None if unreachable
+
+        Bidirectional Dijkstra: searches forward from the source and
+        backward from the target, alternating, and stops once no shorter
+        path through an unsettled node can exist. Each side only explores
+        a ball around its end of the path instead of most of the graph.
+        """
+        source, target = self.resolve(source_code), self.resolve(target_code)
+        if source is None or target is None:
+            return None
+        if source == target:
+            return CareerPath([self.nodes[source]], [], 0.0)
+
+        forward = (self.offsets, self.targets, self.tiers, self.weights, range(len(self.targets)))
+        sides = (forward, self._reverse())
+        cost = ({source: 0.0}, {target: 0.0})
+        previous: Tuple[Dict[int, Tuple[int, int]], Dict[int, Tuple[int, int]]] = ({}, {})
+        settled = (set(), set())
+        heaps = ([(0.0, source)], [(0.0, target)])
+        best, meeting = float("inf"), None
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            c, node = heapq.heappop(heaps[side])
+            if node in settled[side]:
+                continue
+            settled[side].add(node)
+            offsets, targets, tiers, weights, edge_ids = sides[side]
+            for e in range(offsets[node], offsets[node + 1]):
+                if tiers[e] > max_tier:
+                    continue
+                nxt = targets[e]
+                nc = c + weights[e]
+                if nc < cost[side].get(nxt, float("inf")):
+                    cost[side][nxt] = nc
+                    previous[side][nxt] = (node, edge_ids[e])
+                    heapq.heappush(heaps[side], (nc, nxt))
+                other = cost[1 - side].get(nxt)
+                if other is not None and cost[side][nxt] + other < best:
+                    best, meeting = cost[side][nxt] + other, nxt
+        if meeting is None:
+            return None
+
+        # Walk back to the source, then forward to the target, collecting edges
+        nodes, edges = [meeting], []
+        node = meeting
+        while node != source:
+            node, e = previous[0][node]
+            nodes.insert(0, node)
+            edges.insert(0, e)
+        node = meeting
+        while node != target:
+            node, e = previous[1][node]
+            nodes.append(node)
+            edges.append(e)
+        return CareerPath([self.nodes[n] for n in nodes], [TIERS[self.tiers[e]] for e in edges], round(best, 4))
+
+    def _reverse(self) -> tuple:
+        """Incoming edges in CSR form, with each edge's index in the forward columns"""
+        if self._reversed is None:
+            incoming: List[List[Tuple[int, int]]] = [[] for _ in self.nodes]
+            for node in range(len(self.nodes)):
+                for e in range(self.offsets[node], self.offsets[node + 1]):
+                    incoming[self.targets[e]].append((node, e))
+            offsets, sources, tiers, weights, edge_ids = [0], [], [], [], []
+            for edges in incoming:
+                for node, e in edges:
+                    sources.append(node)
+                    tiers.append(self.tiers[e])
+                    weights.append(self.weights[e])
+                    edge_ids.append(e)
+                offsets.append(len(sources))
+            self._reversed = (offsets, sources, tiers, weights, edge_ids)
+        return self._reversed
+
+    def info(self) -> Dict:
+        return {"occupations": len(self.nodes), "edges": self.edge_count}
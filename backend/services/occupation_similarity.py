@@ -0,0 +1,131 @@
+"""
+KalmSkills Backend - Occupation similarity
+Most similar occupations by skill and knowledge profile, precomputed offline
+"""
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .skill_matrix import SkillMatrix
+
+# Neighbors kept per occupation
+SIMILAR_K = 20
+
+# Content model domains compared; each counts equally
+SIMILARITY_DOMAINS = ("Skill", "Knowledge")
+
+# SOC code prefixes tried, most specific first, for occupations O*NET has
+# not rated ("All Other" codes): their profile is the mean of the rated
+# occupations under 15-1299 (O*NET's own children), 15-129, 15-12, then 15
+GROUP_PREFIXES = (7, 6, 4, 2)
+
+
+@dataclass
+class SimilarOccupation:
+    code: str
+    similarity: float  # cosine of the centered profiles, -1 to 1
+
+
+class OccupationSimilarity:
+    """
+    Precomputed nearest neighbors in CSR form: occupation i's most similar
+    occupations are targets[offsets[i]:offsets[i + 1]], most similar first,
+    with their cosine similarity in `scores`. A lookup is a dict access
+    and a slice; the quadratic work happens once, when the O*NET snapshot
+    is built.
+    """
+
+    def __init__(self, codes: Sequence[str], offsets: Sequence[int], targets: Sequence[int],
+                 scores: Sequence[float]):
+        self.codes = list(codes)
+        self.code_rows = {code: i for i, code in enumerate(self.codes)}
+        self.offsets = offsets
+        self.targets = targets
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def from_matrix(cls, matrix: SkillMatrix, codes: Sequence[str], k: int = SIMILAR_K,
+                    domains: Sequence[str] = SIMILARITY_DOMAINS) -> "OccupationSimilarity":
+        """
+        Compute each occupation's k most similar rated occupations
+
+        Profiles are the importance ratings of `domains`, centered on the
+        mean over rated occupations (so near-universal elements don't make
+        everything look alike) and normalized per domain. Similarity is
+        the cosine, one (n x n) product.
+        """
+        domain_ids = [matrix.domains.index(domain) for domain in domains if domain in matrix.domains]
+        cols = np.nonzero(np.isin(matrix.element_domains, domain_ids))[0]
+        profiles = np.zeros((len(codes), len(cols)), dtype=np.float32)
+        for i, code in enumerate(codes):
+            row = matrix.code_index.get(code)
+            if row is not None:
+                profiles[i] = matrix.importance[row, cols]
+
+        rated = profiles.any(axis=1)
+        if rated.any():
+            profiles[rated] -= profiles[rated].mean(axis=0)
+        col_domains = matrix.element_domains[cols]
+        for domain in domain_ids:
+            block = col_domains == domain
+            norms = np.linalg.norm(profiles[:, block], axis=1, keepdims=True)
+            profiles[:, block] /= np.where(norms > 0, norms, 1.0)
+
+        # Unrated occupations take the mean profile of their closest SOC group
+        rated_codes = sorted(code for code, is_rated in zip(codes, rated) if is_rated)
+        row_of = {code: i for i, code in enumerate(codes)}
+        for i in np.nonzero(~rated)[0]:
+            for length in GROUP_PREFIXES:
+                prefix = codes[i][:length]
+                start = bisect_left(rated_codes, prefix)
+                end = bisect_left(rated_codes, prefix + "\uffff", start)
+                if end > start:
+                    profiles[i] = profiles[[row_of[code] for code in rated_codes[start:end]]].mean(axis=0)
+                    break
+
+        norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+        profiles /= np.where(norms > 0, norms, 1.0)
+        similarity = profiles @ profiles.T
+        # Only rated occupations are suggested, and never the occupation itself
+        similarity[:, ~rated] = -np.inf
+        np.fill_diagonal(similarity, -np.inf)
+
+        offsets, targets, scores = array("I", [0]), array("I"), array("f")
+        k = min(k, int(rated.sum()))
+        if k > 0:
+            top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(similarity, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top, top_scores = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+        for i in range(len(codes)):
+            if k > 0 and norms[i, 0] > 0:
+                keep = np.isfinite(top_scores[i])
+                targets.extend(top[i][keep].tolist())
+                scores.extend(top_scores[i][keep].tolist())
+            offsets.append(len(targets))
+        return cls(codes, offsets, targets, scores)
+
+    def similar(self, code: str, limit: Optional[int] = None) -> List[SimilarOccupation]:
+        """Most similar occupations, best first (empty for unknown codes)"""
+        row = self.code_rows.get(code)
+        if row is None:
+            return []
+        start, end = self.offsets[row], self.offsets[row + 1]
+        if limit is not None:
+            end = min(end, start + max(limit, 0))
+        return [SimilarOccupation(self.codes[target], round(float(score), 4))
+                for target, score in zip(self.targets[start:end], self.scores[start:end])]
+
+    def similar_codes(self, code: str, limit: Optional[int] = None) -> List[str]:
+        return [neighbor.code for neighbor in self.similar(code, limit)]
+
+    def info(self) -> Dict:
+        return {"occupations": sum(1 for i in range(len(self.codes)) if self.offsets[i + 1] > self.offsets[i]),
+                "neighbors": len(self.targets)}
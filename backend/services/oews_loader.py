@@ -0,0 +1,171 @@
+"""
+KalmSkills Backend - OEWS wage table ingestion
+Reads the BLS Occupational Employment and Wage Statistics national table
+"""
+
+import re
+import csv
+import zipfile
+import tempfile
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .onet_loader import iter_xlsx, xlsx_sheets
+
+logger = logging.getLogger(__name__)
+
+# Full-time-equivalent hours BLS uses to convert annual wages to hourly
+HOURS_PER_YEAR = 2080
+
+# OEWS uses "*", "**" and "#" for suppressed or top-coded estimates
+SUPPRESSED = {"", "*", "**", "#", "~"}
+
+SOC_CODE_RE = re.compile(r"^\d{2}-\d{4}$")
+YEAR_RE = re.compile(r"(?:M|_)(\d{4})")
+
+
+@dataclass
+class OewsWage:
+    soc_code: str
+    title: str
+    occ_group: str  # total / major / minor / broad / detailed
+    year: Optional[int]
+    total_employment: Optional[int]
+    hourly_mean: Optional[float]
+    hourly_p10: Optional[float]
+    hourly_p25: Optional[float]
+    hourly_median: Optional[float]
+    hourly_p75: Optional[float]
+    hourly_p90: Optional[float]
+
+
+# OEWS column -> OewsWage field, hourly and annual variants
+WAGE_COLUMNS = (
+    ("hourly_mean", "H_MEAN", "A_MEAN"),
+    ("hourly_p10", "H_PCT10", "A_PCT10"),
+    ("hourly_p25", "H_PCT25", "A_PCT25"),
+    ("hourly_median", "H_MEDIAN", "A_MEDIAN"),
+    ("hourly_p75", "H_PCT75", "A_PCT75"),
+    ("hourly_p90", "H_PCT90", "A_PCT90"),
+)
+
+
+def normalize_soc_code(code: str) -> Optional[str]:
+    """'15-1252.00' (O*NET), '151252' or '15-1252' -> '15-1252'"""
+    code = code.strip()
+    if len(code) == 6 and code.isdigit():
+        code = f"{code[:2]}-{code[2:]}"
+    code = code[:7]
+    return code if SOC_CODE_RE.match(code) else None
+
+
+def read_oews_table(path: Path) -> Iterator[OewsWage]:
+    """
+    Yield the national cross-industry rows of an OEWS table.
+
+    Accepts the national_M<year>_dl.xlsx workbook, the oesm<yy>nat.zip
+    archive it ships in, or the same table saved as CSV. Wages are stored
+    hourly; occupations published with annual wages only (e.g. teachers)
+    are converted at 2080 hours a year.
+    """
+    path = Path(path)
+    year_match = YEAR_RE.search(path.name)
+    year = int(year_match.group(1)) if year_match else None
+
+    if path.suffix.lower() == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            members = [name for name in archive.namelist()
+                       if name.lower().endswith((".xlsx", ".csv")) and "national" in name.lower()]
+            if not members:
+                raise ValueError(f"No national OEWS table in {path}")
+            with tempfile.TemporaryDirectory() as tmp:
+                extracted = Path(archive.extract(members[0], tmp))
+                yield from _read_rows(_iter_table(extracted), year or _year_from(members[0]))
+        return
+    yield from _read_rows(_iter_table(path), year)
+
+
+def _year_from(name: str) -> Optional[int]:
+    match = YEAR_RE.search(name)
+    return int(match.group(1)) if match else None
+
+
+def _iter_table(path: Path) -> Iterator[List[str]]:
+    if path.suffix.lower() == ".xlsx":
+        yield from iter_xlsx(path, _data_sheet(path))
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            yield from csv.reader(f)
+
+
+def _data_sheet(path: Path) -> Optional[str]:
+    """
+    Name of the worksheet holding the table: the first with an OCC_CODE
+    header, since releases add notes and field-description sheets around it
+    """
+    with zipfile.ZipFile(path) as archive:
+        names = [name for name, _ in xlsx_sheets(archive)]
+    for name in names:
+        rows = iter_xlsx(path, name)
+        header = next(rows, [])
+        rows.close()
+        if "OCC_CODE" in (cell.strip().upper() for cell in header):
+            return name
+    return None
+
+
+def _read_rows(rows: Iterator[List[str]], year: Optional[int]) -> Iterator[OewsWage]:
+    header = next(rows, None)
+    if header is None:
+        return
+    columns: Dict[str, int] = {name.strip().upper(): i for i, name in enumerate(header)}
+    # Older releases call the group column OCC_GROUP
+    group_name = "O_GROUP" if "O_GROUP" in columns else "OCC_GROUP"
+    required = ("OCC_CODE", "OCC_TITLE", "TOT_EMP")
+    missing = [name for name in required if name not in columns]
+    if missing:
+        raise ValueError(f"OEWS table is missing column(s) {missing}")
+
+    def field(values: List[str], name: str) -> str:
+        i = columns.get(name)
+        return values[i].strip() if i is not None and i < len(values) else ""
+
+    for values in rows:
+        # National files may also carry industry breakdowns; keep cross-industry rows
+        if field(values, "NAICS") not in ("", "000000") or field(values, "OWN_CODE") not in ("", "1235"):
+            continue
+        code = normalize_soc_code(field(values, "OCC_CODE"))
+        if code is None:
+            continue
+        wage = OewsWage(
+            soc_code=code,
+            title=field(values, "OCC_TITLE"),
+            occ_group=field(values, group_name).lower(),
+            year=year,
+            total_employment=_to_int(field(values, "TOT_EMP")),
+            hourly_mean=None, hourly_p10=None, hourly_p25=None,
+            hourly_median=None, hourly_p75=None, hourly_p90=None
+        )
+        for attr, hourly_col, annual_col in WAGE_COLUMNS:
+            hourly = _to_float(field(values, hourly_col))
+            if hourly is None:
+                annual = _to_float(field(values, annual_col))
+                hourly = round(annual / HOURS_PER_YEAR, 2) if annual is not None else None
+            setattr(wage, attr, hourly)
+        yield wage
+
+
+def _to_float(value: str) -> Optional[float]:
+    if value in SUPPRESSED:
+        return None
+    try:
+        return float(value.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _to_int(value: str) -> Optional[int]:
+    number = _to_float(value)
+    return int(number) if number is not None else None
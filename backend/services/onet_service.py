@@ -6,18 +6,97 @@ Parses and searches locally downloaded O*NET database files
 import os
 import csv
 import json
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import heapq
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+from dataclasses import asdict, dataclass, field
 import logging
+from array import array
+import numpy as np
 from pathlib import Path
 
+from .search_index import InvertedIndex, tokenize
+from .onet_loader import OnetLoader, TEXT_DIR
+from .skill_matrix import SkillMatch, SkillMatrix
+from .skill_normalizer import NormalizedSkill, SkillElement, SkillNormalizer, SkillNormalizerBuilder
+from .occupation_graph import OccupationGraph
+from .occupation_similarity import OccupationSimilarity
+from .title_index import TitleIndex, TitleIndexBuilder
+from .technology_index import TechnologyIndex, TechnologyIndexBuilder
+from .task_index import TaskIndex, TaskIndexBuilder, TaskMatch, split_bullets
+from .vector_index import (
+    VectorIndex, VectorIndexBuilder, VectorMatch,
+    TITLE_WEIGHT, ALTERNATE_TITLE_WEIGHT, DESCRIPTION_WEIGHT, TASK_WEIGHT, TECHNOLOGY_WEIGHT
+)
+from .onet_snapshot import (
+    SnapshotError, SnapshotWriter, StringTable, StringTableView,
+    compute_source_digest, open_snapshot, snapshot_lock
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Path to O*NET data
-ONET_DATA_DIR = Path("backend/data/onet/extracted/db_29_0_text")
+ONET_DATA_DIR = TEXT_DIR
+
+@dataclass(frozen=True)
+class ElementDomain:
+    key: str  # snapshot section prefix
+    table: str  # O*NET table with one row per occupation, element and scale
+    category: str  # Skill.category of its elements
+    attribute: str  # Occupation field listing them
+    importance_scale: str
+    level_scale: Optional[str]
+    min_importance: float  # elements rated less important are not kept
+
+# The content model domains rated per occupation, in matching precedence
+# (an element name found in two domains matches the first)
+ELEMENT_DOMAINS = (
+    ElementDomain("skill", "Skills", "Skill", "skills", "IM", "LV", 2.0),
+    ElementDomain("know", "Knowledge", "Knowledge", "knowledge", "IM", "LV", 2.0),
+    ElementDomain("abil", "Abilities", "Ability", "abilities", "IM", "LV", 2.0),
+    ElementDomain("style", "Work Styles", "Work Style", "work_styles", "IM", None, 2.0),
+    # Occupational Interest (RIASEC) on 1-7; the full profile is kept
+    ElementDomain("intr", "Interests", "Interest", "interests", "OI", None, 0.0),
+)
+
+# O*NET tables the service is built from
+ONET_TABLES = (
+    "Occupation Data", "Job Zones",
+    "Alternate Titles", "Task Statements", "Technology Skills", "Related Occupations",
+    "Sample of Reported Titles", "Tools Used", "Tasks to DWAs", "DWA Reference"
+) + tuple(domain.table for domain in ELEMENT_DOMAINS)
+
+# Typical education by O*NET Job Zone
+JOB_ZONE_EDUCATION = {
+    1: "High school diploma or less",
+    2: "High school diploma",
+    3: "Vocational training or associate's degree",
+    4: "Bachelor's degree",
+    5: "Graduate or professional degree"
+}
+
+# Compiled binary snapshot (see backend/build_onet_snapshot.py)
+CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "onet" / "cache"
+SNAPSHOT_PATH = CACHE_DIR / "onet.snapshot"
+
+# Per-occupation string lists stored in the snapshot: attribute -> section prefix
+STRING_LIST_SECTIONS = {"alternate_titles": "alt", "tasks": "task"}
+
+SEARCH_FIELDS = ("title", "alternate_titles", "description")
+SEARCH_WEIGHTS = (3.0, 1.5, 1.0)  # Title hits count more than description hits
+
+# Title matches considered when a search has no limit
+TITLE_MATCH_LIMIT = 50
+# Score of a related occupation filling out an exact title match's results
+RELATED_MATCH_WEIGHT = 0.5
+# Score of the best full-text (BM25) hit on the title layers' scale (see
+# title_index); a title prefix or typo match adds its own score to it
+TEXT_MATCH_WEIGHT = 0.5
 
-@dataclass
+# Occupations without skill ratings borrow them from this many related ones
+SKILL_FALLBACK_SOURCES = 3
+
+@dataclass(slots=True)
 class Skill:
     id: str
     name: str
@@ -26,7 +105,7 @@ class Skill:
     level: float
     importance: float
 
-@dataclass
+@dataclass(slots=True)
 class Occupation:
     code: str
     title: str
@@ -34,28 +113,194 @@ class Occupation:
     skills: List[Skill]
     education_level: str
     median_salary: Optional[float] = None
+    tasks: List[str] = field(default_factory=list)
+    knowledge: List[Skill] = field(default_factory=list)
+    abilities: List[Skill] = field(default_factory=list)
+    work_styles: List[Skill] = field(default_factory=list)
+    interests: List[Skill] = field(default_factory=list)
+
+class DecodedStrings(dict):
+    """string id -> str memo over a string table, filled on first use"""
+
+    def __init__(self, strings: Sequence[str]):
+        super().__init__()
+        self._strings = strings
+
+    def __missing__(self, string_id: int) -> str:
+        value = self[string_id] = self._strings[string_id]
+        return value
+
+class SkillTable(Mapping):
+    """
+    Read-only code -> List[Skill] mapping over struct-of-arrays columns.
+
+    Each occupation's skills are a contiguous, importance-sorted slice of
+    the columns: ids, names and categories as ids into an interned string
+    table, importance and level as float32. The columns are snapshot
+    memoryviews or arrays built by from_rows(); Skill objects are
+    short-lived views created on access, not stored.
+    """
+
+    def __init__(self, codes: Sequence[str], offsets: Sequence[int], ids: Sequence[int],
+                 names: Sequence[int], categories: Sequence[int], importance: Sequence[float],
+                 level: Sequence[float], strings: Sequence[str]):
+        self._slices = _slices(codes, offsets)
+        self._columns = (ids, names, categories)
+        self._importance = np.asarray(importance, dtype=np.float32)
+        self._level = np.asarray(level, dtype=np.float32)
+        self._strings = strings
+        # Decoded once: every Skill view of an element shares the same str objects
+        self._decoded = DecodedStrings(strings)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple], category: str = "Skill", min_importance: float = 2.0,
+                  importance_scale: str = "IM", level_scale: Optional[str] = "LV") -> "SkillTable":
+        """Pivot (code, element id, name, scale, value) rows; keeps elements rated important enough"""
+        ratings: Dict[str, Dict[str, List]] = {}  # code -> element id -> [name, importance, level]
+        for code, elem_id, name, scale, value in rows:
+            if scale != importance_scale and scale != level_scale:
+                continue
+            rating = ratings.setdefault(code, {}).setdefault(elem_id, [name, 0.0, 0.0])
+            if scale == importance_scale:
+                rating[1] = float(value)
+            else:
+                rating[2] = float(value)
+
+        strings = StringTable()
+        category_id = strings.intern(category)
+        offsets, ids, names, categories = array("I", [0]), array("I"), array("I"), array("I")
+        importance, level = array("f"), array("f")
+        for elements in ratings.values():
+            rated = sorted((item for item in elements.items() if item[1][1] >= min_importance),
+                           key=lambda item: item[1][1], reverse=True)
+            for elem_id, (name, elem_importance, elem_level) in rated:
+                ids.append(strings.intern(elem_id))
+                names.append(strings.intern(name))
+                categories.append(category_id)
+                importance.append(elem_importance)
+                level.append(elem_level)
+            offsets.append(len(ids))
+        return cls(list(ratings), offsets, ids, names, categories, importance, level, strings.values)
+
+    def __getitem__(self, code: str) -> List[Skill]:
+        start, end = self._slices[code]
+        ids, names, categories = (column[start:end] for column in self._columns)
+        # Rounded per slice in one call; float32 ratings come back as 2-decimal floats
+        importance = np.round(self._importance[start:end].astype(np.float64), 2).tolist()
+        level = np.round(self._level[start:end].astype(np.float64), 2).tolist()
+        decoded = self._decoded
+        return [
+            Skill(decoded[elem_id], decoded[name], "", decoded[category], elem_level, elem_importance)
+            for elem_id, name, category, elem_importance, elem_level in zip(ids, names, categories, importance, level)
+        ]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slices)
+
+    def __len__(self) -> int:
+        return len(self._slices)
+
+class SnapshotStringLists(Mapping):
+    """Read-only code -> List[str] mapping backed by snapshot columns"""
+
+    def __init__(self, codes: Sequence[str], offsets: Sequence[int], values: Sequence[int],
+                 strings: StringTableView):
+        self._slices = _slices(codes, offsets)
+        self._values = values
+        self._strings = strings
+
+    def __getitem__(self, code: str) -> List[str]:
+        start, end = self._slices[code]
+        return [self._strings[self._values[i]] for i in range(start, end)]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slices)
+
+    def __len__(self) -> int:
+        return len(self._slices)
+
+class SnapshotStrings(Sequence):
+    """Read-only list of strings stored as string table ids"""
+
+    def __init__(self, values: Sequence[int], strings: StringTableView):
+        self._values = values
+        self._strings = strings
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._strings[value] for value in self._values[i]]
+        return self._strings[self._values[i]]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+def _slices(codes: Sequence[str], offsets: Sequence[int]) -> Dict[str, tuple]:
+    return {
+        code: (offsets[i], offsets[i + 1])
+        for i, code in enumerate(codes) if offsets[i + 1] > offsets[i]
+    }
 
 class OnetService:
     """Service for querying local O*NET database"""
     
-    def __init__(self):
-        self.occupations = {}  # code -> {title, description}
-        self.skills_data = {}  # code -> List[Skill]
+    def __init__(self, use_snapshot: bool = True):
+        self.occupations = {}  # code -> {title, description, job_zone}
+        # Content model domain -> (code -> List[Skill]); skills_data is the Skills one
+        self.elements = {domain.category: SkillTable.from_rows([]) for domain in ELEMENT_DOMAINS}
+        self.skills_data = self.elements["Skill"]
+        self.alternate_titles = {}  # code -> List[str]
+        self.tasks = {}  # code -> List[str]
+        self.technology_index = TechnologyIndexBuilder().build([])
+        self.task_index = TaskIndexBuilder().build([])
+        self.vector_index = VectorIndexBuilder().build([])
+        self.occupation_graph = OccupationGraph.from_rows([])
+        self.occupation_similarity = OccupationSimilarity([], [0], [], [])
+        self.title_index = None
         self.load_error = None
         self.data_path = None
+        self.load_timings = {}  # table -> {rows, seconds}
+        self.use_snapshot = use_snapshot
+        self.search_index = InvertedIndex(SEARCH_FIELDS, SEARCH_WEIGHTS)
+        self.skill_matrix = None
+        self.skill_normalizer = SkillNormalizerBuilder([]).build([])
+        self._snapshot = None
         self._load_data()
+        if self._snapshot is None:
+            self._build_search_index()
+            if self.title_index is None:
+                self._build_title_index()
+            if self.task_index.codes != list(self.occupations):
+                self._build_task_index()
+            self._build_vector_index()
+            self._build_skill_matrix()
+            self._build_skill_normalizer(self.skill_matrix)
     
+    def _source_files(self) -> List[Path]:
+        """Files the service data is compiled from (used to detect stale snapshots)"""
+        loader = OnetLoader()
+        if loader.path("Occupation Data"):
+            return [path for path in (loader.path(table) for table in ONET_TABLES) if path]
+        return [p for p in (CACHE_DIR / "occupations.json", CACHE_DIR / "skills.json") if p.exists()]
+
     def _load_data(self):
-        """Load data from JSON cache or text files"""
+        """Load data from binary snapshot, O*NET text export or JSON cache"""
         # Use absolute path relative to this file to ensure it works on Render
-        base_dir = Path(__file__).resolve().parent.parent # backend/
-        cache_dir = base_dir / "data" / "onet" / "cache"
+        cache_dir = CACHE_DIR
         self.data_path = str(cache_dir)
         
         logger.info(f"Current working directory: {os.getcwd()}")
+
+        # Compiled snapshot is fastest: mmap, no parsing
+        if self.use_snapshot and (self._load_snapshot() or self._compile_snapshot()):
+            return
+
+        # Then the extracted O*NET database itself
+        if self._load_text_files():
+            return
+
         logger.info(f"Looking for O*NET cache at: {cache_dir}")
         
-        # Try loading from JSON cache first (Preferred for Render)
+        # Legacy JSON cache
         if (cache_dir / "occupations.json").exists() and (cache_dir / "skills.json").exists():
             logger.info("Loading O*NET data from JSON cache...")
             try:
@@ -71,43 +316,11 @@ class OnetService:
                 # Load Skills
                 with open(cache_dir / "skills.json", "r", encoding="utf-8") as f:
                     skills_list = json.load(f)
-                    
-                    temp_skills = {}
-                    for row in skills_list:
-                        code = row["O*NET-SOC Code"]
-                        elem_id = row["Element ID"]
-                        scale = row["Scale ID"]
-                        value = float(row["Data Value"])
-                        name = row["Element Name"]
-                        
-                        if code not in temp_skills:
-                            temp_skills[code] = {}
-                        if elem_id not in temp_skills[code]:
-                            temp_skills[code][elem_id] = {
-                                "name": name, 
-                                "importance": 0, 
-                                "level": 0
-                            }
-                        
-                        if scale == "IM":
-                            temp_skills[code][elem_id]["importance"] = value
-                        elif scale == "LV":
-                            temp_skills[code][elem_id]["level"] = value
-
-                    # Convert to Skill objects
-                    for code, elems in temp_skills.items():
-                        self.skills_data[code] = []
-                        for elem_id, vals in elems.items():
-                            if vals["importance"] >= 2.0:
-                                self.skills_data[code].append(Skill(
-                                    id=elem_id,
-                                    name=vals["name"],
-                                    description="", 
-                                    category="Skill",
-                                    level=vals["level"],
-                                    importance=vals["importance"]
-                                ))
-                        self.skills_data[code].sort(key=lambda x: x.importance, reverse=True)
+                    self.skills_data = self.elements["Skill"] = SkillTable.from_rows(
+                        (row["O*NET-SOC Code"], row["Element ID"], row["Element Name"],
+                         row["Scale ID"], row["Data Value"])
+                        for row in skills_list
+                    )
 
                 logger.info(f"Loaded {len(self.occupations)} occupations from cache.")
                 return
@@ -119,64 +332,626 @@ class OnetService:
             self.load_error = f"Cache files not found at {cache_dir}"
             logger.warning(self.load_error)
 
-        # Fallback to text files
-        if not ONET_DATA_DIR.exists():
-            logger.warning(f"O*NET data directory not found at {ONET_DATA_DIR}. Using mock data.")
-            return
+    def _load_text_files(self) -> bool:
+        """Stream the O*NET database export straight into the service's indexes"""
+        loader = OnetLoader()
+        if loader.path("Occupation Data") is None:
+            logger.warning(f"O*NET data directory not found at {ONET_DATA_DIR}")
+            return False
 
+        logger.info(f"Loading O*NET data from {ONET_DATA_DIR}...")
+        try:
+            for code, title, description in loader.rows(
+                    "Occupation Data", ("O*NET-SOC Code", "Title", "Description")):
+                self.occupations[code] = {"title": title, "description": description}
 
-    def search_occupations(self, keyword: str) -> List[Dict]:
-        """Search for occupations by keyword in title or description"""
-        results = []
-        query_lower = keyword.lower()
-        keywords = query_lower.split()
-        
-        if not keywords:
-            return []
-        
+            for domain in ELEMENT_DOMAINS:
+                if loader.path(domain.table) is None:
+                    logger.warning(f"O*NET table {domain.table} not found; no {domain.category} ratings")
+                    continue
+                self.elements[domain.category] = SkillTable.from_rows(
+                    loader.rows(domain.table, ("O*NET-SOC Code", "Element ID", "Element Name", "Scale ID",
+                                               "Data Value")),
+                    domain.category, domain.min_importance, domain.importance_scale, domain.level_scale)
+            self.skills_data = self.elements["Skill"]
+
+            for code, job_zone in loader.rows("Job Zones", ("O*NET-SOC Code", "Job Zone")):
+                if code in self.occupations:
+                    self.occupations[code]["job_zone"] = int(job_zone)
+
+            titles = TitleIndexBuilder()
+            for code, data in self.occupations.items():
+                titles.add_official(code, data["title"])
+            for code, title, short_title, sources in loader.rows(
+                    "Alternate Titles", ("O*NET-SOC Code", "Alternate Title", "Short Title", "Source(s)")):
+                self.alternate_titles.setdefault(code, []).append(title)
+                titles.add_alternate(code, title, short_title, sources)
+            for code, title, shown in loader.rows(
+                    "Sample of Reported Titles", ("O*NET-SOC Code", "Reported Job Title", "Shown in My Next Move")):
+                titles.add_reported(code, title, shown == "Y")
+            self.title_index = titles.build(list(self.occupations))
+
+            tasks = TaskIndexBuilder()
+            for code, task_id, task in loader.rows("Task Statements", ("O*NET-SOC Code", "Task ID", "Task")):
+                self.tasks.setdefault(code, []).append(task)
+                tasks.add_task(code, task_id, task)
+            dwa_titles = dict(loader.rows("DWA Reference", ("DWA ID", "DWA Title")))
+            for task_id, dwa_id in loader.rows("Tasks to DWAs", ("Task ID", "DWA ID")):
+                if dwa_id in dwa_titles:
+                    tasks.add_dwa(task_id, dwa_titles[dwa_id])
+            self.task_index = tasks.build(list(self.occupations))
+
+            technology = TechnologyIndexBuilder()
+            for code, example, commodity_code, commodity_title, hot, in_demand in loader.rows(
+                    "Technology Skills", ("O*NET-SOC Code", "Example", "Commodity Code", "Commodity Title",
+                                          "Hot Technology", "In Demand")):
+                technology.add_technology(code, example, commodity_code, commodity_title,
+                                          hot == "Y", in_demand == "Y")
+            for code, example, commodity_code, commodity_title in loader.rows(
+                    "Tools Used", ("O*NET-SOC Code", "Example", "Commodity Code", "Commodity Title")):
+                technology.add_tool(code, example, commodity_code, commodity_title)
+            self.technology_index = technology.build(list(self.occupations))
+
+            self.occupation_graph = OccupationGraph.from_rows(loader.rows(
+                "Related Occupations", ("O*NET-SOC Code", "Related O*NET-SOC Code", "Relatedness Tier", "Index")))
+        except Exception as e:
+            self.load_error = str(e)
+            logger.error(f"Error loading O*NET text files: {e}")
+            return False
+        finally:
+            self.load_timings = {
+                t.table: {"rows": t.rows, "seconds": round(t.seconds, 4)}
+                for t in loader.timings.values()
+            }
+
+        self.load_error = None
+        self.data_path = str(ONET_DATA_DIR)
+        logger.info(f"Loaded {len(self.occupations)} occupations from O*NET text files:")
+        loader.log_timings()
+        return True
+
+    def _load_snapshot(self) -> bool:
+        """Memory-map the compiled snapshot; False if missing, corrupt or stale"""
+        # A load that fails part way leaves the service as it was, not half
+        # pointing into a snapshot it could not read
+        previous = dict(vars(self))
+        try:
+            sources = self._source_files()
+            digest = compute_source_digest(sources) if sources else None
+            snapshot = open_snapshot(SNAPSHOT_PATH, digest)
+
+            # Every column is read with its expected length, so a snapshot
+            # with another layout fails here with SnapshotError (and is
+            # recompiled) instead of being misread
+            strings = snapshot.strings("strings")
+            codes = [strings[i] for i in snapshot.array("occ.code", "I")]
+            n = len(codes)
+            titles = snapshot.array("occ.title", "I", n)
+            descriptions = snapshot.array("occ.desc", "I", n)
+            job_zones = snapshot.array("occ.jobzone", "B", n)
+            self.occupations = {}
+            for i, code in enumerate(codes):
+                self.occupations[code] = {"title": strings[titles[i]], "description": strings[descriptions[i]]}
+                if job_zones[i]:
+                    self.occupations[code]["job_zone"] = job_zones[i]
+
+            def csr(prefix: str, count: int, offsets: str = "offsets") -> tuple:
+                """A CSR offsets column over `count` rows, and its number of entries"""
+                column = snapshot.array(f"{prefix}.{offsets}", "I", count + 1)
+                return column, column[-1]
+
+            self.elements = {}
+            for domain in ELEMENT_DOMAINS:
+                offsets, entries = csr(domain.key, n)
+                self.elements[domain.category] = SkillTable(
+                    codes,
+                    offsets,
+                    snapshot.array(f"{domain.key}.id", "I", entries),
+                    snapshot.array(f"{domain.key}.name", "I", entries),
+                    snapshot.array(f"{domain.key}.category", "I", entries),
+                    snapshot.array(f"{domain.key}.importance", "f", entries),
+                    snapshot.array(f"{domain.key}.level", "f", entries),
+                    strings
+                )
+            self.skills_data = self.elements["Skill"]
+            for name, section in STRING_LIST_SECTIONS.items():
+                offsets, entries = csr(section, n)
+                setattr(self, name, SnapshotStringLists(
+                    codes, offsets, snapshot.array(f"{section}.values", "I", entries), strings
+                ))
+
+            vocabulary = snapshot.array("idx.vocab", "I")
+            term_offsets, postings = csr("idx", len(vocabulary), "terms")
+            self.search_index = InvertedIndex.from_columns(
+                keys=codes,
+                texts=[self._phrase_text(data) for data in self.occupations.values()],
+                vocabulary=SnapshotStrings(vocabulary, strings),
+                term_offsets=term_offsets,
+                post_docs=snapshot.array("idx.docs", "I", postings),
+                post_freqs=snapshot.array("idx.freqs", "H", postings * len(SEARCH_FIELDS)),
+                field_lengths=snapshot.array("idx.lengths", "H", n * len(SEARCH_FIELDS)),
+                fields=SEARCH_FIELDS,
+                weights=SEARCH_WEIGHTS
+            )
+
+            nodes = snapshot.array("rel.nodes", "I")
+            offsets, edges = csr("rel", len(nodes))
+            self.occupation_graph = OccupationGraph(
+                [strings[i] for i in nodes],
+                offsets,
+                snapshot.array("rel.targets", "I", edges),
+                snapshot.array("rel.tiers", "B", edges),
+                snapshot.array("rel.weights", "f", edges)
+            )
+
+            # String columns stay in the mapping and are decoded per lookup
+            title_keys = snapshot.array("ttl.titles", "I")
+            offsets, entries = csr("ttl", len(title_keys))
+            grams = snapshot.array("ttl.grams", "I")
+            gram_offsets, gram_entries = csr("ttl", len(grams), "gram_offsets")
+            self.title_index = TitleIndex(
+                codes,
+                SnapshotStrings(title_keys, strings),
+                SnapshotStrings(snapshot.array("ttl.display", "I", len(title_keys)), strings),
+                offsets,
+                snapshot.array("ttl.codes", "I", entries),
+                snapshot.array("ttl.scores", "f", entries),
+                SnapshotStrings(grams, strings),
+                gram_offsets,
+                snapshot.array("ttl.gram_titles", "I", gram_entries),
+                snapshot.array("ttl.gram_counts", "H", len(title_keys))
+            )
+
+            names = snapshot.array("tech.names", "I")
+            commodity_codes = snapshot.array("tech.cm_codes", "I")
+            offsets, entries = csr("tech", n)
+            lookup = snapshot.array("tech.lookup", "I")
+            bitset_size = (entries + 7) // 8
+            self.technology_index = TechnologyIndex(
+                codes,
+                SnapshotStrings(names, strings),
+                commodity_codes,
+                SnapshotStrings(snapshot.array("tech.cm_titles", "I", len(commodity_codes)), strings),
+                offsets,
+                snapshot.array("tech.entry_name", "I", entries),
+                snapshot.array("tech.entry_cm", "H", entries),
+                snapshot.array("tech.hot", "B", bitset_size),
+                snapshot.array("tech.in_demand", "B", bitset_size),
+                snapshot.array("tech.tool", "B", bitset_size),
+                SnapshotStrings(lookup, strings),
+                snapshot.array("tech.lookup_ids", "I", len(lookup)),
+                snapshot.array("tech.user_offs", "I", len(names) + 1),
+                snapshot.array("tech.user_ents", "I", entries)
+            )
+
+            task_texts = snapshot.array("task.values", "I")
+            features = snapshot.array("tsk.features", "I")
+            offsets, postings = csr("tsk", len(features))
+            self.task_index = TaskIndex(
+                codes,
+                snapshot.array("tsk.rows", "I", len(task_texts)),
+                SnapshotStrings(task_texts, strings),
+                features,
+                snapshot.array("tsk.idf", "f", len(features)),
+                offsets,
+                snapshot.array("tsk.post_tasks", "I", postings),
+                snapshot.array("tsk.post_weights", "f", postings)
+            )
+
+            matrix_rows = [codes[i] for i in snapshot.array("mx.rows", "I")]
+            element_ids = snapshot.array("mx.elements", "I")
+            shape = (len(matrix_rows), len(element_ids))
+            self.skill_matrix = SkillMatrix(
+                matrix_rows,
+                [strings[i] for i in element_ids],
+                [strings[i] for i in snapshot.array("mx.names", "I", len(element_ids))],
+                snapshot.matrix("mx.importance", np.float32, shape),
+                snapshot.matrix("mx.level", np.float32, shape),
+                snapshot.array("mx.domains", "B", len(element_ids)),
+                [strings[i] for i in snapshot.array("mx.categories", "I")],
+                snapshot.matrix("mx.weights", np.float32, shape)
+            )
+
+            technology = self.technology_index
+            keys = snapshot.array("nrm.keys", "I")
+            offsets, targets = csr("nrm", len(keys))
+            grams = snapshot.array("nrm.grams", "I")
+            gram_offsets, gram_entries = csr("nrm", len(grams), "gram_offs")
+            self.skill_normalizer = SkillNormalizer(
+                SnapshotStrings(keys, strings),
+                offsets,
+                snapshot.array("nrm.targets", "I", targets),
+                snapshot.array("nrm.kinds", "B", len(keys)),
+                SnapshotStrings(grams, strings),
+                gram_offsets,
+                snapshot.array("nrm.gram_ents", "I", gram_entries),
+                snapshot.array("nrm.gram_counts", "H", len(keys)),
+                self._normalizer_elements(self.skill_matrix),
+                technology.names,
+                snapshot.array("nrm.commodities", "H", len(technology.names)),
+                technology.commodity_codes,
+                technology.commodity_titles
+            )
+
+            features = snapshot.array("vec.features", "I")
+            vector_offsets = snapshot.array("vec.offsets", "I")
+            vector_rows = snapshot.array("vec.rows", "I")
+            cells = max(len(vector_offsets) - 1, 0)
+            dimensions = len(snapshot.section("vec.centroids")) // 4 // cells if cells else 0
+            self.vector_index = VectorIndex(
+                codes,
+                features,
+                snapshot.array("vec.idf", "f", len(features)),
+                snapshot.matrix("vec.projection", np.float16, (len(features), dimensions)),
+                snapshot.matrix("vec.centroids", np.float32, (cells, dimensions)),
+                vector_offsets,
+                vector_rows,
+                snapshot.matrix("vec.vectors", np.float32, (len(vector_rows), dimensions))
+            )
+
+            offsets, neighbors = csr("sim", n)
+            self.occupation_similarity = OccupationSimilarity(
+                codes,
+                offsets,
+                snapshot.array("sim.targets", "I", neighbors),
+                snapshot.array("sim.scores", "f", neighbors)
+            )
+        except SnapshotError as e:
+            logger.info(f"Not using O*NET snapshot: {e}")
+            vars(self).update(previous)
+            return False
+        except Exception as e:
+            logger.error(f"Error loading O*NET snapshot: {e}")
+            vars(self).update(previous)
+            return False
+
+        # Keep the mapping open for as long as the service uses its views
+        self._snapshot = snapshot
+        self.data_path = str(SNAPSHOT_PATH)
+        logger.info(f"Loaded {len(self.occupations)} occupations from snapshot.")
+        return True
+
+    def _compile_snapshot(self) -> bool:
+        """
+        Compile a missing or stale snapshot from the text export, then map it
+
+        Workers booting together serialize on a lock file: the first one
+        compiles, the others wait and map its snapshot instead of each
+        parsing the export into private memory.
+        """
+        if OnetLoader().path("Occupation Data") is None:
+            return False
+        with snapshot_lock(SNAPSHOT_PATH):
+            if self._load_snapshot():
+                return True
+            if not self._load_text_files():
+                return False
+            try:
+                self.write_snapshot()
+            except (OSError, SnapshotError) as e:
+                logger.warning(f"Could not write O*NET snapshot: {e}")
+                return True
+        # Swap the parsed data for views of the shared mapping
+        self._load_snapshot()
+        return True
+
+    def write_snapshot(self, path: Path = SNAPSHOT_PATH) -> Path:
+        """Compile the loaded data and search index into a binary snapshot"""
+        strings = StringTable()
+        codes = list(self.occupations)
+        if self.search_index.keys != codes:
+            self._build_search_index()
+
+        writer = SnapshotWriter()
+        for domain in ELEMENT_DOMAINS:
+            table = self.elements.get(domain.category, {})
+            offsets, ids, names, categories = array("I", [0]), array("I"), array("I"), array("I")
+            importance, level = array("f"), array("f")
+            for code in codes:
+                for skill in table.get(code, []):
+                    ids.append(strings.intern(skill.id))
+                    names.append(strings.intern(skill.name))
+                    categories.append(strings.intern(skill.category))
+                    importance.append(skill.importance or 0.0)
+                    level.append(skill.level or 0.0)
+                offsets.append(len(ids))
+            for name, column in (("offsets", offsets), ("id", ids), ("name", names), ("category", categories),
+                                 ("importance", importance), ("level", level)):
+                writer.add(f"{domain.key}.{name}", column)
+
+        writer.add("occ.code", array("I", (strings.intern(code) for code in codes)))
+        writer.add("occ.title", array("I", (strings.intern(d["title"]) for d in self.occupations.values())))
+        writer.add("occ.desc", array("I", (strings.intern(d["description"]) for d in self.occupations.values())))
+        writer.add("occ.jobzone", array("B", (d.get("job_zone", 0) for d in self.occupations.values())))
+
+        for name, section in STRING_LIST_SECTIONS.items():
+            mapping = getattr(self, name)
+            offsets, values = array("I", [0]), array("I")
+            for code in codes:
+                values.extend(strings.intern(value) for value in mapping.get(code, []))
+                offsets.append(len(values))
+            writer.add(f"{section}.offsets", offsets)
+            writer.add(f"{section}.values", values)
+
+        matrix = self.skill_matrix
+        if matrix is None or self.occupation_similarity.codes != codes:
+            matrix = self._build_skill_matrix()
+        code_rows = {code: i for i, code in enumerate(codes)}
+        writer.add("mx.rows", array("I", (code_rows[code] for code in matrix.codes)))
+        writer.add("mx.elements", array("I", (strings.intern(e) for e in matrix.element_ids)))
+        writer.add("mx.names", array("I", (strings.intern(n) for n in matrix.element_names)))
+        writer.add("mx.importance", matrix.importance.astype(np.float32).tobytes())
+        writer.add("mx.level", matrix.level.astype(np.float32).tobytes())
+        writer.add("mx.weights", matrix.weights.astype(np.float32).tobytes())
+        writer.add("mx.domains", matrix.element_domains.tobytes())
+        writer.add("mx.categories", array("I", (strings.intern(c) for c in matrix.domains)))
+
+        normalizer = self.skill_normalizer
+        if (normalizer.n_elements != len(matrix.element_ids)
+                or len(normalizer.names) != len(self.technology_index.names)):
+            normalizer = self._build_skill_normalizer(matrix)
+        writer.add("nrm.keys", array("I", (strings.intern(key) for key in normalizer.keys)))
+        writer.add("nrm.offsets", array("I", normalizer.offsets))
+        writer.add("nrm.targets", array("I", normalizer.targets))
+        writer.add("nrm.kinds", array("B", normalizer.kinds))
+        writer.add("nrm.grams", array("I", (strings.intern(gram) for gram in normalizer.gram_keys)))
+        writer.add("nrm.gram_offs", normalizer.gram_offsets.tobytes())
+        writer.add("nrm.gram_ents", normalizer.gram_entries.tobytes())
+        writer.add("nrm.gram_counts", normalizer.gram_counts.tobytes())
+        writer.add("nrm.commodities", array("H", normalizer.name_commodities))
+
+        # Nearest neighbors are computed with the matrix, once, rather than per process
+        similarity = self.occupation_similarity
+        writer.add("sim.offsets", array("I", similarity.offsets))
+        writer.add("sim.targets", array("I", similarity.targets))
+        writer.add("sim.scores", array("f", similarity.scores))
+
+        graph = self.occupation_graph
+        writer.add("rel.nodes", array("I", (strings.intern(code) for code in graph.nodes)))
+        writer.add("rel.offsets", array("I", graph.offsets))
+        writer.add("rel.targets", array("I", graph.targets))
+        writer.add("rel.tiers", array("B", graph.tiers))
+        writer.add("rel.weights", array("f", graph.weights))
+
+        titles = self.title_index
+        if titles is None or titles.codes != codes:
+            titles = self._build_title_index()
+        writer.add("ttl.titles", array("I", (strings.intern(title) for title in titles.titles)))
+        writer.add("ttl.display", array("I", (strings.intern(title) for title in titles.display)))
+        writer.add("ttl.offsets", array("I", titles.offsets))
+        writer.add("ttl.codes", array("I", titles.entry_codes))
+        writer.add("ttl.scores", array("f", titles.entry_scores))
+        writer.add("ttl.grams", array("I", (strings.intern(gram) for gram in titles.gram_keys)))
+        writer.add("ttl.gram_offsets", titles.gram_offsets.tobytes())
+        writer.add("ttl.gram_titles", titles.gram_titles.tobytes())
+        writer.add("ttl.gram_counts", titles.gram_counts.tobytes())
+
+        technology = self.technology_index
+        if technology.codes != codes:
+            technology = TechnologyIndexBuilder().build(codes)
+        writer.add("tech.names", array("I", (strings.intern(name) for name in technology.names)))
+        writer.add("tech.cm_codes", array("I", technology.commodity_codes))
+        writer.add("tech.cm_titles", array("I", (strings.intern(title) for title in technology.commodity_titles)))
+        writer.add("tech.offsets", array("I", technology.offsets))
+        writer.add("tech.entry_name", array("I", technology.entry_names))
+        writer.add("tech.entry_cm", array("H", technology.entry_commodities))
+        writer.add("tech.hot", technology.hot)
+        writer.add("tech.in_demand", technology.in_demand)
+        writer.add("tech.tool", technology.tool)
+        writer.add("tech.lookup", array("I", (strings.intern(name) for name in technology.lookup_names)))
+        writer.add("tech.lookup_ids", array("I", technology.lookup_ids))
+        writer.add("tech.user_offs", array("I", technology.user_offsets))
+        writer.add("tech.user_ents", array("I", technology.user_entries))
+
+        # Task vectors are stored against the flat task list written above
+        tasks = self.task_index
+        if tasks.codes != codes or len(tasks) != sum(len(self.tasks.get(code, [])) for code in codes):
+            tasks = self._build_task_index()
+        writer.add("tsk.rows", tasks.task_rows.tobytes())
+        writer.add("tsk.features", tasks.features.tobytes())
+        writer.add("tsk.idf", tasks.idf.tobytes())
+        writer.add("tsk.offsets", tasks.offsets.tobytes())
+        writer.add("tsk.post_tasks", tasks.post_tasks.tobytes())
+        writer.add("tsk.post_weights", tasks.post_weights.tobytes())
+
+        vectors = self.vector_index
+        if vectors.codes != codes:
+            vectors = self._build_vector_index()
+        writer.add("vec.features", vectors.features.tobytes())
+        writer.add("vec.idf", vectors.idf.tobytes())
+        writer.add("vec.projection", vectors.projection.astype(np.float16).tobytes())
+        writer.add("vec.centroids", vectors.centroids.astype(np.float32).tobytes())
+        writer.add("vec.offsets", vectors.offsets.tobytes())
+        writer.add("vec.rows", vectors.rows.tobytes())
+        writer.add("vec.vectors", vectors.vectors.astype(np.float32).tobytes())
+
+        index = self.search_index
+        writer.add("idx.vocab", array("I", (strings.intern(term) for term in index.vocabulary)))
+        writer.add("idx.terms", array("I", index.term_offsets))
+        writer.add("idx.docs", array("I", index.post_docs))
+        writer.add("idx.freqs", array("H", index.post_freqs))
+        writer.add("idx.lengths", array("H", index.field_lengths))
+        writer.add_strings("strings", strings)
+
+        writer.write(path, compute_source_digest(self._source_files()))
+        # The payload checksum is checked once here rather than at every boot
+        open_snapshot(path, verify=True).close()
+        logger.info(f"Wrote O*NET snapshot with {len(codes)} occupations to {path}")
+        return Path(path)
+
+    @staticmethod
+    def _phrase_text(data: Dict) -> str:
+        return f"{data['title']} {data['description']}".lower()
+
+    def _build_search_index(self):
+        """Build the occupation inverted index once, after data is loaded"""
+        index = InvertedIndex(SEARCH_FIELDS, SEARCH_WEIGHTS)
         for code, data in self.occupations.items():
-            text = (data["title"] + " " + data["description"]).lower()
-            score = 0
-            
-            # Exact phrase match bonus
-            if query_lower in text:
-                score += 50
-            
-            # Keyword match
-            matches = 0
-            for word in keywords:
-                if len(word) > 2 and word in text: # Ignore short words
-                    matches += 1
-            
-            if matches > 0:
-                score += matches * 10
-            
-            if score > 0:
-                # Get skills for this occupation
-                skills = self.skills_data.get(code, [])
-                serialized_skills = [
-                    {
-                        "id": s.id,
-                        "name": s.name,
-                        "description": s.description,
-                        "category": s.category,
-                        "level": s.level,
-                        "importance": s.importance
-                    } for s in skills
-                ]
-
-                results.append({
-                    "code": code,
-                    "title": data["title"],
-                    "description": data["description"],
-                    "score": score,
-                    "skills": serialized_skills
-                })
-        
-        # Sort by score
-        results.sort(key=lambda x: x["score"], reverse=True)
-        
-        return results
+            # Each alternate-title word counts once, however many titles repeat it
+            alternate_titles = " ".join(dict.fromkeys(
+                token for title in self.alternate_titles.get(code, []) for token in tokenize(title)
+            ))
+            index.add(code, (data["title"], alternate_titles, data["description"]),
+                      text=self._phrase_text(data))
+        index.finalize()
+        self.search_index = index
+        logger.info(f"Indexed {len(self.search_index)} occupations, "
+                    f"{len(self.search_index.vocabulary)} terms")
+
+    def _build_title_index(self) -> TitleIndex:
+        """Title index from official and alternate titles (when the text export isn't loaded)"""
+        titles = TitleIndexBuilder()
+        for code, data in self.occupations.items():
+            titles.add_official(code, data["title"])
+            for title in self.alternate_titles.get(code, []):
+                titles.add_alternate(code, title)
+        self.title_index = titles.build(list(self.occupations))
+        return self.title_index
+
+    def _build_task_index(self) -> TaskIndex:
+        """Task index from the loaded task statements alone (no DWA titles)"""
+        tasks = TaskIndexBuilder()
+        for code, statements in self.tasks.items():
+            for i, task in enumerate(statements):
+                tasks.add_task(code, f"{code}:{i}", task)
+        self.task_index = tasks.build(list(self.occupations))
+        return self.task_index
+
+    def _build_skill_matrix(self) -> SkillMatrix:
+        """
+        Element matrix over every occupation, rated or not
+
+        Similar occupations are found from the rated profiles alone; then
+        occupations O*NET has not rated get the same borrowed ratings as
+        their detail view (get_occupation_elements), so they can be matched.
+        """
+        codes = list(self.occupations)
+        rated = SkillMatrix.from_skills(list(self.elements.values()))
+        self.occupation_similarity = OccupationSimilarity.from_matrix(rated, codes)
+        tables = []
+        for table in self.elements.values():
+            tables.append({code: table.get(code) or self._borrowed_elements(code, table) for code in codes})
+        self.skill_matrix = SkillMatrix.from_skills(tables)
+        return self.skill_matrix
+
+    @staticmethod
+    def _normalizer_elements(matrix: SkillMatrix) -> List[SkillElement]:
+        return [SkillElement(element_id, name, matrix.domains[domain])
+                for element_id, name, domain in zip(matrix.element_ids, matrix.element_names,
+                                                    matrix.element_domains.tolist())]
+
+    def _build_skill_normalizer(self, matrix: SkillMatrix) -> SkillNormalizer:
+        """Skill name lookup over the matrix's elements and every technology and tool"""
+        technology = self.technology_index
+        normalizer = SkillNormalizerBuilder(matrix.element_names)
+        for name_id, name in enumerate(technology.names):
+            normalizer.add_technology(name, technology.is_software(name_id))
+        self.skill_normalizer = normalizer.build(self._normalizer_elements(matrix), technology.name_commodities(),
+                                                 technology.commodity_codes, technology.commodity_titles)
+        return self.skill_normalizer
+
+    def _build_vector_index(self) -> VectorIndex:
+        """Vector index over each occupation's titles, description, tasks and technologies"""
+        vectors = VectorIndexBuilder()
+        for code, data in self.occupations.items():
+            vectors.add(code, data["title"], TITLE_WEIGHT)
+            for title in self.alternate_titles.get(code, []):
+                vectors.add(code, title, ALTERNATE_TITLE_WEIGHT)
+            vectors.add(code, data["description"], DESCRIPTION_WEIGHT)
+            for task in self.tasks.get(code, []):
+                vectors.add(code, task, TASK_WEIGHT)
+            for name in self.technology_index.technology_names(code):
+                vectors.add(code, name, TECHNOLOGY_WEIGHT)
+        self.vector_index = vectors.build(list(self.occupations))
+        return self.vector_index
+
+    def search_occupations(self, keyword: str, limit: Optional[int] = None, offset: int = 0,
+                           include_skills: bool = False) -> List[Dict]:
+        """Search for occupations; see iter_occupations"""
+        return list(self.iter_occupations(keyword, limit, offset, include_skills))
+
+    def iter_occupations(self, keyword: str, limit: Optional[int] = None, offset: int = 0,
+                         include_skills: bool = False) -> Iterator[Dict]:
+        """
+        Search for occupations by job title, then keyword in title or description
+
+        Job titles O*NET knows ("line cook", "CFO") resolve through the
+        title index without running the full-text scorer; the remaining
+        slots are filled with occupations related to the ones found. Other
+        queries rank BM25 results and title prefix/typo matches together,
+        by the sum of their scores. A blank keyword lists every occupation
+        in code order.
+
+        Rows are produced one at a time, so a caller streaming them (or
+        stopping early) never holds the whole serialized result.
+
+        Args:
+            keyword: Free-text query
+            limit: Maximum number of results (None returns every match)
+            offset: Number of top-ranked results to skip, for pagination
+            include_skills: Attach serialized skills to each returned row
+        """
+        k = offset + limit if limit is not None else None
+        if keyword.strip():
+            ranked = self._rank_occupations(keyword, k)
+        else:
+            ranked = [(code, None, None) for code in sorted(self.occupations)]
+
+        for code, score, matched_title in ranked[offset:k]:
+            data = self.occupations[code]
+            row = {
+                "code": code,
+                "title": data["title"],
+                "description": data["description"],
+                "score": score
+            }
+            if matched_title:
+                row["matched_title"] = matched_title
+            # Skills are only serialized for the rows actually returned
+            if include_skills:
+                row["skills"] = [self._serialize_skill(s) for s in self.skills_data.get(code, [])]
+            yield row
+
+    def _rank_occupations(self, keyword: str, k: Optional[int]) -> List[tuple]:
+        """(code, score, matched title or None) for the top k occupations, best first"""
+        title_matches = self.title_index.lookup(keyword, k or TITLE_MATCH_LIMIT) if self.title_index else []
+        if title_matches and title_matches[0].layer == "exact":
+            ranked = [(match.code, match.score, match.title) for match in title_matches]
+            seen = {code for code, _, _ in ranked}
+            for match in title_matches:
+                for code in self.occupation_graph.related(match.code):
+                    if k is not None and len(ranked) >= k:
+                        break
+                    if code not in seen and code in self.occupations:
+                        seen.add(code)
+                        ranked.append((code, round(match.score * RELATED_MATCH_WEIGHT, 4), None))
+            return ranked
+
+        # Prefix and typo matches are weaker evidence than an exact title:
+        # they only add to the full-text score, normalized to the best hit
+        query = keyword
+        typo = title_matches[0] if title_matches and title_matches[0].layer == "trigram" else None
+        if typo and typo.title.lower() not in keyword.lower():
+            # Also search for the title the typo most likely meant
+            query = f"{keyword} {typo.title}"
+        scores = {match.code: match.score for match in title_matches}
+        titles = {match.code: match.title for match in title_matches}
+        text_matches = self.search_index.search(query, k)
+        for code, score in text_matches:
+            scores[code] = scores.get(code, 0.0) + TEXT_MATCH_WEIGHT * score / text_matches[0][1]
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(code, round(score, 4), titles.get(code)) for code, score in best]
+
+    @staticmethod
+    def _serialize_skill(skill: Skill) -> Dict:
+        return {
+            "id": skill.id,
+            "name": skill.name,
+            "description": skill.description,
+            "category": skill.category,
+            "level": skill.level,
+            "importance": skill.importance
+        }
 
     def get_occupation_details(self, onet_code: str) -> Optional[Occupation]:
         """Get detailed information about a specific occupation"""
@@ -184,26 +959,269 @@ class OnetService:
             return None
         
         data = self.occupations[onet_code]
-        skills = self.get_occupation_skills(onet_code)
         
         return Occupation(
             code=onet_code,
             title=data["title"],
             description=data["description"],
-            skills=skills,
-            education_level="Bachelor's degree" # Placeholder, Education.txt would need parsing
+            education_level=JOB_ZONE_EDUCATION.get(data.get("job_zone"), "Bachelor's degree"),
+            tasks=list(self.tasks.get(onet_code, [])),
+            **{domain.attribute: self.get_occupation_elements(onet_code, domain.category)
+               for domain in ELEMENT_DOMAINS}
         )
     
     def get_occupation_skills(self, onet_code: str) -> List[Skill]:
         """Get skills required for an occupation"""
-        return self.skills_data.get(onet_code, [])
+        return self.get_occupation_elements(onet_code, "Skill")
+
+    def get_occupation_elements(self, onet_code: str, category: str) -> List[Skill]:
+        """
+        Ratings of one content model domain for an occupation, most important first
+
+        Occupations O*NET has not rated (mostly "All Other" codes) get the
+        ratings of their closest related occupations instead, or of their
+        most similar ones when they have no related occupations either;
+        most important first and each element once.
+
+        Args:
+            onet_code: O*NET-SOC code
+            category: Skill, Knowledge, Ability, Work Style or Interest
+        """
+        table = self.elements.get(category, {})
+        skills = table.get(onet_code)
+        if skills or onet_code not in self.occupations:
+            return skills or []
+        return self._borrowed_elements(onet_code, table)
+
+    def _borrowed_elements(self, onet_code: str, table: Mapping[str, List[Skill]]) -> List[Skill]:
+        """An unrated occupation's ratings, merged from its closest related or similar occupations"""
+        sources = [code for code in self.occupation_graph.related(onet_code)
+                   if table.get(code)][:SKILL_FALLBACK_SOURCES]
+        if not sources:
+            sources = [code for code in self.occupation_similarity.similar_codes(onet_code)
+                       if table.get(code)][:SKILL_FALLBACK_SOURCES]
+        merged = heapq.merge(*(table[code] for code in sources),
+                             key=lambda skill: skill.importance, reverse=True)
+        seen = set()
+        skills = []
+        for skill in merged:
+            if skill.id not in seen:
+                seen.add(skill.id)
+                skills.append(skill)
+        return skills
+
+    def get_related_occupations(self, onet_code: str, hops: int = 1, max_tier: Optional[str] = None,
+                                limit: Optional[int] = None) -> List[Dict]:
+        """
+        Occupations within `hops` related-occupation steps, closest first
+
+        Args:
+            onet_code: O*NET-SOC or SOC code
+            hops: Maximum number of steps
+            max_tier: Loosest relatedness tier to follow (e.g. "Primary-Short")
+            limit: Maximum number of results
+        """
+        neighbors = self.occupation_graph.neighborhood(
+            onet_code, hops, OccupationGraph.tier_limit(max_tier), limit)
+        return [
+            {
+                "code": n.code,
+                "title": self.occupations.get(n.code, {}).get("title", ""),
+                "hops": n.hops,
+                "cost": n.cost,
+                "tier": n.tier
+            }
+            for n in neighbors
+        ]
+
+    def get_similar_occupations(self, onet_code: str, limit: Optional[int] = None) -> List[Dict]:
+        """Occupations with the most similar skill and knowledge profiles, most similar first"""
+        return [
+            {
+                "code": neighbor.code,
+                "title": self.occupations.get(neighbor.code, {}).get("title", ""),
+                "similarity": neighbor.similarity
+            }
+            for neighbor in self.occupation_similarity.similar(onet_code, limit)
+        ]
+
+    def get_career_path(self, from_code: str, to_code: str, max_tier: Optional[str] = None) -> Optional[Dict]:
+        """Cheapest chain of related occupations from one occupation to another"""
+        path = self.occupation_graph.shortest_path(from_code, to_code, OccupationGraph.tier_limit(max_tier))
+        if path is None:
+            return None
+        return {
+            "cost": path.cost,
+            "steps": len(path.tiers),
+            "path": [
+                {
+                    "code": code,
+                    "title": self.occupations.get(code, {}).get("title", ""),
+                    "tier": path.tiers[i - 1] if i else None
+                }
+                for i, code in enumerate(path.codes)
+            ]
+        }
+
+    def match_skills(self, resume_skills: List[str], limit: int = 10,
+                     occupation_code: Optional[str] = None) -> List[SkillMatch]:
+        """
+        Rank occupations by how much of their required skills a resume
+        covers and how many of its technologies they use
+
+        Args:
+            resume_skills: Skill names from the resume
+            limit: Number of occupations to return
+            occupation_code: Only score this occupation
+        """
+        return self.match_skills_batch([resume_skills], limit, occupation_code)[0]
+
+    def match_skills_batch(self, resumes: List[List[str]], limit: int = 10,
+                           occupation_code: Optional[str] = None) -> List[List[SkillMatch]]:
+        """Score many resumes against every occupation in one matrix product"""
+        if self.skill_matrix is None or not len(self.skill_matrix):
+            return [[] for _ in resumes]
+        vectors = self.skill_matrix.vectorize_columns([self.skill_normalizer.columns(skills) for skills in resumes])
+        return self.skill_matrix.match_batch(resumes, limit, occupation_code, vectors,
+                                             self._technology_overlap(resumes))
+
+    def _technology_overlap(self, resumes: List[List[str]]) -> np.ndarray:
+        """Share of each resume's technologies every skill matrix occupation uses (TechnologyIndex.overlap)"""
+        technology = self.technology_index
+        # Matrix row -> technology index row; -1 (no technologies) reads a trailing zero
+        rows = np.fromiter((technology.code_rows.get(code, -1) for code in self.skill_matrix.codes),
+                           dtype=np.intp, count=len(self.skill_matrix))
+        overlap = np.zeros((len(resumes), len(self.skill_matrix)), dtype=np.float32)
+        for r, skills in enumerate(resumes):
+            name_ids = technology.resolve_all(self.skill_normalizer.technology_names(skills))
+            if name_ids:
+                overlap[r] = np.append(technology.overlap(name_ids), 0.0)[rows]
+        return overlap
+
+    def normalize_skills(self, skills: List[str]) -> List[NormalizedSkill]:
+        """Raw resume skills -> the O*NET elements and technologies they name"""
+        return self.skill_normalizer.normalize(skills)
+
+    def match_resumes(self, requests: List[tuple]) -> List[List[SkillMatch]]:
+        """
+        Match many resumes, each against all occupations or its own target
+
+        Args:
+            requests: (resume_skills, target_occupation or None, limit) tuples
+        Returns:
+            One list of matches per request, best first. Scores mix skill
+            coverage with the share of the resume's technologies (e.g.
+            "Kubernetes") each occupation uses. Untargeted resumes matching
+            no occupation with skill data fall back to the occupations using
+            the most of their technologies, then to the occupations closest
+            to their whole text (vector search); an empty list means nothing
+            matched at all. Every match lists the resume technologies it uses.
+        """
+        results: List[List[SkillMatch]] = [[] for _ in requests]
+        targeted: Dict[str, List[int]] = {}
+        ranked_codes: Dict[int, List[str]] = {}  # fallback rankings, scored per occupation
+
+        # Untargeted resumes are scored together in one matrix product
+        untargeted = [i for i, (_, target, _) in enumerate(requests) if not target]
+        if untargeted:
+            limit = max(max(requests[i][2] for i in untargeted), 1)
+            batch = self.match_skills_batch([requests[i][0] for i in untargeted], limit)
+            for i, matches in zip(untargeted, batch):
+                if matches:
+                    results[i] = matches[:max(requests[i][2], 1)]
+                    continue
+                # Nothing the matrix scores - rank by technologies used
+                ranked = self.technology_index.rank_occupations(
+                    self.skill_normalizer.technology_names(requests[i][0]), max(requests[i][2], 1))
+                if ranked:
+                    ranked_codes[i] = [code for code, _, _ in ranked]
+                    continue
+                # Nor a known technology - the occupations closest to all of its text
+                closest = self.vector_index.search(", ".join(requests[i][0]), max(requests[i][2], 1))
+                if closest:
+                    ranked_codes[i] = [match.occupation_code for match in closest]
+
+        for i, (_, target, _) in enumerate(requests):
+            if target:
+                targeted.setdefault(target, []).append(i)
+
+        for target, indexes in targeted.items():
+            batch = self.match_skills_batch([requests[i][0] for i in indexes], occupation_code=target)
+            for i, matches in zip(indexes, batch):
+                # Occupation without skill data scores zero
+                results[i] = matches or [SkillMatch(target, 0, [], [])]
+
+        for i, codes in ranked_codes.items():
+            results[i] = [
+                (self.match_skills_batch([requests[i][0]], occupation_code=code)[0] or [SkillMatch(code, 0, [], [])])[0]
+                for code in codes
+            ]
+
+        for (skills, _, _), matches in zip(requests, results):
+            name_ids = self.technology_index.resolve_all(self.skill_normalizer.technology_names(skills))
+            if name_ids:
+                for match in matches:
+                    match.matched_technologies = self.technology_index.matching_names(
+                        match.occupation_code, name_ids)
+
+        return results
+
+    def match_tasks(self, resume_text: str = "", bullets: Optional[List[str]] = None, limit: int = 10,
+                    tasks_per_occupation: int = 5, occupation_code: Optional[str] = None) -> List[TaskMatch]:
+        """
+        Rank occupations by how well their task statements match resume bullets
+
+        Args:
+            resume_text: Free resume text, split into lines/bullets/sentences
+            bullets: Already split bullets (used instead of resume_text)
+            limit: Number of occupations to return
+            tasks_per_occupation: Aligned tasks to return per occupation
+            occupation_code: Only score this occupation
+        """
+        bullets = bullets if bullets else split_bullets(resume_text)
+        return self.task_index.match(bullets, limit, tasks_per_occupation, occupation_code)
+
+    def match_text(self, resume_text: str, limit: int = 10, exact: Optional[bool] = None) -> List[VectorMatch]:
+        """
+        Occupations closest to a whole resume, by vector search
+
+        Args:
+            resume_text: Free resume text
+            limit: Number of occupations to return
+            exact: Brute force (True) or IVF probing (False); by default
+                whichever is faster for the number of occupations
+        """
+        return self.vector_index.search(resume_text, limit, exact=exact)
 
     def get_technology_skills(self, onet_code: str) -> List[str]:
-        """Get technology skills (from Technology Skills.txt if implemented)"""
-        # Placeholder for MVP
-        return []
+        """Get technology skill examples (from Technology Skills.txt), hot and in-demand first"""
+        return self.technology_index.technology_names(onet_code)
+
+    def get_technology_details(self, onet_code: str, include_tools: bool = False) -> List[Dict]:
+        """Technology skills (and optionally tools) with commodity and Hot/In Demand flags"""
+        return [asdict(entry) for entry in self.technology_index.entries(onet_code, include_tools)]
+
+    def find_occupations_by_technology(self, name: str, hot_only: bool = False) -> List[Dict]:
+        """
+        Occupations that use a technology or tool, e.g. "Kubernetes"
+
+        Args:
+            name: Technology or tool name as O*NET lists it (any case)
+            hot_only: Only occupations where it is a Hot Technology
+        """
+        return [
+            {
+                "code": user.code,
+                "title": self.occupations.get(user.code, {}).get("title", ""),
+                "hot_technology": user.hot_technology,
+                "in_demand": user.in_demand,
+                "kind": user.kind
+            }
+            for user in self.technology_index.users(name, hot_only)
+        ]
 
-# Test run
+# Test run; the service uses package-relative imports, so from backend/:
+#   python -m services.onet_service
 if __name__ == "__main__":
     svc = OnetService()
-    print(svc.search_occupations("software")[:2])
+    print(svc.search_occupations("software", limit=2, include_skills=True))
@@ -4,16 +4,25 @@ Uses downloaded O*NET database files instead of API
 """
 
 import json
+import heapq
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from pathlib import Path
 import logging
 
+from .onet_loader import OnetLoader
+from .occupation_graph import OccupationGraph
+from .occupation_similarity import OccupationSimilarity
+from .onet_snapshot import SnapshotError, open_snapshot
+from .technology_index import TechnologyIndexBuilder
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Path to cached O*NET data
 CACHE_DIR = Path(__file__).parent.parent / "data" / "onet" / "cache"
+# Compiled by backend/build_onet_snapshot.py; only its similar occupations are used here
+SNAPSHOT_PATH = CACHE_DIR / "onet.snapshot"
 
 @dataclass
 class Skill:
@@ -40,6 +49,11 @@ class OnetService:
         self.occupations = self._load_occupations()
         self.skills = self._load_skills()
         logger.info(f"Loaded {len(self.occupations)} occupations and {len(self.skills)} skill records")
+        self._build_indexes()
+        self.occupation_graph = OccupationGraph.from_rows(OnetLoader().rows(
+            "Related Occupations", ("O*NET-SOC Code", "Related O*NET-SOC Code", "Relatedness Tier", "Index")))
+        self.technology_index = self._load_technology()
+        self.occupation_similarity = self._load_similarity()
     
     def _load_occupations(self) -> List[Dict]:
         """Load occupations from cached JSON"""
@@ -61,6 +75,62 @@ class OnetService:
         with open(cache_file, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    def _build_indexes(self):
+        """
+        Index occupations and skills by O*NET-SOC code.
+
+        skills_by_code holds each occupation's skills (Importance scale only),
+        most important first.
+        """
+        self.occupation_index: Dict[str, Dict] = {}
+        for occ in self.occupations:
+            self.occupation_index.setdefault(occ.get('O*NET-SOC Code'), occ)
+
+        self.skills_by_code: Dict[str, List[Skill]] = {}
+        for skill_record in self.skills:
+            # Only use 'Importance' scale for skills (skip 'Level' to avoid duplicates)
+            if skill_record.get('Scale Name') != 'Importance':
+                continue
+            value = float(skill_record['Data Value']) if skill_record.get('Data Value') else None
+            self.skills_by_code.setdefault(skill_record.get('O*NET-SOC Code', ''), []).append(Skill(
+                id=skill_record.get('Element ID', ''),
+                name=skill_record.get('Element Name', ''),
+                description=skill_record.get('Description', ''),
+                category=skill_record.get('Scale Name', 'Skill'),
+                level=value,
+                importance=value
+            ))
+        for skills in self.skills_by_code.values():
+            skills.sort(key=lambda skill: skill.importance or 0.0, reverse=True)
+
+    def _load_technology(self):
+        """Index Technology Skills and Tools Used from the O*NET text export"""
+        loader = OnetLoader()
+        technology = TechnologyIndexBuilder()
+        for code, example, commodity_code, commodity_title, hot, in_demand in loader.rows(
+                "Technology Skills", ("O*NET-SOC Code", "Example", "Commodity Code", "Commodity Title",
+                                      "Hot Technology", "In Demand")):
+            technology.add_technology(code, example, commodity_code, commodity_title, hot == "Y", in_demand == "Y")
+        for code, example, commodity_code, commodity_title in loader.rows(
+                "Tools Used", ("O*NET-SOC Code", "Example", "Commodity Code", "Commodity Title")):
+            technology.add_tool(code, example, commodity_code, commodity_title)
+        return technology.build(list(self.occupation_index))
+
+    def _load_similarity(self) -> OccupationSimilarity:
+        """Most similar occupations by skill and knowledge profile, precomputed into the snapshot"""
+        try:
+            self._snapshot = open_snapshot(SNAPSHOT_PATH)
+            strings = self._snapshot.strings("strings")
+            return OccupationSimilarity(
+                [strings[i] for i in self._snapshot.array("occ.code", "I")],
+                self._snapshot.array("sim.offsets", "I"),
+                self._snapshot.array("sim.targets", "I"),
+                self._snapshot.array("sim.scores", "f")
+            )
+        except SnapshotError as e:
+            logger.warning(f"No similar occupations ({e}). Run build_onet_snapshot.py first.")
+            return OccupationSimilarity([], [0], [], [])
+
     def search_occupations(self, keyword: str) -> List[Dict]:
         """Search for occupations by keyword in real O*NET data"""
         keyword_lower = keyword.lower()
@@ -86,12 +156,7 @@ class OnetService:
     
     def get_occupation_details(self, onet_code: str) -> Optional[Occupation]:
         """Get detailed information about a specific occupation from real data"""
-        # Find occupation
-        occ_data = None
-        for occ in self.occupations:
-            if occ.get('O*NET-SOC Code') == onet_code:
-                occ_data = occ
-                break
+        occ_data = self.occupation_index.get(onet_code)
         
         if not occ_data:
             logger.warning(f"Occupation {onet_code} not found")
@@ -110,37 +175,29 @@ class OnetService:
     
     def get_occupation_skills(self, onet_code: str) -> List[Skill]:
         """Get skills required for an occupation from real O*NET data"""
-        occupation_skills = []
-        
-        for skill_record in self.skills:
-            if skill_record.get('O*NET-SOC Code') == onet_code:
-                # Only use 'Importance' scale for skills (skip 'Level' to avoid duplicates)
-                if skill_record.get('Scale Name') == 'Importance':
-                    occupation_skills.append(Skill(
-                        id=skill_record.get('Element ID', ''),
-                        name=skill_record.get('Element Name', ''),
-                        description=skill_record.get('Description', ''),
-                        category=skill_record.get('Scale Name', 'Skill'),
-                        level=float(skill_record.get('Data Value', 0)) if skill_record.get('Data Value') else None,
-                        importance=float(skill_record.get('Data Value', 0)) if skill_record.get('Data Value') else None
-                    ))
+        occupation_skills = self.skills_by_code.get(onet_code, [])
         
-        # If no skills found, try related occupations (e.g., 15-1252.00 -> 15-1253.00)
+        # If no skills found, borrow from O*NET's related occupations, or
+        # failing that from the occupations with the most similar profiles
         if not occupation_skills and onet_code:
-            similar_code = onet_code[:6]  # Get first 6 chars like '15-125'
-            logger.warning(f"No skills found for {onet_code}, searching for similar codes: {similar_code}*")
+            related_codes = [code for code in self.occupation_graph.related(onet_code)
+                             if code in self.skills_by_code][:3]
+            if not related_codes:
+                related_codes = [code for code in self.occupation_similarity.similar_codes(onet_code)
+                                 if code in self.skills_by_code][:3]
+            logger.warning(f"No skills found for {onet_code}, using related occupations: {related_codes}")
             
-            for skill_record in self.skills:
-                if skill_record.get('O*NET-SOC Code', '').startswith(similar_code):
-                    if skill_record.get('Scale Name') == 'Importance':
-                        occupation_skills.append(Skill(
-                            id=skill_record.get('Element ID', ''),
-                            name=skill_record.get('Element Name', ''),
-                            description=skill_record.get('Description', ''),
-                            category=skill_record.get('Scale Name', 'Skill'),
-                            level=float(skill_record.get('Data Value', 0)) if skill_record.get('Data Value') else None,
-                            importance=float(skill_record.get('Data Value', 0)) if skill_record.get('Data Value') else None
-                        ))
+            # Most important first across the related occupations, each skill once
+            related = heapq.merge(
+                *(self.skills_by_code[code] for code in related_codes),
+                key=lambda skill: skill.importance or 0.0, reverse=True
+            )
+            seen = set()
+            occupation_skills = []
+            for skill in related:
+                if skill.id not in seen:
+                    seen.add(skill.id)
+                    occupation_skills.append(skill)
                     if len(occupation_skills) >= 20:
                         break
         
@@ -148,10 +205,8 @@ class OnetService:
         return occupation_skills[:20]  # Return top 20 skills
     
     def get_technology_skills(self, onet_code: str) -> List[str]:
-        """Get technology/tool skills for an occupation"""
-        # Technology skills would require loading Technology Skills.xlsx
-        # For now, return empty list - can be enhanced later
-        return []
+        """Get technology skills for an occupation, hot and in-demand first"""
+        return self.technology_index.technology_names(onet_code)
 
 
 # Example usage
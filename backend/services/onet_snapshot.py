@@ -0,0 +1,263 @@
+"""
+KalmSkills Backend - Binary O*NET snapshot
+Versioned, checksummed container of columnar arrays that is memory-mapped
+at start-up instead of parsing JSON/text files
+"""
+
+import sys
+import mmap
+import zlib
+import struct
+import hashlib
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: compiling is unlocked, writes are still atomic
+    fcntl = None
+
+MAGIC = b"KSNP"
+# Bump whenever a section's encoding or meaning changes, not only when one is
+# added: the version is checked in the header and folded into the source
+# digest, so a snapshot an older build compiled from the same O*NET files is
+# recompiled instead of misread.
+#   1: occupations, skills, search index
+#   2: strings as string table ids (ttl.*, tech.names, tech.cm_titles,
+#      idx.vocab); per-domain element ratings; mx.*, sim.*, vec.*, nrm.*
+#   3: mx.* rows for unrated occupations, filled with borrowed ratings
+#   4: nrm.* keys name one column per shared element name; healthcare aliases
+SNAPSHOT_VERSION = 4
+
+# magic, version, little-endian flag, source digest (sha1), payload crc32, section count
+HEADER = struct.Struct("<4sHH20sII")
+# section name, offset from start of file, length in bytes
+SECTION = struct.Struct("<16sQQ")
+MAX_SECTION_NAME = 16
+ALIGNMENT = 8
+
+LITTLE_ENDIAN = 1 if sys.byteorder == "little" else 0
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, corrupt, stale or incompatible"""
+
+
+def compute_source_digest(paths: Iterable[Path]) -> bytes:
+    """
+    Fingerprint the source files a snapshot was compiled from
+
+    Only each file's name, size and modification time are hashed, not its
+    contents: every worker checks this at boot, and reading ~100 MB of
+    O*NET text would cost more than the snapshot load it guards.
+    """
+    digest = hashlib.sha1(f"v{SNAPSHOT_VERSION}".encode())
+    for path in sorted(Path(p) for p in paths):
+        stat = path.stat()
+        digest.update(f"{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode("utf-8"))
+    return digest.digest()
+
+
+class StringTable:
+    """Interns strings at build time so each distinct value is stored once"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return string_id
+
+    def to_bytes(self) -> bytes:
+        """Serialize as uint32 count, uint32 offsets[count + 1], utf-8 blob"""
+        encoded = [value.encode("utf-8") for value in self.values]
+        offsets = array("I", [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        return struct.pack("<I", len(encoded)) + offsets.tobytes() + b"".join(encoded)
+
+
+class StringTableView:
+    """Read-only view over a serialized StringTable; decodes on access"""
+
+    def __init__(self, buffer: memoryview):
+        count = struct.unpack_from("<I", buffer)[0]
+        offsets_end = 4 + 4 * (count + 1)
+        self.count = count
+        self.offsets = buffer[4:offsets_end].cast("I")
+        self.blob = buffer[offsets_end:]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, string_id: int) -> str:
+        return str(self.blob[self.offsets[string_id]:self.offsets[string_id + 1]], "utf-8")
+
+
+class SnapshotWriter:
+    """Collects named sections and writes them as a single snapshot file"""
+
+    def __init__(self):
+        self.sections: Dict[str, bytes] = {}
+
+    def add(self, name: str, data: Union[bytes, array]):
+        if len(name.encode()) > MAX_SECTION_NAME:
+            raise ValueError(f"Section name too long: {name}")
+        self.sections[name] = data.tobytes() if isinstance(data, array) else bytes(data)
+
+    def add_strings(self, name: str, table: StringTable):
+        self.add(name, table.to_bytes())
+
+    def write(self, path: Path, source_digest: bytes):
+        """Write atomically so a running reader never sees a partial file"""
+        path = Path(path)
+        table_size = HEADER.size + SECTION.size * len(self.sections)
+        offset = _align(table_size)
+
+        entries = []
+        payload = bytearray()
+        for name, data in self.sections.items():
+            padding = _align(offset + len(payload)) - (offset + len(payload))
+            payload += b"\0" * padding
+            entries.append(SECTION.pack(name.encode(), offset + len(payload), len(data)))
+            payload += data
+
+        header = HEADER.pack(MAGIC, SNAPSHOT_VERSION, LITTLE_ENDIAN, source_digest,
+                             zlib.crc32(payload), len(entries))
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(b"".join(entries))
+            f.write(b"\0" * (offset - table_size))
+            f.write(payload)
+        tmp_path.replace(path)
+
+
+class Snapshot:
+    """
+    Memory-mapped snapshot; sections are exposed as zero-copy memoryviews
+
+    The payload checksum is only checked with `verify` (after a build):
+    reading every page at each boot would undo the point of mapping them.
+    """
+
+    def __init__(self, path: Path, verify: bool = False):
+        self.path = Path(path)
+        self.verify = verify
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotError(f"Snapshot {self.path} is empty")
+        self.buffer = memoryview(self._mmap)
+        self.sections: Dict[str, memoryview] = {}
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self):
+        if len(self.buffer) < HEADER.size:
+            raise SnapshotError(f"Snapshot {self.path} is truncated")
+        magic, version, little_endian, digest, crc, count = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a KalmSkills snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Snapshot version {version} != {SNAPSHOT_VERSION}")
+        if little_endian != LITTLE_ENDIAN:
+            raise SnapshotError("Snapshot was built on a machine with different byte order")
+
+        payload_start = _align(HEADER.size + SECTION.size * count)
+        if payload_start > len(self.buffer):
+            raise SnapshotError(f"Snapshot {self.path} is truncated")
+        if self.verify and zlib.crc32(self.buffer[payload_start:]) != crc:
+            raise SnapshotError(f"Snapshot {self.path} failed checksum")
+
+        self.source_digest = digest
+        for i in range(count):
+            name, offset, length = SECTION.unpack_from(self.buffer, HEADER.size + i * SECTION.size)
+            if offset + length > len(self.buffer):
+                raise SnapshotError(f"Snapshot {self.path} is truncated")
+            self.sections[name.rstrip(b"\0").decode()] = self.buffer[offset:offset + length]
+
+    def section(self, name: str) -> memoryview:
+        if name not in self.sections:
+            raise SnapshotError(f"Snapshot {self.path} has no section '{name}'")
+        return self.sections[name]
+
+    def array(self, name: str, typecode: str, count: Optional[int] = None) -> memoryview:
+        """
+        Section as a typed array ('I' uint32, 'H' uint16, 'B' uint8, 'f' float32)
+
+        A section whose size doesn't fit the type, or holds other than
+        `count` items when given, raises SnapshotError: the snapshot does
+        not have the layout this code expects.
+        """
+        section = self.section(name)
+        size = struct.calcsize(typecode)
+        if len(section) % size or (count is not None and len(section) != count * size):
+            expected = f"{count} x {size}" if count is not None else f"a multiple of {size}"
+            raise SnapshotError(f"Snapshot section '{name}' has {len(section)} bytes, expected {expected}")
+        return section.cast(typecode)
+
+    def matrix(self, name: str, dtype, shape: Tuple[int, int]) -> np.ndarray:
+        """Section as a read-only (rows x columns) NumPy array, checked like array()"""
+        section = self.section(name)
+        itemsize = np.dtype(dtype).itemsize
+        if len(section) != shape[0] * shape[1] * itemsize:
+            raise SnapshotError(f"Snapshot section '{name}' has {len(section)} bytes, "
+                                f"expected {shape[0]} x {shape[1]} x {itemsize}")
+        return np.frombuffer(section, dtype=dtype).reshape(shape)
+
+    def strings(self, name: str) -> StringTableView:
+        return StringTableView(self.section(name))
+
+    def close(self):
+        # Views handed out keep the mapping alive; only drop ours
+        self.sections = {}
+        self.buffer.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+
+def open_snapshot(path: Path, source_digest: Optional[bytes] = None, verify: bool = False) -> Snapshot:
+    """Open a snapshot, rejecting it if it was compiled from different sources (or is corrupt, with verify)"""
+    if not Path(path).exists():
+        raise SnapshotError(f"No snapshot at {path}")
+    snapshot = Snapshot(path, verify)
+    if source_digest is not None and snapshot.source_digest != source_digest:
+        snapshot.close()
+        raise SnapshotError(f"Snapshot {path} is stale (source files changed)")
+    return snapshot
+
+
+@contextmanager
+def snapshot_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on `path`.lock, e.g. while compiling the snapshot"""
+    lock_path = Path(path).with_suffix(Path(path).suffix + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -0,0 +1,214 @@
+"""
+KalmSkills Backend - In-memory inverted index
+BM25F ranking over short multi-field documents (occupation titles/descriptions)
+"""
+
+import re
+import math
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Query terms this short are ignored, matching the original substring search
+MIN_TERM_LENGTH = 3
+
+# A query term also matches indexed terms it is a prefix of
+# ("develop" -> "developers"), capped so short prefixes stay cheap
+MAX_PREFIX_EXPANSIONS = 32
+
+# Score multiplier for prefix expansions, so exact term matches rank first
+PREFIX_MATCH_WEIGHT = 0.7
+
+# Per-field term frequencies and field lengths are stored as uint16
+MAX_COUNT = 0xFFFF
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into alphanumeric tokens"""
+    return TOKEN_RE.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    Token inverted index with per-field term frequencies.
+
+    Documents are a key plus a tuple of field strings. Once finalized, the
+    index is stored column-wise: a sorted vocabulary, and for term i the
+    postings live in post_docs[term_offsets[i]:term_offsets[i + 1]] with
+    one frequency per field in post_freqs. A query only touches the
+    postings of its own terms, and the columns can be persisted as-is.
+    """
+
+    def __init__(self, fields: Sequence[str], weights: Optional[Sequence[float]] = None,
+                 k1: float = 1.2, b: float = 0.75, phrase_bonus: float = 2.0):
+        self.fields = tuple(fields)
+        self.weights = tuple(weights) if weights else (1.0,) * len(self.fields)
+        self.k1 = k1
+        self.b = b
+        self.phrase_bonus = phrase_bonus
+
+        self.keys: List[str] = []
+        self.texts: List[str] = []  # lowercased concatenated fields, for phrase checks
+        self.vocabulary: List[str] = []
+        self.term_offsets: Sequence[int] = array("I", [0])
+        self.post_docs: Sequence[int] = array("I")
+        self.post_freqs: Sequence[int] = array("H")
+        self.field_lengths: Sequence[int] = array("H")
+        self.avg_field_lengths: Tuple[float, ...] = (1.0,) * len(self.fields)
+        self._pending: Dict[str, List[Tuple[int, List[int]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, Sequence[str]]], **kwargs) -> "InvertedIndex":
+        """Build an index from (key, fields) pairs"""
+        fields = kwargs.pop("fields", ("title", "description"))
+        index = cls(fields, **kwargs)
+        for key, values in documents:
+            index.add(key, values)
+        index.finalize()
+        return index
+
+    @classmethod
+    def from_columns(cls, keys: List[str], texts: List[str], vocabulary: Sequence[str],
+                     term_offsets: Sequence[int], post_docs: Sequence[int],
+                     post_freqs: Sequence[int], field_lengths: Sequence[int],
+                     **kwargs) -> "InvertedIndex":
+        """Rebuild a finalized index from previously persisted columns"""
+        fields = kwargs.pop("fields", ("title", "description"))
+        index = cls(fields, **kwargs)
+        index.keys = keys
+        index.texts = texts
+        index.vocabulary = vocabulary
+        index.term_offsets = term_offsets
+        index.post_docs = post_docs
+        index.post_freqs = post_freqs
+        index.field_lengths = field_lengths
+        index._compute_averages()
+        return index
+
+    def add(self, key: str, values: Sequence[str], text: Optional[str] = None):
+        """
+        Add a document; call finalize() once all documents are added
+
+        Args:
+            key: Document key returned by search()
+            values: One string per field
+            text: Lowercased text checked for exact phrase matches
+                  (defaults to all fields joined)
+        """
+        doc_id = len(self.keys)
+        self.keys.append(key)
+        self.texts.append(text if text is not None else " ".join(values).lower())
+
+        field_count = len(self.fields)
+        term_freqs: Dict[str, List[int]] = {}
+        for field_idx, value in enumerate(values):
+            tokens = tokenize(value)
+            self.field_lengths.append(min(len(tokens), MAX_COUNT))
+            for token in tokens:
+                freqs = term_freqs.get(token)
+                if freqs is None:
+                    freqs = term_freqs[token] = [0] * field_count
+                freqs[field_idx] += 1
+
+        for term, freqs in term_freqs.items():
+            self._pending.setdefault(term, []).append((doc_id, freqs))
+
+    def finalize(self):
+        """Freeze pending postings into the columnar layout"""
+        self.vocabulary = sorted(self._pending)
+        term_offsets = array("I", [0])
+        post_docs = array("I")
+        post_freqs = array("H")
+        for term in self.vocabulary:
+            for doc_id, freqs in self._pending[term]:
+                post_docs.append(doc_id)
+                post_freqs.extend(min(f, MAX_COUNT) for f in freqs)
+            term_offsets.append(len(post_docs))
+        self.term_offsets = term_offsets
+        self.post_docs = post_docs
+        self.post_freqs = post_freqs
+        self._pending = {}
+        self._compute_averages()
+
+    def _compute_averages(self):
+        field_count = len(self.fields)
+        n_docs = len(self.keys) or 1
+        self.avg_field_lengths = tuple(
+            (sum(self.field_lengths[i::field_count]) / n_docs) or 1.0
+            for i in range(field_count)
+        )
+
+    def expand_term(self, term: str) -> range:
+        """Return vocabulary positions of terms equal to or starting with `term`"""
+        start = bisect_left(self.vocabulary, term)
+        end = start
+        limit = min(start + MAX_PREFIX_EXPANSIONS, len(self.vocabulary))
+        while end < limit and self.vocabulary[end].startswith(term):
+            end += 1
+        return range(start, end)
+
+    def score(self, query: str) -> Dict[int, float]:
+        """Score every document that matches at least one query term"""
+        terms = [t for t in dict.fromkeys(tokenize(query)) if len(t) >= MIN_TERM_LENGTH]
+        scores: Dict[int, float] = {}
+        if not terms:
+            return scores
+
+        k1, b = self.k1, self.b
+        weights = self.weights
+        avg_lengths = self.avg_field_lengths
+        field_count = len(self.fields)
+        field_range = range(field_count)
+        n_docs = len(self.keys)
+        term_offsets = self.term_offsets
+        post_docs, post_freqs = self.post_docs, self.post_freqs
+        field_lengths = self.field_lengths
+
+        for term in terms:
+            # A document scores once per query term, through its best expansion
+            best: Dict[int, float] = {}
+            for term_id in self.expand_term(term):
+                start, end = term_offsets[term_id], term_offsets[term_id + 1]
+                df = end - start
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                if len(self.vocabulary[term_id]) != len(term):
+                    idf *= PREFIX_MATCH_WEIGHT
+                for p in range(start, end):
+                    doc_id = post_docs[p]
+                    freq_base = p * field_count
+                    length_base = doc_id * field_count
+                    tf = 0.0
+                    for i in field_range:
+                        freq = post_freqs[freq_base + i]
+                        if freq:
+                            norm = 1 - b + b * field_lengths[length_base + i] / avg_lengths[i]
+                            tf += weights[i] * freq / norm
+                    term_score = idf * tf / (k1 + tf)
+                    if term_score > best.get(doc_id, 0.0):
+                        best[doc_id] = term_score
+            for doc_id, term_score in best.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + term_score
+
+        # Exact phrase bonus, only checked on candidate documents
+        phrase = " ".join(tokenize(query))
+        if len(terms) > 1 and self.phrase_bonus:
+            for doc_id in scores:
+                if phrase in self.texts[doc_id]:
+                    scores[doc_id] += self.phrase_bonus
+
+        return scores
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return (key, score) pairs ranked by BM25F, best first"""
+        scores = self.score(query)
+        if k is None:
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        else:
+            ranked = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.keys[doc_id], round(score, 4)) for doc_id, score in ranked]
@@ -3,13 +3,18 @@ KalmSkills Backend - SEC EDGAR Integration Service
 Fetches and analyzes company filings from SEC EDGAR
 """
 
+import httpx
 import requests
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import re
 import logging
 
+from .company_directory import CompanyDirectory
+from .http_client import AsyncHTTPClient
+from .ttl_cache import TTLCache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -44,48 +49,60 @@ class SECService:
             'User-Agent': f'KalmSkills/1.0 ({self.CONTACT_EMAIL})',
             'Accept': 'application/json'
         })
+        # Ticker/name lookups are served from a local copy of SEC's listing
+        self.directory = CompanyDirectory(self.session)
+        # Non-blocking client for the async methods; SEC allows ~10 requests/s
+        self.http = AsyncHTTPClient(headers=dict(self.session.headers), per_host_limit=8)
+        # Submissions change at most a few times a day per company
+        self.submissions_cache = TTLCache(max_entries=512, ttl=15 * 60, stale_ttl=6 * 60 * 60,
+                                          name="sec-submissions")
     
     def get_company_by_ticker(self, ticker: str) -> Optional[CompanyInfo]:
         """Get company information by stock ticker"""
-        try:
-            # Updated SEC API endpoint
-            url = f"{self.BASE_URL}/files/company_tickers_exchange.json"
-            response = self.session.get(url)
-            
-            # If that fails, try the older endpoint
-            if response.status_code == 404:
-                url = "https://www.sec.gov/files/company_tickers.json"
-                response = self.session.get(url)
-            
-            response.raise_for_status()
-            
-            companies = response.json()
-            for company_data in companies.values():
-                if company_data.get('ticker', '').upper() == ticker.upper():
-                    return self._parse_company_info(company_data)
-            
-            return None
-        except requests.RequestException as e:
-            logger.error(f"Error fetching company for ticker {ticker}: {e}")
-            return None
+        company_data = self.directory.index.get_by_ticker(ticker)
+        return self._parse_company_info(company_data) if company_data else None
     
     def get_company_submissions(self, cik: str) -> Dict:
         """Get all submissions/filings for a company"""
+        # Pad CIK to 10 digits
+        cik_padded = cik.zfill(10)
         try:
-            # Pad CIK to 10 digits
-            cik_padded = cik.zfill(10)
-            url = f"{self.BASE_URL}/submissions/CIK{cik_padded}.json"
-            
-            response = self.session.get(url)
-            response.raise_for_status()
-            return response.json()
+            return self.submissions_cache.get(cik_padded, lambda: self._fetch_submissions(cik_padded))
         except requests.RequestException as e:
             logger.error(f"Error fetching submissions for CIK {cik}: {e}")
             return {}
     
+    def _fetch_submissions(self, cik_padded: str) -> Dict:
+        url = f"{self.BASE_URL}/submissions/CIK{cik_padded}.json"
+        response = self.session.get(url)
+        response.raise_for_status()
+        return response.json()
+    
+    async def get_company_submissions_async(self, cik: str) -> Dict:
+        """Non-blocking get_company_submissions, sharing its cache"""
+        cik_padded = cik.zfill(10)
+        try:
+            return await self.submissions_cache.get_async(
+                cik_padded, lambda: self._fetch_submissions_async(cik_padded)
+            )
+        except (httpx.HTTPError, requests.RequestException) as e:
+            logger.error(f"Error fetching submissions for CIK {cik}: {e}")
+            return {}
+    
+    async def _fetch_submissions_async(self, cik_padded: str) -> Dict:
+        url = f"{self.BASE_URL}/submissions/CIK{cik_padded}.json"
+        response = await self.http.get(url)
+        response.raise_for_status()
+        return response.json()
+    
     def get_latest_10k(self, cik: str) -> Optional[str]:
         """Get the latest 10-K filing URL for a company"""
-        submissions = self.get_company_submissions(cik)
+        return self._latest_10k_url(cik, self.get_company_submissions(cik))
+    
+    async def get_latest_10k_async(self, cik: str) -> Optional[str]:
+        return self._latest_10k_url(cik, await self.get_company_submissions_async(cik))
+    
+    def _latest_10k_url(self, cik: str, submissions: Dict) -> Optional[str]:
         filings = submissions.get('filings', {}).get('recent', {})
         
         forms = filings.get('form', [])
@@ -103,33 +120,45 @@ class SECService:
     def analyze_company_health(self, cik: str) -> Optional[CompanyHealth]:
         """Analyze company health based on SEC filings"""
         try:
-            submissions = self.get_company_submissions(cik)
-            
-            company_info = CompanyInfo(
-                cik=cik,
-                name=submissions.get('name', ''),
-                ticker=submissions.get('tickers', [''])[0] if submissions.get('tickers') else None,
-                sic=submissions.get('sic', ''),
-                industry=submissions.get('sicDescription', ''),
-                employee_count=self._extract_employee_count(submissions)
-            )
-            
-            # Analyze filings for signals
-            health_metrics = self._analyze_filings(submissions)
-            
-            return CompanyHealth(
-                company=company_info,
-                health_score=health_metrics['health_score'],
-                layoff_risk=health_metrics['layoff_risk'],
-                hiring_trend=health_metrics['hiring_trend'],
-                funding_status=health_metrics['funding_status'],
-                sentiment=health_metrics['sentiment'],
-                signal=health_metrics['signal']
-            )
+            return self._build_health(cik, self.get_company_submissions(cik))
+        except Exception as e:
+            logger.error(f"Error analyzing company health for CIK {cik}: {e}")
+            return None
+    
+    async def analyze_company_health_async(self, cik: str) -> Optional[CompanyHealth]:
+        """Non-blocking analyze_company_health, for the async API handlers"""
+        try:
+            return self._build_health(cik, await self.get_company_submissions_async(cik))
         except Exception as e:
             logger.error(f"Error analyzing company health for CIK {cik}: {e}")
             return None
     
+    def _build_health(self, cik: str, submissions: Dict) -> CompanyHealth:
+        company_info = CompanyInfo(
+            cik=cik,
+            name=submissions.get('name', ''),
+            ticker=submissions.get('tickers', [''])[0] if submissions.get('tickers') else None,
+            sic=submissions.get('sic', ''),
+            industry=submissions.get('sicDescription', ''),
+            employee_count=self._extract_employee_count(submissions)
+        )
+        
+        # Analyze filings for signals
+        health_metrics = self._analyze_filings(submissions)
+        
+        return CompanyHealth(
+            company=company_info,
+            health_score=health_metrics['health_score'],
+            layoff_risk=health_metrics['layoff_risk'],
+            hiring_trend=health_metrics['hiring_trend'],
+            funding_status=health_metrics['funding_status'],
+            sentiment=health_metrics['sentiment'],
+            signal=health_metrics['signal']
+        )
+    
+    async def aclose(self):
+        await self.http.aclose()
+    
     def _parse_company_info(self, data: Dict) -> CompanyInfo:
         """Parse company info from SEC data"""
         return CompanyInfo(
@@ -188,33 +217,14 @@ class SECService:
         }
     
     def search_companies(self, query: str, limit: int = 10) -> List[CompanyInfo]:
-        """Search for companies by name"""
-        try:
-            # Updated SEC API endpoint
-            url = f"{self.BASE_URL}/files/company_tickers_exchange.json"
-            response = self.session.get(url)
-            
-            # If that fails, try the older endpoint
-            if response.status_code == 404:
-                url = "https://www.sec.gov/files/company_tickers.json"
-                response = self.session.get(url)
-            
-            response.raise_for_status()
-            
-            companies = response.json()
-            results = []
-            
-            query_lower = query.lower()
-            for company_data in companies.values():
-                if query_lower in company_data.get('title', '').lower():
-                    results.append(self._parse_company_info(company_data))
-                    if len(results) >= limit:
-                        break
-            
-            return results
-        except requests.RequestException as e:
-            logger.error(f"Error searching companies: {e}")
-            return []
+        """Search for companies by name or ticker, best match first"""
+        return list(self.iter_companies(query, limit))
+
+    def iter_companies(self, query: str, limit: Optional[int] = 10) -> Iterator[CompanyInfo]:
+        """Like search_companies, one company at a time; limit None returns every match"""
+        index = self.directory.index
+        for company in index.search(query, len(index) if limit is None else limit):
+            yield self._parse_company_info(company)
 
 
 # Example usage
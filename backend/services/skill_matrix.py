@@ -0,0 +1,275 @@
+"""
+KalmSkills Backend - Vectorized skill matching
+Dense occupation x content-model element matrices scored with NumPy
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Share of a match score from the resume's technologies (see
+# TechnologyIndex.overlap) when it also names content-model elements
+TECHNOLOGY_WEIGHT = 0.25
+# Highest score a resume naming only technologies can reach: shared tools
+# say nothing about the rest of an occupation's requirements
+TECHNOLOGY_ONLY_WEIGHT = 0.6
+
+
+@dataclass
+class SkillGap:
+    id: str
+    name: str
+    importance: float
+    level: float
+    category: str = "Skill"  # content model domain: Skill, Knowledge, Ability, ...
+
+
+@dataclass
+class SkillMatch:
+    occupation_code: str
+    match_score: int  # 0-100, see SkillMatrix.score
+    matched_skills: List[str]
+    missing_skills: List[SkillGap]
+    matched_technologies: List[str] = field(default_factory=list)  # resume technologies the occupation uses
+
+
+class SkillMatrix:
+    """
+    Occupation x content-model element importance and level matrices.
+
+    Row i is occupation `codes[i]`, column j is element `element_ids[j]`
+    of domain `domains[element_domains[j]]` (Skill, Knowledge, ...); a zero
+    importance means the element is not required. A resume becomes a 0/1
+    vector over the same columns, so every occupation is scored with one
+    matrix-vector product, and a batch of resumes with one matrix-matrix
+    product.
+
+    Importance scales differ between domains, so `weights` holds each
+    importance as a share of the occupation's total for that domain: the
+    product is then the sum of per-domain coverages, and dividing by the
+    number of domains the resume names gives their mean. A resume listing
+    only skills is scored on skills alone.
+
+    Coverage alone favours occupations with few rated requirements (two
+    generic skills cover much of a short profile), so it is balanced by
+    recall from the resume's side: how much of the resume, each element
+    weighted by its IDF over occupations, the occupation needs, scaled by
+    `relevance` (importance relative to the element's highest rating).
+    """
+
+    def __init__(self, codes: Sequence[str], element_ids: Sequence[str], element_names: Sequence[str],
+                 importance: np.ndarray, level: np.ndarray, element_domains: Optional[Sequence[int]] = None,
+                 domains: Sequence[str] = ("Skill",), weights: Optional[np.ndarray] = None):
+        self.codes = list(codes)
+        self.code_index = {code: i for i, code in enumerate(self.codes)}
+        self.element_ids = list(element_ids)
+        self.element_names = list(element_names)
+        # Names shared by two domains ("Mathematics") resolve to the first
+        self.name_index: Dict[str, int] = {}
+        for j, name in enumerate(self.element_names):
+            self.name_index.setdefault(name.lower(), j)
+        self.importance = importance
+        self.level = level
+        self.domains = list(domains)
+        self.element_domains = (np.zeros(len(self.element_ids), dtype=np.uint8) if element_domains is None
+                                else np.asarray(element_domains, dtype=np.uint8))
+        # (n_elements, n_domains) one-hot membership
+        self.domain_members = (self.element_domains[:, None] == np.arange(len(self.domains))).astype(np.float32)
+        self.weights = weights if weights is not None else self.domain_weights(importance, self.domain_members)
+        # Rare requirements ("Programming") say more about a resume than
+        # near-universal ones ("Critical Thinking")
+        required_by = np.count_nonzero(importance, axis=0)
+        self.idf = (np.log((1 + len(self.codes)) / (1 + required_by)) + 1.0).astype(np.float32)
+        highest = importance.max(axis=0) if len(self.codes) else np.zeros(len(self.element_ids), dtype=np.float32)
+        self.relevance = np.divide(importance, highest, out=np.zeros_like(importance), where=highest > 0)
+        self._required_cols: Dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @staticmethod
+    def domain_weights(importance: np.ndarray, domain_members: np.ndarray) -> np.ndarray:
+        """Importance as a share of each occupation's total for the element's domain"""
+        totals = importance @ domain_members  # (n_occupations, n_domains)
+        per_element = totals @ domain_members.T  # each element's domain total
+        return np.divide(importance, per_element, out=np.zeros_like(importance), where=per_element > 0)
+
+    @classmethod
+    def from_skills(cls, tables: Sequence[Mapping[str, Sequence]]) -> "SkillMatrix":
+        """
+        Build from code -> List[Skill] mappings, one per content model domain
+
+        Element columns follow the tables' order, so a name found in two
+        domains matches the earlier one.
+        """
+        codes = list(dict.fromkeys(code for table in tables for code in table if table[code]))
+        domains: Dict[str, int] = {}
+        elements: Dict[str, Tuple[int, str, int]] = {}
+        for table in tables:
+            for code in table:
+                for skill in table[code]:
+                    if skill.id not in elements:
+                        domain = domains.setdefault(skill.category, len(domains))
+                        elements[skill.id] = (len(elements), skill.name, domain)
+
+        importance = np.zeros((len(codes), len(elements)), dtype=np.float32)
+        level = np.zeros_like(importance)
+        for i, code in enumerate(codes):
+            for table in tables:
+                for skill in table.get(code, []):
+                    j = elements[skill.id][0]
+                    importance[i, j] = skill.importance or 0.0
+                    level[i, j] = skill.level or 0.0
+
+        return cls(codes, list(elements), [name for _, name, _ in elements.values()], importance, level,
+                   [domain for _, _, domain in elements.values()], list(domains) or ["Skill"])
+
+    def vectorize(self, skills: Iterable[str]) -> np.ndarray:
+        """Resume skill names -> 0/1 vector over skill elements"""
+        vector = np.zeros(len(self.element_ids), dtype=np.float32)
+        for skill in skills:
+            j = self.name_index.get(skill.strip().lower())
+            if j is not None:
+                vector[j] = 1.0
+        return vector
+
+    def vectorize_batch(self, resumes: Sequence[Iterable[str]]) -> np.ndarray:
+        """Many resumes -> (n_resumes, n_elements) matrix"""
+        vectors = np.zeros((len(resumes), len(self.element_ids)), dtype=np.float32)
+        for r, skills in enumerate(resumes):
+            for skill in skills:
+                j = self.name_index.get(skill.strip().lower())
+                if j is not None:
+                    vectors[r, j] = 1.0
+        return vectors
+
+    def vectorize_columns(self, resumes: Sequence[Iterable[int]]) -> np.ndarray:
+        """Many resumes as element columns (e.g. from a SkillNormalizer) -> (n_resumes, n_elements) matrix"""
+        vectors = np.zeros((len(resumes), len(self.element_ids)), dtype=np.float32)
+        for r, columns in enumerate(resumes):
+            vectors[r, list(columns)] = 1.0
+        return vectors
+
+    def active_domains(self, vectors: np.ndarray) -> np.ndarray:
+        """Which domains each resume names at least one element of"""
+        return (vectors @ self.domain_members) > 0
+
+    def coverage(self, vectors: np.ndarray, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Mean coverage of each occupation's required elements over the domains the resume names"""
+        weights = self.weights if rows is None else self.weights[rows]
+        named = np.maximum(self.active_domains(vectors).sum(axis=-1, keepdims=True), 1)
+        return (vectors @ weights.T) / named
+
+    def recall(self, vectors: np.ndarray, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """IDF-weighted share of the resume's elements each occupation needs, by relative importance"""
+        relevance = self.relevance if rows is None else self.relevance[rows]
+        weighted = vectors * self.idf
+        total = weighted.sum(axis=-1, keepdims=True)
+        return (weighted @ relevance.T) / np.maximum(total, 1e-12)
+
+    def score(self, vectors: np.ndarray, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Geometric mean of coverage() and recall(), in [0, 1]
+
+        Args:
+            vectors: (n_elements,) for one resume or (n_resumes, n_elements)
+            rows: Only score these occupations
+        Returns:
+            (n_occupations,) or (n_resumes, n_occupations)
+        """
+        return np.sqrt(self.coverage(vectors, rows) * self.recall(vectors, rows))
+
+    def blend(self, scores: np.ndarray, vectors: np.ndarray, technologies: Optional[np.ndarray],
+              rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Mix technology overlap into scores of every occupation (or `rows`)
+
+        A resume naming both elements and technologies gets
+        TECHNOLOGY_WEIGHT of its score from the technologies; one naming
+        only technologies is scored on them alone, scaled to at most
+        TECHNOLOGY_ONLY_WEIGHT, and one naming none keeps its element score.
+        """
+        if technologies is None:
+            return scores
+        named = technologies.any(axis=1)
+        weight = np.where(named, np.where(vectors.any(axis=1), TECHNOLOGY_WEIGHT, TECHNOLOGY_ONLY_WEIGHT),
+                          0.0)[:, None]
+        return (1.0 - weight) * scores + weight * (technologies if rows is None else technologies[:, rows])
+
+    def top_n(self, scores: np.ndarray, n: int) -> np.ndarray:
+        """Row indices of the n best scores, best first"""
+        n = min(n, len(scores))
+        if n <= 0:
+            return np.empty(0, dtype=np.intp)
+        top = np.argpartition(-scores, n - 1)[:n]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def explain(self, row: int, vector: np.ndarray, score: float,
+                active: Optional[np.ndarray] = None) -> SkillMatch:
+        """
+        Matched elements and gaps for one occupation
+
+        Gaps are listed by domain, then by importance, and only for the
+        domains the resume names (`active`, see active_domains()).
+        """
+        cols = self._required_cols.get(row)
+        if cols is None:
+            required = self.importance[row]
+            cols = np.nonzero(required)[0]
+            cols = self._required_cols[row] = cols[np.lexsort((-required[cols], self.element_domains[cols]))]
+        if active is None:
+            active = self.active_domains(vector)
+        # Matched elements are always in an active domain
+        cols = cols[active[self.element_domains[cols]]]
+        has = (vector[cols] > 0).tolist()
+        importance = np.round(self.importance[row, cols].astype(np.float64), 2).tolist()
+        level = np.round(self.level[row, cols].astype(np.float64), 2).tolist()
+        names, ids, domains = self.element_names, self.element_ids, self.domains
+        element_domains = self.element_domains[cols].tolist()
+        matched, missing = [], []
+        for k, j in enumerate(cols.tolist()):
+            if has[k]:
+                matched.append(names[j])
+            else:
+                missing.append(SkillGap(ids[j], names[j], importance[k], level[k], domains[element_domains[k]]))
+        return SkillMatch(
+            occupation_code=self.codes[row],
+            match_score=int(round(float(score) * 100)),
+            matched_skills=matched,
+            missing_skills=missing
+        )
+
+    def match(self, skills: Iterable[str], n: int = 10,
+              occupation_code: Optional[str] = None) -> List[SkillMatch]:
+        """Rank occupations for one resume (or score just `occupation_code`)"""
+        return self.match_batch([list(skills)], n, occupation_code)[0]
+
+    def match_batch(self, resumes: Sequence[Iterable[str]], n: int = 10, occupation_code: Optional[str] = None,
+                    vectors: Optional[np.ndarray] = None,
+                    technologies: Optional[np.ndarray] = None) -> List[List[SkillMatch]]:
+        """
+        Rank occupations for many resumes with a single matrix product
+
+        `vectors` replaces the exact name lookup of vectorize_batch() when
+        the resumes' skills were resolved elsewhere (vectorize_columns()).
+        `technologies` is each resume's technology overlap with every
+        occupation, (n_resumes, n_occupations), mixed in by blend().
+        Occupations scoring zero are never listed.
+        """
+        if vectors is None:
+            vectors = self.vectorize_batch(resumes)
+        active = self.active_domains(vectors)
+        if occupation_code is not None:
+            row = self.code_index.get(occupation_code)
+            if row is None:
+                return [[] for _ in resumes]
+            scores = self.blend(self.score(vectors, [row]), vectors, technologies, [row])[:, 0]
+            return [[self.explain(row, vectors[r], scores[r], active[r])] for r in range(len(resumes))]
+
+        scores = self.blend(self.score(vectors), vectors, technologies)
+        results = []
+        for r in range(len(resumes)):
+            ranked = self.top_n(scores[r], min(n, int(np.count_nonzero(scores[r]))))
+            results.append([self.explain(row, vectors[r], scores[r, row], active[r]) for row in ranked])
+        return results
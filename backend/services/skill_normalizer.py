@@ -0,0 +1,488 @@
+"""
+KalmSkills Backend - Skill name normalization
+Maps raw resume skills ("Python programming", "comms", "MS Excel") to O*NET
+content model elements and technologies
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .search_index import tokenize
+from .task_index import stem
+from .title_index import title_trigrams
+
+# Resume phrasing -> O*NET element or technology names (any domain; a name
+# found in several domains maps to its first column, as in SkillMatrix.name_index)
+SKILL_ALIASES = {
+    "communication": ("Speaking", "Writing"),
+    "communications": ("Speaking", "Writing"),
+    "comms": ("Speaking", "Writing"),
+    "verbal communication": ("Speaking",),
+    "oral communication": ("Speaking",),
+    "public speaking": ("Speaking",),
+    "presentations": ("Speaking",),
+    "presenting": ("Speaking",),
+    "written communication": ("Writing",),
+    "copywriting": ("Writing",),
+    "proofreading": ("Writing", "English Language"),
+    "technical writing": ("Writing",),
+    "english": ("English Language",),
+    "listening": ("Active Listening",),
+    "problem solving": ("Complex Problem Solving",),
+    "troubleshoot": ("Troubleshooting",),
+    "debugging": ("Troubleshooting",),
+    "decision making": ("Judgment and Decision Making",),
+    "analytical skills": ("Analytical Thinking", "Critical Thinking"),
+    "analysis": ("Analytical Thinking", "Critical Thinking"),
+    "teamwork": ("Coordination", "Cooperation"),
+    "collaboration": ("Coordination", "Cooperation"),
+    "team player": ("Cooperation",),
+    "people management": ("Management of Personnel Resources",),
+    "team management": ("Management of Personnel Resources",),
+    "staff management": ("Management of Personnel Resources",),
+    "team leadership": ("Management of Personnel Resources", "Leadership"),
+    "supervision": ("Management of Personnel Resources",),
+    "budgeting": ("Management of Financial Resources",),
+    "budget management": ("Management of Financial Resources",),
+    "financial management": ("Management of Financial Resources",),
+    "inventory management": ("Management of Material Resources",),
+    "project management": ("Coordination", "Time Management"),
+    "organization": ("Time Management",),
+    "coding": ("Programming",),
+    "software development": ("Programming",),
+    "software engineering": ("Programming",),
+    "testing": ("Quality Control Analysis",),
+    "qa": ("Quality Control Analysis",),
+    "quality assurance": ("Quality Control Analysis",),
+    "quality control": ("Quality Control Analysis",),
+    "customer service": ("Service Orientation", "Customer and Personal Service"),
+    "customer support": ("Service Orientation", "Customer and Personal Service"),
+    "client relations": ("Service Orientation", "Customer and Personal Service"),
+    "sales": ("Persuasion", "Sales and Marketing"),
+    "selling": ("Persuasion", "Sales and Marketing"),
+    "marketing": ("Sales and Marketing",),
+    "negotiating": ("Negotiation",),
+    "teaching": ("Instructing", "Education and Training"),
+    "training": ("Instructing", "Education and Training"),
+    "mentoring": ("Instructing",),
+    "coaching": ("Instructing",),
+    "math": ("Mathematics",),
+    "maths": ("Mathematics",),
+    "statistics": ("Mathematics",),
+    "accounting": ("Economics and Accounting",),
+    "bookkeeping": ("Economics and Accounting",),
+    "finance": ("Economics and Accounting",),
+    "hr": ("Personnel and Human Resources",),
+    "human resources": ("Personnel and Human Resources",),
+    "recruiting": ("Personnel and Human Resources",),
+    "management": ("Administration and Management",),
+    "clerical": ("Administrative",),
+    "data entry": ("Administrative",),
+    "office administration": ("Administrative",),
+    "computers": ("Computers and Electronics",),
+    "computer skills": ("Computers and Electronics",),
+    "it": ("Computers and Electronics",),
+    "electronics": ("Computers and Electronics",),
+    "engineering": ("Engineering and Technology",),
+    "legal": ("Law and Government",),
+    "law": ("Law and Government",),
+    "healthcare": ("Medicine and Dentistry",),
+    "clinical": ("Medicine and Dentistry",),
+    "nursing": ("Medicine and Dentistry", "Psychology", "Concern for Others"),
+    "patient care": ("Medicine and Dentistry", "Customer and Personal Service", "Service Orientation"),
+    "patient assessment": ("Medicine and Dentistry", "Monitoring"),
+    "patient education": ("Medicine and Dentistry", "Instructing"),
+    "vital signs": ("Medicine and Dentistry", "Monitoring"),
+    "medication administration": ("Medicine and Dentistry",),
+    "wound care": ("Medicine and Dentistry",),
+    "triage": ("Medicine and Dentistry", "Judgment and Decision Making"),
+    "infection control": ("Medicine and Dentistry", "Biology"),
+    "phlebotomy": ("Medicine and Dentistry",),
+    "first aid": ("Medicine and Dentistry",),
+    "cpr": ("Medicine and Dentistry",),
+    "bls": ("Medicine and Dentistry",),
+    "acls": ("Medicine and Dentistry",),
+    "bedside manner": ("Social Perceptiveness", "Service Orientation"),
+    "caregiving": ("Service Orientation", "Concern for Others"),
+    "counseling": ("Therapy and Counseling",),
+    "cooking": ("Food Production",),
+    "food preparation": ("Food Production",),
+    "food safety": ("Food Production",),
+    "food handling": ("Food Production",),
+    "construction": ("Building and Construction",),
+    "bilingual": ("Foreign Language",),
+    "spanish": ("Foreign Language",),
+    "french": ("Foreign Language",),
+    "translation": ("Foreign Language",),
+    "safety": ("Public Safety and Security",),
+    "security": ("Public Safety and Security",),
+    "public safety": ("Public Safety and Security",),
+    "workplace safety": ("Public Safety and Security",),
+    "occupational safety": ("Public Safety and Security",),
+    "information security": ("Computers and Electronics", "Public Safety and Security"),
+    "network security": ("Computers and Electronics", "Public Safety and Security"),
+    "cybersecurity": ("Computers and Electronics", "Public Safety and Security"),
+    "cyber security": ("Computers and Electronics", "Public Safety and Security"),
+    "research": ("Science",),
+    "maintenance": ("Equipment Maintenance",),
+    "repair": ("Repairing",),
+    "repairs": ("Repairing",),
+    "installing": ("Installation",),
+    "detail oriented": ("Attention to Detail",),
+    "adaptability": ("Adaptability/Flexibility",),
+    "flexibility": ("Adaptability/Flexibility",),
+    "reliability": ("Dependability",),
+    "creativity": ("Innovation",),
+    "self motivated": ("Initiative",),
+    "empathy": ("Concern for Others", "Social Perceptiveness"),
+    "ms office": ("Microsoft Office software",),
+    "microsoft office": ("Microsoft Office software",),
+    "js": ("JavaScript",),
+    "golang": ("Go",),
+    "postgres": ("PostgreSQL",),
+    "k8s": ("Kubernetes",),
+    ".net": ("Microsoft .NET Framework",),
+    "epic": ("Epic Systems",),
+}
+
+# One-word aliases whose meaning depends on the words around them: inside a
+# longer skill they only count if every other word is recognised too
+# ("food safety" is not Public Safety and Security, "market research" not Science)
+GENERIC_ALIASES = frozenset({"safety", "security", "research"})
+
+# Token shorthand expanded before lookup ("MS Excel" -> "microsoft excel")
+TOKEN_ALIASES = {"ms": "microsoft", "mgmt": "management", "dev": "development"}
+
+# Words that qualify a skill without changing it ("strong Python skills")
+FILLER_WORDS = frozenset("""
+a an and of the in for with to on skill skills strong excellent good great solid advanced basic
+proficient proficiency experience experienced expert expertise familiar familiarity knowledge
+working ability abilities hands using
+""".split())
+
+# A technology name's first word is treated as a vendor ("Microsoft Excel"
+# -> "excel") when at least this many technology names start with it
+MIN_VENDOR_PRODUCTS = 5
+
+# Fuzzy layer: keys sharing this share of character trigrams (Dice)
+MIN_FUZZY_SIMILARITY = 0.65
+MIN_FUZZY_LENGTH = 4
+
+# Normalized skills remembered per process (resumes repeat "Excel" a lot)
+MEMO_SIZE = 4096
+
+SYMBOL_RE = re.compile(r"[^a-z0-9 ]")
+
+# What a key is: an element or technology name, a SKILL_ALIASES entry (a
+# GENERIC_ALIASES one), or a technology's acronym or name without its
+# vendor (too generic to split phrases on: "data" is DATAS, "learn" is
+# Blackboard Learn)
+KIND_NAME, KIND_ALIAS, KIND_PARTIAL, KIND_GENERIC = 0, 1, 2, 3
+
+
+def normalize_skill(text: str) -> str:
+    """'Strong MS-Excel skills' -> 'microsoft excel' (stemmed, fillers dropped)"""
+    tokens = (TOKEN_ALIASES.get(token, token) for token in tokenize(text))
+    return " ".join(stem(token) for token in tokens if token not in FILLER_WORDS)
+
+
+@dataclass
+class SkillElement:
+    id: str  # O*NET element ID
+    name: str
+    category: str  # content model domain
+
+
+@dataclass
+class SkillTechnology:
+    name: str
+    commodity_code: int  # UNSPSC commodity
+    commodity_title: str
+
+
+@dataclass
+class NormalizedSkill:
+    text: str  # as given
+    method: str  # "exact", "alias", "phrase", "fuzzy" or "" if nothing matched
+    elements: List[SkillElement] = field(default_factory=list)
+    technologies: List[SkillTechnology] = field(default_factory=list)
+
+
+class SkillNormalizerBuilder:
+    """
+    Collects lookup keys; build() freezes them into a SkillNormalizer.
+
+    Targets are integers: element columns of the SkillMatrix first, then
+    n_elements + technology name ID (the order add_technology() was
+    called in). A key can name several elements but only one technology,
+    the first registered: full names come before acronyms and vendor-less
+    names, so "java" stays Java rather than becoming Oracle Java. A name
+    shared by two domains ("Mathematics" is a Skill and a Knowledge area)
+    names only its first column, as in SkillMatrix.name_index, so it is
+    matched and scored once.
+    """
+
+    def __init__(self, element_names: Sequence[str]):
+        self.n_elements = len(element_names)
+        self._element_names: Dict[str, List[int]] = {}
+        for j, name in enumerate(element_names):
+            self._element_names.setdefault(name.lower(), [j])
+        self._technologies: List[Tuple[str, bool]] = []
+
+    def add_technology(self, name: str, software: bool = True):
+        self._technologies.append((name, software))
+
+    @staticmethod
+    def _keys(name: str) -> List[str]:
+        """The lowercased name if normalizing loses symbols ("c++"), and the normalized name"""
+        lowered = " ".join(name.lower().split())
+        normalized = normalize_skill(name)
+        keys = [lowered] if SYMBOL_RE.search(lowered) else []
+        if normalized and not re.search(r"[+#]", lowered):
+            keys.append(normalized)
+        return keys
+
+    @staticmethod
+    def _acronyms(name: str) -> List[str]:
+        """Spelled-out acronyms: "Structured query language SQL" -> ["SQL"]"""
+        words = name.split()
+        return [word for k, word in enumerate(words)
+                if 2 <= len(word) <= 6 and word.isalpha() and word.isupper() and k >= len(word)
+                and "".join(w[0] for w in words[k - len(word):k]).lower() == word.lower()]
+
+    def build(self, elements: Sequence[SkillElement], name_commodities: Sequence[int] = (),
+              commodity_codes: Sequence[int] = (), commodity_titles: Sequence[str] = ()) -> "SkillNormalizer":
+        """
+        Args:
+            elements: The SkillMatrix columns, in order
+            name_commodities: Per technology, its commodity's position in
+                commodity_codes / commodity_titles (see TechnologyIndex)
+        """
+        targets_of: Dict[str, Dict[int, None]] = {}
+        technology_of: Dict[str, int] = {}
+        kinds: Dict[str, int] = {}  # KIND_NAME unless set otherwise
+
+        for name, columns in self._element_names.items():
+            for key in self._keys(name):
+                targets_of.setdefault(key, {}).update(dict.fromkeys(columns))
+
+        technology_ids: Dict[str, int] = {}
+        for t, (name, _) in enumerate(self._technologies):
+            technology_ids.setdefault(name.lower(), self.n_elements + t)
+            for key in self._keys(name):
+                technology_of.setdefault(key, self.n_elements + t)
+        for t, (name, _) in enumerate(self._technologies):
+            if name.lower().endswith(" software"):  # "Salesforce software"
+                for key in self._keys(name[:-len(" software")]):
+                    technology_of.setdefault(key, self.n_elements + t)
+        for t, (name, software) in enumerate(self._technologies):
+            for acronym in self._acronyms(name) if software else ():
+                for key in self._keys(acronym):
+                    if key not in technology_of:
+                        technology_of[key] = self.n_elements + t
+                        kinds.setdefault(key, KIND_PARTIAL)
+        # Vendors are first words that start many software names
+        vendors: Dict[str, int] = {}
+        for name, software in self._technologies:
+            words = name.split()
+            if software and len(words) > 1:
+                vendors[words[0]] = vendors.get(words[0], 0) + 1
+        for t, (name, software) in enumerate(self._technologies):
+            words = name.split()
+            if software and len(words) > 1 and vendors[words[0]] >= MIN_VENDOR_PRODUCTS:
+                for key in self._keys(" ".join(words[1:])):
+                    if len(key) >= 3 and key not in technology_of:
+                        technology_of[key] = self.n_elements + t
+                        kinds.setdefault(key, KIND_PARTIAL)
+
+        element_keys = set(targets_of)
+        for alias, names in SKILL_ALIASES.items():
+            for key in self._keys(alias):
+                if key in element_keys:
+                    continue  # an element's own name wins over an alias
+                kinds[key] = KIND_GENERIC if alias in GENERIC_ALIASES else KIND_ALIAS
+                for name in names:
+                    targets_of.setdefault(key, {}).update(dict.fromkeys(self._element_names.get(name.lower(), [])))
+                    if name.lower() in technology_ids:
+                        technology_of[key] = technology_ids[name.lower()]
+
+        keys = sorted(set(targets_of) | set(technology_of))
+        offsets, targets, key_kinds = array("I", [0]), array("I"), array("B")
+        for key in keys:
+            targets.extend(targets_of.get(key, {}))
+            if key in technology_of:
+                targets.append(technology_of[key])
+            offsets.append(len(targets))
+            key_kinds.append(kinds.get(key, KIND_NAME))
+
+        grams: Dict[str, List[int]] = {}
+        gram_counts = array("H")
+        for i, key in enumerate(keys):
+            key_grams = title_trigrams(key)
+            gram_counts.append(min(len(key_grams), 0xFFFF))
+            for gram in key_grams:
+                grams.setdefault(gram, []).append(i)
+        gram_keys = sorted(grams)
+        gram_offsets, gram_entries = array("I", [0]), array("I")
+        for gram in gram_keys:
+            gram_entries.extend(grams[gram])
+            gram_offsets.append(len(gram_entries))
+
+        return SkillNormalizer(keys, offsets, targets, key_kinds, gram_keys, gram_offsets, gram_entries,
+                               gram_counts, elements, [name for name, _ in self._technologies],
+                               name_commodities, commodity_codes, commodity_titles)
+
+
+class SkillNormalizer:
+    """
+    Normalized skill key -> O*NET elements and technologies, in three
+    layers tried in order:
+
+    - exact: the lowercased skill, then its normalized form (stemmed
+      tokens, shorthand expanded, fillers like "strong" dropped), found
+      among element names, technology names (also by spelled-out
+      acronym and without the vendor) and SKILL_ALIASES
+    - phrase: the longest keys covering the skill's tokens ("python
+      programm" -> Python + Programming), other than KIND_PARTIAL ones;
+      KIND_GENERIC keys only count when every token is covered
+    - fuzzy: the key sharing most character trigrams (typos)
+
+    Key i's targets are targets[offsets[i]:offsets[i + 1]]: element
+    columns below n_elements, technology name IDs (into `names`) above;
+    kinds[i] is one of the KIND_* values. Keys and trigrams
+    are sorted and searched by bisection, so every column can be a view
+    into the O*NET snapshot.
+    """
+
+    def __init__(self, keys: Sequence[str], offsets: Sequence[int], targets: Sequence[int], kinds: Sequence[int],
+                 gram_keys: Sequence[str], gram_offsets: Sequence[int], gram_entries: Sequence[int],
+                 gram_counts: Sequence[int], elements: Sequence[SkillElement], technology_names: Sequence[str],
+                 name_commodities: Sequence[int], commodity_codes: Sequence[int],
+                 commodity_titles: Sequence[str]):
+        self.keys = keys
+        self.offsets = offsets
+        self.targets = targets
+        self.kinds = kinds
+        self.gram_keys = gram_keys
+        self.gram_offsets = np.asarray(gram_offsets, dtype=np.uint32)
+        self.gram_entries = np.asarray(gram_entries, dtype=np.uint32)
+        self.gram_counts = np.asarray(gram_counts, dtype=np.uint16)
+        self.elements = elements
+        self.names = technology_names
+        self.name_commodities = name_commodities
+        self.commodity_codes = commodity_codes
+        self.commodity_titles = commodity_titles
+        self.n_elements = len(elements)
+        self._memo: Dict[str, Tuple[str, Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _find(self, key: str) -> Optional[int]:
+        i = bisect_left(self.keys, key)
+        return i if i < len(self.keys) and self.keys[i] == key else None
+
+    def _targets(self, i: int) -> Tuple[int, ...]:
+        return tuple(self.targets[self.offsets[i]:self.offsets[i + 1]])
+
+    def resolve(self, text: str) -> Tuple[str, Tuple[int, ...]]:
+        """(method, targets) for one raw skill; see the class docstring"""
+        lowered = " ".join(text.lower().split())
+        cached = self._memo.get(lowered)
+        if cached is not None:
+            return cached
+        result = self._resolve(lowered)
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[lowered] = result
+        return result
+
+    def _resolve(self, lowered: str) -> Tuple[str, Tuple[int, ...]]:
+        normalized = normalize_skill(lowered)
+        for key in (lowered, normalized):
+            i = self._find(key) if key else None
+            if i is not None:
+                return ("alias" if self.kinds[i] in (KIND_ALIAS, KIND_GENERIC) else "exact"), self._targets(i)
+        if not normalized:
+            return "", ()
+
+        tokens = normalized.split()
+        if len(tokens) > 1:
+            matched: List[int] = []
+            covered = start = 0
+            while start < len(tokens):
+                for end in range(len(tokens), start, -1):
+                    i = self._find(" ".join(tokens[start:end]))
+                    if i is not None and self.kinds[i] != KIND_PARTIAL:
+                        matched.append(i)
+                        covered += end - start
+                        start = end
+                        break
+                else:
+                    start += 1
+            found = dict.fromkeys(t for i in matched if self.kinds[i] != KIND_GENERIC or covered == len(tokens)
+                                  for t in self._targets(i))
+            if found:
+                return "phrase", tuple(found)
+
+        i = self._fuzzy(normalized)
+        return ("fuzzy", self._targets(i)) if i is not None else ("", ())
+
+    def _fuzzy(self, key: str) -> Optional[int]:
+        if len(key) < MIN_FUZZY_LENGTH:
+            return None
+        key_grams = title_trigrams(key)
+        known = [g for g in (self._find_gram(gram) for gram in key_grams) if g is not None]
+        if not known:
+            return None
+        postings = np.concatenate([self.gram_entries[self.gram_offsets[g]:self.gram_offsets[g + 1]] for g in known])
+        keys, shared = np.unique(postings, return_counts=True)
+        dice = 2.0 * shared / (self.gram_counts[keys].astype(np.float32) + len(key_grams))
+        best = int(dice.argmax())
+        return int(keys[best]) if dice[best] >= MIN_FUZZY_SIMILARITY else None
+
+    def _find_gram(self, gram: str) -> Optional[int]:
+        i = bisect_left(self.gram_keys, gram)
+        return i if i < len(self.gram_keys) and self.gram_keys[i] == gram else None
+
+    def _technology(self, name_id: int) -> SkillTechnology:
+        if name_id >= len(self.name_commodities):
+            return SkillTechnology(self.names[name_id], 0, "")
+        commodity = self.name_commodities[name_id]
+        return SkillTechnology(self.names[name_id], self.commodity_codes[commodity],
+                               self.commodity_titles[commodity])
+
+    def normalize(self, skills: Iterable[str]) -> List[NormalizedSkill]:
+        """Each raw skill with the elements and technologies it names"""
+        results = []
+        for skill in skills:
+            method, targets = self.resolve(skill)
+            results.append(NormalizedSkill(
+                text=skill,
+                method=method,
+                elements=[self.elements[t] for t in targets if t < self.n_elements],
+                technologies=[self._technology(t - self.n_elements) for t in targets if t >= self.n_elements]
+            ))
+        return results
+
+    def columns(self, skills: Iterable[str]) -> List[int]:
+        """Element columns (of the SkillMatrix) named by the skills, each once"""
+        found: Dict[int, None] = {}
+        for skill in skills:
+            found.update((t, None) for t in self.resolve(skill)[1] if t < self.n_elements)
+        return list(found)
+
+    def technology_names(self, skills: Iterable[str]) -> List[str]:
+        """Technology names (as O*NET lists them) named by the skills, each once"""
+        found: Dict[int, None] = {}
+        for skill in skills:
+            found.update((t, None) for t in self.resolve(skill)[1] if t >= self.n_elements)
+        return [self.names[t - self.n_elements] for t in found]
+
+    def info(self) -> Dict:
+        return {"keys": len(self.keys), "trigrams": len(self.gram_keys), "targets": len(self.targets)}
@@ -0,0 +1,252 @@
+"""
+KalmSkills Backend - Task statement index
+Hashed TF-IDF vectors of O*NET task statements, matched against resume text
+"""
+
+import re
+import math
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .search_index import tokenize
+
+# Terms are hashed into this many features (no vocabulary to store)
+FEATURE_BITS = 20
+
+# Detailed work activity titles linked to a task count for this much of
+# a term occurrence in the task itself
+DWA_WEIGHT = 0.5
+
+# A resume line must share at least this cosine with a task to count
+MIN_SIMILARITY = 0.05
+
+# Resume text is split into lines/bullets; more than this are ignored
+MAX_BULLETS = 64
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or such that the their them
+they this to was were which while who will with within without other others e g i me my we our
+""".split())
+
+BULLET_RE = re.compile(r"[\n\r•▪‣●◦]+|(?<=[.;])\s+(?=[A-Z])")
+SUFFIXES = ("ing", "ies", "es", "ed", "s")
+
+
+def stem(token: str) -> str:
+    """Strip one common inflection ("coordinating" -> "coordinat", "budgets" -> "budget")"""
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "ies":
+                return token[:-3] + "y"
+            if suffix == "es" and not token.endswith(("ses", "xes", "zes", "ches", "shes")):
+                return token[:-1]
+            return token[:-len(suffix)]
+    return token
+
+
+def terms(text: str) -> List[str]:
+    """Stemmed unigrams and adjacent-word bigrams, without stop words"""
+    tokens = [stem(token) for token in tokenize(text) if token not in STOP_WORDS and len(token) > 1]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def feature(term: str) -> int:
+    # crc32 rather than hash(): features must agree across processes and builds
+    return zlib.crc32(term.encode("utf-8")) & ((1 << FEATURE_BITS) - 1)
+
+
+def split_bullets(text: str) -> List[str]:
+    """Resume text -> bullets: lines, list markers, or sentences"""
+    return [part.strip(" -*\t") for part in BULLET_RE.split(text) if len(part.strip(" -*\t")) > 2][:MAX_BULLETS]
+
+
+@dataclass
+class AlignedTask:
+    task: str  # the task statement
+    similarity: float
+    bullet: str  # the resume line it aligns with
+
+
+@dataclass
+class TaskMatch:
+    occupation_code: str
+    score: float  # mean over bullets of the best task similarity, 0-1
+    tasks: List[AlignedTask] = field(default_factory=list)
+
+
+class TaskIndexBuilder:
+    """Collects task statements and their DWA titles, then computes TF-IDF"""
+
+    def __init__(self):
+        self._tasks: Dict[str, List[Tuple[str, str]]] = {}  # code -> [(task id, text)]
+        self._dwas: Dict[str, List[str]] = {}  # task id -> DWA titles
+
+    def add_task(self, code: str, task_id: str, text: str):
+        self._tasks.setdefault(code, []).append((task_id, text))
+
+    def add_dwa(self, task_id: str, title: str):
+        self._dwas.setdefault(task_id, []).append(title)
+
+    def build(self, codes: Sequence[str]) -> "TaskIndex":
+        """Index tasks of `codes`, in code order and then file order"""
+        rows = array("I")
+        texts: List[str] = []
+        documents: List[Dict[int, float]] = []
+        for row, code in enumerate(codes):
+            for task_id, text in self._tasks.get(code, []):
+                counts: Dict[int, float] = {}
+                for term in terms(text):
+                    f = feature(term)
+                    counts[f] = counts.get(f, 0.0) + 1.0
+                for title in dict.fromkeys(self._dwas.get(task_id, [])):
+                    for term in terms(title):
+                        f = feature(term)
+                        counts[f] = counts.get(f, 0.0) + DWA_WEIGHT
+                rows.append(row)
+                texts.append(text)
+                documents.append(counts)
+
+        n_tasks = len(documents)
+        df: Dict[int, int] = {}
+        for counts in documents:
+            for f in counts:
+                df[f] = df.get(f, 0) + 1
+        idf = {f: math.log((1 + n_tasks) / (1 + n)) + 1.0 for f, n in df.items()}
+
+        # Feature-major (CSC) layout: a query only reads its own features' postings
+        postings: Dict[int, List[Tuple[int, float]]] = {}
+        for task, counts in enumerate(documents):
+            weights = {f: (1.0 + math.log(c) if c >= 1 else c) * idf[f] for f, c in counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for f, w in weights.items():
+                postings.setdefault(f, []).append((task, w / norm))
+
+        features = sorted(postings)
+        offsets, post_tasks, post_weights = array("I", [0]), array("I"), array("f")
+        for f in features:
+            for task, w in postings[f]:
+                post_tasks.append(task)
+                post_weights.append(w)
+            offsets.append(len(post_tasks))
+        return TaskIndex(codes, rows, texts, array("I", features), array("f", (idf[f] for f in features)),
+                         offsets, post_tasks, post_weights)
+
+
+class TaskIndex:
+    """
+    L2-normalized TF-IDF vectors of every task statement, over hashed
+    unigram and bigram features, stored transposed: feature features[j]
+    has postings post_tasks[offsets[j]:offsets[j + 1]] with their weights.
+
+    Scoring a batch of resume bullets is one sparse product: the bullets'
+    features select postings, and np.bincount accumulates bullet x task
+    cosines in a single pass. Tasks are grouped by occupation (task_rows
+    is non-decreasing), so the best task per occupation is one
+    np.maximum.reduceat.
+
+    Columns keep their stored dtypes, so arrays handed in from the O*NET
+    snapshot are used in place rather than copied into each process.
+    """
+
+    def __init__(self, codes: Sequence[str], task_rows: Sequence[int], texts: Sequence[str],
+                 features: Sequence[int], idf: Sequence[float], offsets: Sequence[int],
+                 post_tasks: Sequence[int], post_weights: Sequence[float]):
+        self.codes = list(codes)
+        self.code_rows = {code: i for i, code in enumerate(self.codes)}
+        self.texts = texts
+        self.task_rows = np.asarray(task_rows, dtype=np.uint32)
+        self.features = np.asarray(features, dtype=np.uint32)
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.offsets = np.asarray(offsets, dtype=np.uint32)
+        self.post_tasks = np.asarray(post_tasks, dtype=np.uint32)
+        self.post_weights = np.asarray(post_weights, dtype=np.float32)
+        # First task of each occupation that has tasks
+        self.group_rows, self.group_starts = np.unique(self.task_rows, return_index=True)
+        self.group_ends = np.append(self.group_starts[1:], len(self.task_rows))
+
+    def __len__(self) -> int:
+        return len(self.task_rows)
+
+    def vectorize(self, texts: Sequence[str]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Per text, (feature positions, L2-normalized TF-IDF weights) over indexed features"""
+        vectors = []
+        for text in texts:
+            counts: Dict[int, int] = {}
+            for term in terms(text):
+                f = feature(term)
+                counts[f] = counts.get(f, 0) + 1
+            hashed = np.fromiter(counts, dtype=np.uint32, count=len(counts))
+            positions = np.searchsorted(self.features, hashed)
+            positions[positions == len(self.features)] = 0
+            known = self.features[positions] == hashed if len(self.features) else np.zeros(len(hashed), bool)
+            positions = positions[known]
+            tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))[known]
+            weights = (1.0 + np.log(tf)) * self.idf[positions]
+            norm = float(np.linalg.norm(weights)) or 1.0
+            vectors.append((positions, weights / norm))
+        return vectors
+
+    def similarities(self, texts: Sequence[str]) -> np.ndarray:
+        """(n_texts, n_tasks) cosine similarities"""
+        n_tasks = len(self.task_rows)
+        cells, values = [], []
+        for t, (positions, weights) in enumerate(self.vectorize(texts)):
+            for position, weight in zip(positions.tolist(), weights.tolist()):
+                start, end = self.offsets[position], self.offsets[position + 1]
+                cells.append(self.post_tasks[start:end].astype(np.int64) + t * n_tasks)
+                values.append(self.post_weights[start:end] * weight)
+        if not cells:
+            return np.zeros((len(texts), n_tasks), dtype=np.float32)
+        flat = np.bincount(np.concatenate(cells), weights=np.concatenate(values),
+                           minlength=len(texts) * n_tasks)
+        return flat.astype(np.float32).reshape(len(texts), n_tasks)
+
+    def match(self, bullets: Sequence[str], limit: int = 10, tasks_per_occupation: int = 5,
+              occupation_code: Optional[str] = None) -> List[TaskMatch]:
+        """
+        Rank occupations by how well their tasks cover the resume bullets
+
+        Each bullet counts with its best-aligned task in the occupation;
+        the occupation's score is the mean over bullets. Returned tasks are
+        the occupation's best-aligned ones, each with the bullet it matched.
+        """
+        bullets = [bullet for bullet in bullets if bullet.strip()]
+        if not bullets or not len(self.task_rows):
+            return []
+        sims = self.similarities(bullets)
+        sims[sims < MIN_SIMILARITY] = 0.0
+        best = np.maximum.reduceat(sims, self.group_starts, axis=1)  # (bullets, occupations with tasks)
+        scores = best.mean(axis=0)
+
+        if occupation_code is not None:
+            row = self.code_rows.get(occupation_code)
+            groups = np.nonzero(self.group_rows == row)[0] if row is not None else np.zeros(0, dtype=np.int64)
+        else:
+            n = min(limit, int(np.count_nonzero(scores)))
+            if n == 0:
+                return []
+            groups = np.argpartition(-scores, n - 1)[:n]
+            groups = groups[np.argsort(-scores[groups], kind="stable")]
+
+        matches = []
+        for g in groups.tolist():
+            start, end = int(self.group_starts[g]), int(self.group_ends[g])
+            block = sims[:, start:end]
+            # Best bullet per task, then the strongest tasks
+            bullet_of = block.argmax(axis=0)
+            task_sims = block.max(axis=0)
+            top = [int(i) for i in np.argsort(-task_sims, kind="stable")[:tasks_per_occupation] if task_sims[i] > 0]
+            matches.append(TaskMatch(
+                occupation_code=self.codes[self.group_rows[g]],
+                score=round(float(scores[g]), 4),
+                tasks=[AlignedTask(self.texts[start + i], round(float(task_sims[i]), 4), bullets[bullet_of[i]])
+                       for i in top]
+            ))
+        return matches
+
+    def info(self) -> Dict:
+        return {"tasks": len(self.task_rows), "features": len(self.features), "postings": len(self.post_tasks)}
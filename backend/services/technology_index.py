@@ -0,0 +1,266 @@
+"""
+KalmSkills Backend - Technology and tools index
+O*NET Technology Skills and Tools Used, per occupation and per technology
+"""
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Weight of an occupation's use of a technology when ranking occupations
+# for a set of resume technologies
+BASE_WEIGHT = 1.0
+HOT_WEIGHT = 0.5  # added for Hot Technology
+IN_DEMAND_WEIGHT = 0.5  # added for In Demand (employer job postings)
+TOOL_WEIGHT = 0.5  # tools are weaker evidence than software
+MAX_WEIGHT = BASE_WEIGHT + HOT_WEIGHT + IN_DEMAND_WEIGHT
+
+
+@dataclass
+class TechnologyEntry:
+    name: str  # the O*NET example, e.g. "Kubernetes"
+    commodity_code: int  # UNSPSC commodity
+    commodity_title: str  # e.g. "Application server software"
+    hot_technology: bool
+    in_demand: bool
+    kind: str  # "technology" or "tool"
+
+
+@dataclass
+class TechnologyUser:
+    code: str
+    hot_technology: bool
+    in_demand: bool
+    kind: str
+
+
+class TechnologyIndexBuilder:
+    """Collects rows from both tables; build() freezes them into columns"""
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, tuple]] = {}  # code -> example -> row
+
+    def add_technology(self, code: str, example: str, commodity_code: str, commodity_title: str,
+                       hot_technology: bool, in_demand: bool):
+        self._rows.setdefault(code, {}).setdefault(
+            example, (example, int(commodity_code or 0), commodity_title, hot_technology, in_demand, False))
+
+    def add_tool(self, code: str, example: str, commodity_code: str, commodity_title: str):
+        self._rows.setdefault(code, {}).setdefault(
+            example, (example, int(commodity_code or 0), commodity_title, False, False, True))
+
+    def build(self, codes: Sequence[str]) -> "TechnologyIndex":
+        names: Dict[str, int] = {}
+        commodities: Dict[int, int] = {}
+        commodity_titles: List[str] = []
+        offsets, entry_names, entry_commodities = array("I", [0]), array("I"), array("H")
+        hot, in_demand, tool = [], [], []
+        for code in codes:
+            rows = self._rows.get(code, {}).values()
+            # Software before tools; hot and in-demand technologies first
+            for name, commodity_code, commodity_title, is_hot, is_in_demand, is_tool in sorted(
+                    rows, key=lambda row: (row[5], not row[4], not row[3])):
+                entry_names.append(names.setdefault(name, len(names)))
+                if commodity_code not in commodities:
+                    commodities[commodity_code] = len(commodities)
+                    commodity_titles.append(commodity_title)
+                entry_commodities.append(commodities[commodity_code])
+                hot.append(is_hot)
+                in_demand.append(is_in_demand)
+                tool.append(is_tool)
+            offsets.append(len(entry_names))
+
+        def bitset(flags: List[bool]) -> bytes:
+            return np.packbits(np.array(flags, dtype=bool), bitorder="little").tobytes()
+
+        # Case-insensitive lookup: sorted lowercased names, the first spelling winning
+        lowered: Dict[str, int] = {}
+        for name, name_id in names.items():
+            lowered.setdefault(name.lower(), name_id)
+        lookup_names = sorted(lowered)
+
+        # Reverse index: entries grouped by technology, in occupation order
+        names_np = np.asarray(entry_names, dtype=np.uint32)
+        order = np.argsort(names_np, kind="stable")
+        user_offsets = np.searchsorted(names_np[order], np.arange(len(names) + 1))
+
+        return TechnologyIndex(codes, list(names), array("I", commodities), commodity_titles, offsets,
+                               entry_names, entry_commodities, bitset(hot), bitset(in_demand), bitset(tool),
+                               lookup_names, array("I", (lowered[name] for name in lookup_names)),
+                               user_offsets.astype(np.uint32), order.astype(np.uint32))
+
+
+class TechnologyIndex:
+    """
+    Occupation i's technologies and tools are entries
+    offsets[i]:offsets[i + 1]: an interned example name, an interned UNSPSC
+    commodity, and one bit each in the hot / in-demand / tool bitsets. The
+    reverse index (technology -> occupations) is a CSR over the same
+    entries: technology t's entries are
+    user_entries[user_offsets[t]:user_offsets[t + 1]].
+
+    Names are found by bisecting the sorted lowercased lookup_names, so
+    "which occupations use Kubernetes" is a bisection and a slice, and
+    every column can be a view into the shared O*NET snapshot.
+    """
+
+    def __init__(self, codes: Sequence[str], names: Sequence[str], commodity_codes: Sequence[int],
+                 commodity_titles: Sequence[str], offsets: Sequence[int], entry_names: Sequence[int],
+                 entry_commodities: Sequence[int], hot: bytes, in_demand: bytes, tool: bytes,
+                 lookup_names: Sequence[str], lookup_ids: Sequence[int],
+                 user_offsets: Sequence[int], user_entries: Sequence[int]):
+        self.codes = list(codes)
+        self.code_rows = {code: i for i, code in enumerate(self.codes)}
+        self.names = names
+        self.commodity_codes = commodity_codes
+        self.commodity_titles = commodity_titles
+        self.offsets = offsets
+        self.entry_names = entry_names
+        self.entry_commodities = entry_commodities
+        self.hot, self.in_demand, self.tool = hot, in_demand, tool
+        self.lookup_names = lookup_names
+        self.lookup_ids = lookup_ids
+        self.user_offsets = user_offsets
+        self.user_entries = user_entries
+        self._offsets = np.asarray(offsets, dtype=np.uint32)
+        self._user_entries = np.asarray(user_entries, dtype=np.uint32)
+        self._bits = [np.frombuffer(bits, dtype=np.uint8) for bits in (hot, in_demand, tool)]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _bit(self, bits: bytes, entry: int) -> bool:
+        return bool(bits[entry >> 3] >> (entry & 7) & 1)
+
+    def _entry(self, entry: int) -> TechnologyEntry:
+        commodity = self.entry_commodities[entry]
+        return TechnologyEntry(
+            name=self.names[self.entry_names[entry]],
+            commodity_code=self.commodity_codes[commodity],
+            commodity_title=self.commodity_titles[commodity],
+            hot_technology=self._bit(self.hot, entry),
+            in_demand=self._bit(self.in_demand, entry),
+            kind="tool" if self._bit(self.tool, entry) else "technology"
+        )
+
+    def entries(self, code: str, include_tools: bool = False) -> List[TechnologyEntry]:
+        """An occupation's technologies (and tools), hot and in-demand first"""
+        row = self.code_rows.get(code)
+        if row is None:
+            return []
+        entries = [self._entry(e) for e in range(self.offsets[row], self.offsets[row + 1])]
+        return entries if include_tools else [e for e in entries if e.kind == "technology"]
+
+    def technology_names(self, code: str) -> List[str]:
+        """Just the technology names of an occupation, hot and in-demand first"""
+        return [entry.name for entry in self.entries(code)]
+
+    def resolve(self, name: str) -> Optional[int]:
+        """ID of a technology or tool name (case-insensitive), or None"""
+        key = name.strip().lower()
+        i = bisect_left(self.lookup_names, key)
+        if i < len(self.lookup_names) and self.lookup_names[i] == key:
+            return self.lookup_ids[i]
+        return None
+
+    def _users(self, name_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Entries of one technology and the occupation row of each"""
+        entries = self._user_entries[self.user_offsets[name_id]:self.user_offsets[name_id + 1]]
+        return entries, np.searchsorted(self._offsets, entries, side="right") - 1
+
+    def _weights(self, entries: np.ndarray) -> np.ndarray:
+        """Ranking weight of each entry from its hot / in-demand / tool bits"""
+        hot, in_demand, tool = ((bits[entries >> 3] >> (entries & 7)) & 1 for bits in self._bits)
+        weights = BASE_WEIGHT + HOT_WEIGHT * hot + IN_DEMAND_WEIGHT * in_demand
+        return np.where(tool == 1, weights * TOOL_WEIGHT, weights)
+
+    def name_commodities(self) -> array:
+        """Commodity (index into commodity_codes) of each technology name, from its first use"""
+        return array("H", (self.entry_commodities[self.user_entries[self.user_offsets[t]]]
+                           if self.user_offsets[t + 1] > self.user_offsets[t] else 0
+                           for t in range(len(self.names))))
+
+    def is_software(self, name_id: int) -> bool:
+        """Whether any occupation lists the name as a technology rather than a tool"""
+        entries, _ = self._users(name_id)
+        return any(not self._bit(self.tool, entry) for entry in entries.tolist())
+
+    def users(self, name: str, hot_only: bool = False) -> List[TechnologyUser]:
+        """Occupations that use a technology or tool (case-insensitive name)"""
+        name_id = self.resolve(name)
+        if name_id is None:
+            return []
+        entries, rows = self._users(name_id)
+        users = []
+        for entry, row in zip(entries.tolist(), rows.tolist()):
+            hot = self._bit(self.hot, entry)
+            if hot or not hot_only:
+                users.append(TechnologyUser(self.codes[row], hot, self._bit(self.in_demand, entry),
+                                            "tool" if self._bit(self.tool, entry) else "technology"))
+        return users
+
+    def _usage(self, name_ids: Sequence[int]) -> Tuple[np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]:
+        """Each occupation's summed weight (see _weights()) over the given technologies, and their users"""
+        users = [self._users(i) for i in name_ids]
+        if not users:
+            return np.zeros(len(self.codes)), users
+        entries = np.concatenate([entries for entries, _ in users])
+        scores = np.bincount(np.concatenate([rows for _, rows in users]), weights=self._weights(entries),
+                             minlength=len(self.codes))
+        return scores, users
+
+    def overlap(self, name_ids: Iterable[int]) -> np.ndarray:
+        """
+        Share of the technologies in name_ids (see resolve_all) each
+        occupation uses, in [0, 1]; a use counts fully only if the
+        occupation lists it as a hot, in-demand technology
+        """
+        name_ids = sorted(name_ids)
+        scores, _ = self._usage(name_ids)
+        return scores / (MAX_WEIGHT * max(len(name_ids), 1))
+
+    def rank_occupations(self, names: Iterable[str], limit: int = 10) -> List[Tuple[str, float, List[str]]]:
+        """
+        Occupations using the most of the given technologies
+
+        Returns (code, score, matched names) best first; each technology
+        counts once per occupation, weighted up if hot or in demand.
+        """
+        name_ids = sorted(self.resolve_all(names))
+        if not name_ids or limit <= 0:
+            return []
+        scores, users = self._usage(name_ids)
+        n = min(limit, int(np.count_nonzero(scores)))
+        if n == 0:
+            return []
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        matched: Dict[int, List[str]] = {int(row): [] for row in top}
+        for name_id, (_, rows) in zip(name_ids, users):
+            for row in rows.tolist():
+                if row in matched:
+                    matched[row].append(self.names[name_id])
+        return [(self.codes[row], round(float(scores[row]), 4), matched[row]) for row in matched]
+
+    def resolve_all(self, names: Iterable[str]) -> set:
+        """IDs of the names that are known technologies or tools"""
+        return {i for i in (self.resolve(name) for name in names) if i is not None}
+
+    def matching_names(self, code: str, name_ids: set) -> List[str]:
+        """Which of the technologies in name_ids (see resolve_all) an occupation uses"""
+        row = self.code_rows.get(code)
+        if row is None or not name_ids:
+            return []
+        return [self.names[n] for n in self.entry_names[self.offsets[row]:self.offsets[row + 1]] if n in name_ids]
+
+    def info(self) -> Dict:
+        return {
+            "occupations": sum(1 for i in range(len(self.codes)) if self.offsets[i + 1] > self.offsets[i]),
+            "technologies": len(self.names),
+            "commodities": len(self.commodity_titles),
+            "entries": len(self.entry_names)
+        }
@@ -0,0 +1,279 @@
+"""
+KalmSkills Backend - Job title index
+Resolves job titles ("line cook", "SWE") to O*NET occupations from the
+official, alternate and reported titles
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .search_index import tokenize
+
+# How strongly each kind of title points at its occupation
+OFFICIAL_TITLE_SCORE = 1.0
+REPORTED_TITLE_SCORE = 0.9  # + REPORTED_SHOWN_BONUS if shown in My Next Move
+REPORTED_SHOWN_BONUS = 0.05
+ALTERNATE_TITLE_SCORE = 0.8  # + ALTERNATE_SOURCE_BONUS per source, up to 5
+ALTERNATE_SOURCE_BONUS = 0.02
+VARIANT_WEIGHT = 0.95  # "CEO" from "CEO (Chief Executive Officer)"
+
+# Layer multipliers, so a closer kind of match always ranks first
+UNQUALIFIED_WEIGHT = 0.9  # exact after dropping "senior", "ii", ...
+PREFIX_WEIGHT = 0.6
+TRIGRAM_WEIGHT = 0.5
+
+MIN_PREFIX_LENGTH = 3
+MIN_TRIGRAM_SIMILARITY = 0.55
+
+# Shorthand job seekers type that O*NET does not list
+QUERY_ALIASES = {
+    "swe": "software engineer",
+    "sde": "software development engineer",
+    "sre": "site reliability engineer",
+    "qa": "quality assurance",
+    "ux": "user experience",
+    "ui": "user interface",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dev": "developer",
+    "devs": "developers",
+    "eng": "engineer",
+    "mgr": "manager",
+    "asst": "assistant",
+    "admin": "administrator",
+    "tech": "technician",
+    "rep": "representative",
+}
+
+# Seniority and level words that don't change the occupation
+QUALIFIERS = {"senior", "sr", "junior", "jr", "lead", "staff", "principal", "chief", "head",
+              "entry", "level", "associate", "i", "ii", "iii", "iv", "1", "2", "3"}
+
+PARENTHETICAL_RE = re.compile(r"\s*\(([^)]*)\)")
+
+
+def normalize_title(title: str) -> str:
+    """'Line Cook ' -> 'line cook'"""
+    return " ".join(tokenize(title))
+
+
+def title_trigrams(title: str) -> List[str]:
+    """Distinct boundary-padded trigrams ("cook" -> "$co", "coo", "ook", "ok$")"""
+    padded = f"${title}$"
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+def title_variants(title: str, short_title: Optional[str] = None) -> List[Tuple[str, float]]:
+    """
+    The title plus the shorter forms a user might type, each with a weight
+
+    "Chief Financial Officer (CFO)" -> the full title, "Chief Financial
+    Officer" and "CFO"; a Short Title column value is one more variant.
+    """
+    variants = [(title, 1.0)]
+    inner = PARENTHETICAL_RE.findall(title)
+    if inner:
+        variants.append((PARENTHETICAL_RE.sub("", title), VARIANT_WEIGHT))
+        variants.extend((text, VARIANT_WEIGHT) for text in inner)
+    if short_title and short_title != "n/a":
+        variants.append((short_title, VARIANT_WEIGHT))
+    return variants
+
+
+@dataclass
+class TitleMatch:
+    code: str
+    score: float
+    title: str  # the title as O*NET lists it
+    layer: str  # "exact", "prefix" or "trigram"
+
+
+class TitleIndexBuilder:
+    """Collects titles per occupation, keeping the best score for each pair"""
+
+    def __init__(self):
+        self._scores: Dict[str, Dict[str, float]] = {}  # normalized title -> code -> score
+        self._display: Dict[str, Tuple[float, str]] = {}
+
+    def add(self, code: str, title: str, score: float, short_title: Optional[str] = None):
+        for variant, weight in title_variants(title, short_title):
+            key = normalize_title(variant)
+            if not key:
+                continue
+            variant_score = score * weight
+            codes = self._scores.setdefault(key, {})
+            if variant_score > codes.get(code, 0.0):
+                codes[code] = variant_score
+            if variant_score > self._display.get(key, (0.0, ""))[0]:
+                self._display[key] = (variant_score, variant.strip())
+
+    def add_official(self, code: str, title: str):
+        self.add(code, title, OFFICIAL_TITLE_SCORE)
+
+    def add_alternate(self, code: str, title: str, short_title: Optional[str] = None, sources: str = ""):
+        source_count = min(len([s for s in sources.split(",") if s.strip()]), 5)
+        self.add(code, title, ALTERNATE_TITLE_SCORE + ALTERNATE_SOURCE_BONUS * source_count, short_title)
+
+    def add_reported(self, code: str, title: str, shown: bool = False):
+        self.add(code, title, REPORTED_TITLE_SCORE + (REPORTED_SHOWN_BONUS if shown else 0.0))
+
+    def build(self, codes: Sequence[str]) -> "TitleIndex":
+        """Freeze into a TitleIndex over `codes` (titles of other codes are dropped)"""
+        code_rows = {code: i for i, code in enumerate(codes)}
+        titles, display = [], []
+        offsets, entry_codes, entry_scores = array("I", [0]), array("I"), array("f")
+        for key in sorted(self._scores):
+            ranked = sorted(((score, code) for code, score in self._scores[key].items() if code in code_rows),
+                            reverse=True)
+            if not ranked:
+                continue
+            titles.append(key)
+            display.append(self._display[key][1])
+            for score, code in ranked:
+                entry_codes.append(code_rows[code])
+                entry_scores.append(score)
+            offsets.append(len(entry_codes))
+
+        grams: Dict[str, List[int]] = {}
+        gram_counts = array("H")
+        for i, title in enumerate(titles):
+            title_grams = title_trigrams(title)
+            gram_counts.append(min(len(title_grams), 0xFFFF))
+            for gram in title_grams:
+                grams.setdefault(gram, []).append(i)
+        gram_keys = sorted(grams)
+        gram_offsets, gram_titles = array("I", [0]), array("I")
+        for gram in gram_keys:
+            gram_titles.extend(grams[gram])
+            gram_offsets.append(len(gram_titles))
+
+        return TitleIndex(codes, titles, display, offsets, entry_codes, entry_scores,
+                          gram_keys, gram_offsets, gram_titles, gram_counts)
+
+
+class TitleIndex:
+    """
+    Normalized job title -> occupations, in three layers tried in order:
+
+    - exact: the whole title (then the title without seniority words
+      like "senior" or "ii")
+    - prefix: titles starting with the query, one bisect range of the
+      sorted titles, ranked by how much of the title the query covers
+    - trigram: titles sharing most character trigrams with the query
+      (Dice coefficient), for typos; postings are counted with NumPy
+
+    Title i's occupations are entry_codes[offsets[i]:offsets[i + 1]], best
+    first. Titles and trigrams are sorted, so both are found by bisection
+    rather than through dicts: every column, strings included, can be a
+    view into the O*NET snapshot that worker processes share.
+    """
+
+    def __init__(self, codes: Sequence[str], titles: Sequence[str], display: Sequence[str],
+                 offsets: Sequence[int], entry_codes: Sequence[int], entry_scores: Sequence[float],
+                 gram_keys: Sequence[str], gram_offsets: Sequence[int], gram_titles: Sequence[int],
+                 gram_counts: Sequence[int]):
+        self.codes = list(codes)
+        self.titles = titles
+        self.display = display
+        self.offsets = offsets
+        self.entry_codes = entry_codes
+        self.entry_scores = entry_scores
+        self.gram_keys = gram_keys
+        # Typed views of the columns (no copies when they are snapshot buffers)
+        self._offsets = np.asarray(offsets, dtype=np.uint32)
+        self._scores = np.asarray(entry_scores, dtype=np.float32)
+        self.gram_offsets = np.asarray(gram_offsets, dtype=np.uint32)
+        self.gram_titles = np.asarray(gram_titles, dtype=np.uint32)
+        self.gram_counts = np.asarray(gram_counts, dtype=np.uint16)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @staticmethod
+    def _find(keys: Sequence[str], key: str) -> Optional[int]:
+        """Position of key in a sorted sequence, or None"""
+        i = bisect_left(keys, key)
+        return i if i < len(keys) and keys[i] == key else None
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize and expand shorthand ("Sr. SWE" -> "sr software engineer")"""
+        return " ".join(QUERY_ALIASES.get(token, token) for token in tokenize(query))
+
+    def lookup(self, query: str, limit: int = 10) -> List[TitleMatch]:
+        """
+        Occupations whose titles match the query, best first
+
+        Only the first layer with any match is used, so a title O*NET
+        lists resolves with one or two bisections of the sorted titles.
+        """
+        query = self.normalize_query(query)
+        if not query or limit <= 0:
+            return []
+
+        title_id = self._find(self.titles, query)
+        if title_id is not None:
+            return self._matches([(title_id, 1.0)], "exact", limit)
+
+        unqualified = " ".join(token for token in query.split() if token not in QUALIFIERS)
+        title_id = self._find(self.titles, unqualified) if unqualified != query else None
+        if title_id is not None:
+            return self._matches([(title_id, UNQUALIFIED_WEIGHT)], "exact", limit)
+
+        matches = self._prefix(query, limit)
+        if matches:
+            return matches
+        return self._trigram(unqualified or query, limit)
+
+    def _prefix(self, query: str, limit: int) -> List[TitleMatch]:
+        if len(query) < MIN_PREFIX_LENGTH:
+            return []
+        start = bisect_left(self.titles, query)
+        end = bisect_left(self.titles, query + "\uffff", start)
+        if start == end:
+            return []
+        # Shorter titles are closer to what was typed
+        lengths = np.fromiter((len(self.titles[i]) for i in range(start, end)), dtype=np.float32,
+                              count=end - start)
+        weights = (len(query) / lengths) * PREFIX_WEIGHT
+        return self._matches(self._top(weights, start, limit), "prefix", limit)
+
+    def _trigram(self, query: str, limit: int) -> List[TitleMatch]:
+        query_grams = title_trigrams(query)
+        known = [g for g in (self._find(self.gram_keys, gram) for gram in query_grams) if g is not None]
+        if not known:
+            return []
+        postings = np.concatenate([self.gram_titles[self.gram_offsets[g]:self.gram_offsets[g + 1]]
+                                   for g in known])
+        shared = np.bincount(postings, minlength=len(self.titles)).astype(np.float32)
+        dice = 2.0 * shared / (self.gram_counts.astype(np.float32) + len(query_grams))
+        dice[dice < MIN_TRIGRAM_SIMILARITY] = 0.0
+        return self._matches(self._top(dice * TRIGRAM_WEIGHT, 0, limit), "trigram", limit)
+
+    def _top(self, weights: np.ndarray, base: int, limit: int) -> List[Tuple[int, float]]:
+        """(title id, weight) of the `limit` titles with the best weighted scores"""
+        # Weighted by each title's best entry score
+        ranking = weights * self._scores[self._offsets[base:base + len(weights)]]
+        n = min(limit, len(ranking))
+        top = np.argpartition(-ranking, n - 1)[:n]
+        top = top[np.argsort(-ranking[top], kind="stable")]
+        return [(base + int(i), float(weights[i])) for i in top if ranking[i] > 0]
+
+    def _matches(self, titles: List[Tuple[int, float]], layer: str, limit: int) -> List[TitleMatch]:
+        """Expand titles to their occupations, each occupation once at its best score"""
+        best: Dict[int, TitleMatch] = {}
+        for title_id, weight in titles:
+            for e in range(self.offsets[title_id], self.offsets[title_id + 1]):
+                code = self.entry_codes[e]
+                score = round(weight * self.entry_scores[e], 4)
+                if code not in best or score > best[code].score:
+                    best[code] = TitleMatch(self.codes[code], score, self.display[title_id], layer)
+        return sorted(best.values(), key=lambda match: match.score, reverse=True)[:limit]
+
+    def info(self) -> Dict:
+        return {"titles": len(self.titles), "trigrams": len(self.gram_keys)}
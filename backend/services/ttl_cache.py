@@ -0,0 +1,183 @@
+"""
+KalmSkills Backend - Response cache
+Bounded TTL + LRU cache for upstream API responses
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lookup outcomes (see TTLCache._begin)
+HIT, STALE, LOAD, WAIT = "hit", "stale", "load", "wait"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0  # served expired while a refresh ran in the background
+    misses: int = 0
+    coalesced: int = 0  # misses that waited on another caller's fetch
+    evictions: int = 0
+    refreshes: int = 0
+    errors: int = 0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after `ttl` seconds.
+
+    Values are produced by the loader passed to get(), or the coroutine
+    function passed to get_async(); both share the same entries. Concurrent
+    misses for the same key share one load. For `stale_ttl` seconds after
+    expiry an entry is still served while one background refresh replaces
+    it (stale-while-revalidate). Past that it counts as a miss. A failed
+    load is not cached; the exception reaches every caller waiting on it.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0, stale_ttl: float = 3600.0,
+                 name: str = "cache"):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.name = name
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _begin(self, key: Hashable) -> Tuple[str, Any, Optional[Future]]:
+        """
+        Classify a lookup as HIT, STALE (refresh if a future is returned),
+        LOAD (caller must load into the future) or WAIT (on another load)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now < entry.expires_at:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return HIT, entry.value, None
+                if now < entry.expires_at + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stats.stale_hits += 1
+                    future = None
+                    if key not in self._inflight:
+                        self._inflight[key] = future = Future()
+                    return STALE, entry.value, future
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats.coalesced += 1
+                return WAIT, None, future
+            self.stats.misses += 1
+            self._inflight[key] = future = Future()
+            return LOAD, None, future
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Cached value for key, calling loader() on a miss"""
+        state, value, future = self._begin(key)
+        if state == HIT:
+            return value
+        if state == STALE:
+            if future is not None:
+                self._refresh_pool().submit(self._load, key, loader, future)
+            return value
+        if state == LOAD:
+            self._load(key, loader, future)
+        return future.result()
+
+    async def get_async(self, key: Hashable, loader: Callable[[], Awaitable]) -> Any:
+        """
+        Cached value for key, awaiting loader() on a miss
+
+        The load runs as its own task, so a caller that is cancelled (e.g. a
+        client disconnect) does not fail the other callers waiting on it.
+        """
+        state, value, future = self._begin(key)
+        if state == HIT:
+            return value
+        if state in (STALE, LOAD) and future is not None:
+            task = asyncio.ensure_future(self._load_async(key, loader, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if state == STALE:
+            return value
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], future: Future):
+        try:
+            value = loader()
+        except BaseException as e:
+            self._fail(key, future, e)
+            return
+        self._store(key, future, value)
+
+    async def _load_async(self, key: Hashable, loader: Callable[[], Awaitable], future: Future):
+        try:
+            value = await loader()
+        except BaseException as e:
+            self._fail(key, future, e)
+            return
+        self._store(key, future, value)
+
+    def _fail(self, key: Hashable, future: Future, error: BaseException):
+        with self._lock:
+            self.stats.errors += 1
+            self._inflight.pop(key, None)
+        future.set_exception(error)
+
+    def _store(self, key: Hashable, future: Future, value: Any):
+        with self._lock:
+            if key in self._entries:
+                self.stats.refreshes += 1
+            self._entries[key] = _Entry(value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def _refresh_pool(self) -> ThreadPoolExecutor:
+        # Created on first stale hit, long after any worker processes fork
+        if self._refresher is None:
+            self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"{self.name}-refresh")
+        return self._refresher
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> Dict:
+        """Counters plus current size, for debug endpoints"""
+        with self._lock:
+            lookups = self.stats.hits + self.stats.stale_hits + self.stats.misses + self.stats.coalesced
+            return {
+                **asdict(self.stats),
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round((self.stats.hits + self.stats.stale_hits) / lookups, 4) if lookups else 0.0
+            }
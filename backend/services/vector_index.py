@@ -0,0 +1,217 @@
+"""
+KalmSkills Backend - Occupation vector index
+Free resume text -> occupations, by approximate nearest-neighbor search over
+dense vectors of each occupation's titles, description, tasks and technologies
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .task_index import feature, terms
+
+# Hashed TF-IDF features (those of task_index) in fewer occupations than
+# this are dropped; the rest are projected onto DIMENSIONS latent
+# dimensions (LSA), so every occupation is one short dense row
+MIN_DOCUMENT_FREQUENCY = 5
+DIMENSIONS = 256
+
+# Inverted file (IVF): occupations are clustered into N_LISTS cells, and a
+# query scores only the occupations in its N_PROBE closest cells
+N_LISTS = 32
+N_PROBE = 8
+KMEANS_ITERATIONS = 25
+
+# Up to this many occupations one product over all of them is as fast as
+# probing cells (O*NET has about 1,000), so search() is exact by default
+EXACT_SEARCH_MAX = 4096
+
+# Term weight of each part of an occupation's document
+TITLE_WEIGHT = 3.0
+ALTERNATE_TITLE_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 1.5
+TASK_WEIGHT = 1.0
+TECHNOLOGY_WEIGHT = 0.5
+
+
+@dataclass
+class VectorMatch:
+    occupation_code: str
+    similarity: float  # cosine in the latent space
+
+
+class VectorIndexBuilder:
+    """Collects weighted term counts per occupation; build() computes the vectors and IVF cells"""
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[int, float]] = {}
+
+    def add(self, code: str, text: str, weight: float = 1.0):
+        counts = self._counts.setdefault(code, {})
+        for term in terms(text):
+            f = feature(term)
+            counts[f] = counts.get(f, 0.0) + weight
+
+    def build(self, codes: Sequence[str], dimensions: int = DIMENSIONS, n_lists: int = N_LISTS,
+              seed: int = 0) -> "VectorIndex":
+        documents = [self._counts.get(code, {}) for code in codes]
+        df: Dict[int, int] = {}
+        for counts in documents:
+            for f in counts:
+                df[f] = df.get(f, 0) + 1
+        features = sorted(f for f, n in df.items() if n >= MIN_DOCUMENT_FREQUENCY)
+        columns = {f: j for j, f in enumerate(features)}
+        idf = np.array([math.log((1 + len(documents)) / (1 + df[f])) + 1.0 for f in features], dtype=np.float32)
+
+        tfidf = np.zeros((len(codes), len(features)), dtype=np.float32)
+        for row, counts in enumerate(documents):
+            for f, c in counts.items():
+                j = columns.get(f)
+                if j is not None:
+                    tfidf[row, j] = (1.0 + math.log(c) if c >= 1 else c) * idf[j]
+        tfidf /= np.maximum(np.linalg.norm(tfidf, axis=1, keepdims=True), 1e-12)
+
+        # Truncated SVD through the (occupations x occupations) Gram matrix,
+        # far smaller than the term dimension: tfidf = U S V', and the
+        # projection V = tfidf' U / S maps any TF-IDF vector into U S space
+        eigenvalues, eigenvectors = np.linalg.eigh(tfidf @ tfidf.T)
+        top = np.argsort(-eigenvalues)[:min(dimensions, len(codes))]
+        top = top[eigenvalues[top] > 1e-6]
+        singular = np.sqrt(eigenvalues[top])
+        projection = (tfidf.T @ eigenvectors[:, top]) / singular
+        vectors = eigenvectors[:, top] * singular
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        centroids, cells = self._cluster(vectors.astype(np.float32), max(1, min(n_lists, len(codes))), seed)
+        # Rows are stored cell by cell so a probed cell is one contiguous slice
+        order = np.argsort(cells, kind="stable")
+        offsets = np.searchsorted(cells[order], np.arange(len(centroids) + 1))
+        return VectorIndex(codes, np.array(features, dtype=np.uint32), idf, projection.astype(np.float16),
+                           centroids, offsets.astype(np.uint32), order.astype(np.uint32),
+                           vectors[order].astype(np.float32))
+
+    @staticmethod
+    def _cluster(vectors: np.ndarray, k: int, seed: int):
+        """Spherical k-means: (unit centroids, cell of each row)"""
+        if not len(vectors) or not vectors.shape[1]:
+            return np.zeros((k, vectors.shape[1]), dtype=np.float32), np.zeros(len(vectors), dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), k, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            sims = vectors @ centroids.T
+            cells = sims.argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, cells, vectors)
+            # An emptied cell restarts at the row its centroid fits worst
+            for empty in np.setdiff1d(np.arange(k), cells):
+                worst = int(sims.max(axis=1).argmin())
+                sums[empty] = vectors[worst]
+                sims[worst] = np.inf
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+        return centroids.astype(np.float32), (vectors @ centroids.T).argmax(axis=1)
+
+
+class VectorIndex:
+    """
+    One unit vector per occupation: its TF-IDF vector over the hashed
+    unigram and bigram features of task_index, projected onto the top
+    latent dimensions of all occupations (LSA). A resume is mapped the
+    same way, through `projection` (one row per feature, float16).
+
+    Occupations are clustered into cells around unit centroids; cell c
+    holds vectors[offsets[c]:offsets[c + 1]] (occupation rows in
+    `rows`). A query is compared with the centroids, then only with the
+    occupations in its `probes` closest cells. Exact search scores every
+    occupation instead; it is the reference the recall benchmark
+    (backend/benchmark_vector_index.py) compares against.
+    """
+
+    def __init__(self, codes: Sequence[str], features: Sequence[int], idf: Sequence[float],
+                 projection: np.ndarray, centroids: np.ndarray, offsets: Sequence[int], rows: Sequence[int],
+                 vectors: np.ndarray):
+        self.codes = list(codes)
+        self.features = np.asarray(features, dtype=np.uint32)
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.projection = projection
+        self.centroids = centroids
+        self.offsets = np.asarray(offsets, dtype=np.uint32)
+        self.rows = np.asarray(rows, dtype=np.uint32)
+        self.vectors = vectors
+        self._positions = np.arange(len(self.rows))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def vectorize(self, text: str) -> Optional[np.ndarray]:
+        """Unit latent vector of the text's indexed terms, or None if it has none"""
+        counts: Dict[int, int] = {}
+        for term in terms(text):
+            f = feature(term)
+            counts[f] = counts.get(f, 0) + 1
+        if not counts or not len(self.features):
+            return None
+        hashed = np.fromiter(counts, dtype=np.uint32, count=len(counts))
+        positions = np.minimum(np.searchsorted(self.features, hashed), len(self.features) - 1)
+        known = self.features[positions] == hashed
+        if not known.any():
+            return None
+        positions = positions[known]
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))[known]
+        vector = ((1.0 + np.log(tf)) * self.idf[positions]) @ self.projection[positions].astype(np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def candidates(self, query: np.ndarray, probes: int) -> np.ndarray:
+        """Stored positions of the occupations in the query's closest cells"""
+        if probes >= len(self.centroids):
+            return self._positions
+        cells = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+        return np.concatenate([self._positions[self.offsets[c]:self.offsets[c + 1]] for c in cells.tolist()])
+
+    def search_vector(self, query: np.ndarray, limit: int = 10, probes: int = N_PROBE,
+                      exact: Optional[bool] = None) -> List[VectorMatch]:
+        if exact is None:
+            exact = len(self.rows) <= EXACT_SEARCH_MAX
+        if exact:
+            positions, scores = self._positions, self.vectors @ query
+        else:
+            positions = self.candidates(query, max(probes, 1))
+            scores = self.vectors[positions] @ query
+        n = min(limit, len(positions))
+        if n <= 0:
+            return []
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [VectorMatch(self.codes[self.rows[positions[i]]], round(float(scores[i]), 4))
+                for i in top.tolist() if scores[i] > 0]
+
+    def search(self, text: str, limit: int = 10, probes: int = N_PROBE,
+               exact: Optional[bool] = None) -> List[VectorMatch]:
+        """
+        Occupations closest to free text, best first
+
+        Args:
+            text: Resume text (or any free text)
+            limit: Number of occupations to return
+            probes: Cells searched; more is slower and closer to exact
+            exact: Score every occupation (brute force) instead of probing;
+                by default only while that is as fast (EXACT_SEARCH_MAX)
+        """
+        query = self.vectorize(text)
+        return [] if query is None else self.search_vector(query, limit, probes, exact)
+
+    def recall(self, queries: Sequence[np.ndarray], limit: int = 10, probes: int = N_PROBE) -> float:
+        """Share of the brute-force top `limit` that the approximate search also returns"""
+        found = total = 0
+        for query in queries:
+            exact = {match.occupation_code for match in self.search_vector(query, limit, exact=True)}
+            approximate = {match.occupation_code for match in self.search_vector(query, limit, probes, exact=False)}
+            found += len(exact & approximate)
+            total += len(exact)
+        return found / total if total else 1.0
+
+    def info(self) -> Dict:
+        return {"occupations": len(self.rows), "features": len(self.features),
+                "dimensions": self.vectors.shape[1], "lists": len(self.centroids)}
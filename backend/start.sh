@@ -6,5 +6,6 @@ echo "Installing Python dependencies..."
 pip install -r backend/requirements.txt
 
 echo "Starting backend server..."
-cd backend
-python -m uvicorn main:app --host 0.0.0.0 --port $PORT
+# gunicorn.conf.py in the repo root sets the workers and compiles the O*NET snapshot
+cd "$(dirname "$0")/.."
+gunicorn wsgi:app
@@ -0,0 +1,31 @@
+"""
+KalmSkills Backend - Test fixtures
+Services are imported the way main.py imports them, from backend/
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.onet_service import OnetService  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def onet() -> OnetService:
+    """The service over the real O*NET data (snapshot, compiled on first use)"""
+    service = OnetService()
+    if not service.occupations:
+        pytest.skip(f"O*NET data not available: {service.load_error}")
+    return service
+
+
+@pytest.fixture(scope="session")
+def client(onet):
+    """The API; without the context manager, startup hooks (the SEC refresh) don't run"""
+    from fastapi.testclient import TestClient
+
+    import main
+    return TestClient(main.app)
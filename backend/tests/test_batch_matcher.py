@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+import pytest
+
+import main
+from services.batch_matcher import BatchMatcher, BatchStats
+
+RESUMES = [
+    ["Python programming", "SQL"],
+    ["Patient care", "Biology"],
+    ["welding", "Repairing"],
+    ["Kubernetes"],
+    ["Accounting", "Excel"],
+]
+
+
+@pytest.fixture
+def matcher(onet):
+    matcher = BatchMatcher(onet, workers=1, chunk_size=2)
+    yield matcher
+    matcher.shutdown()
+
+
+@pytest.fixture
+def batch_matcher(client, monkeypatch):
+    matcher = BatchMatcher(main.onet_service, workers=1, chunk_size=2)
+    monkeypatch.setattr(main, "batch_matcher", matcher)
+    yield matcher
+    matcher.shutdown()
+
+
+def test_chunks_score_like_one_call(onet, matcher):
+    items = [(skills, None, 3) for skills in RESUMES]
+    stats = BatchStats()
+
+    async def run():
+        return [result async for result in matcher.match_stream(items, stats)]
+
+    results = asyncio.run(run())
+    matches = [None] * len(items)
+    for result in results:
+        matches[result.start:result.start + len(result.matches)] = result.matches
+
+    assert matches == onet.match_resumes(items)
+    assert (stats.requests, stats.chunks, stats.workers) == (5, 3, 1)
+
+
+def ndjson_rows(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_endpoint(client, batch_matcher):
+    lines = [json.dumps({"resume_skills": skills, "top_n": 2}) for skills in RESUMES[:3]]
+    response = client.post("/api/match/batch", content="\n".join(lines + ["{not json"]),
+                           headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 200
+    *rows, last = ndjson_rows(response)
+    assert last["stats"]["requests"] == 4
+    by_index = {row["index"]: row for row in rows}
+    assert sorted(by_index) == [0, 1, 2, 3]
+    assert all(len(by_index[i]["matches"]) == 2 for i in range(3))
+    assert "error" in by_index[3]
+
+    response = client.post("/api/match/batch", params={"format": "json-array"},
+                           json={"requests": [{"resume_skills": RESUMES[0], "top_n": 1}]})
+    rows = response.json()
+    assert rows[0]["index"] == 0 and len(rows[0]["matches"]) == 1
+    assert rows[-1]["stats"]["requests"] == 1
+
+
+def test_batch_endpoint_refuses_oversized_batches(client, batch_matcher, monkeypatch):
+    monkeypatch.setattr(main, "MAX_BATCH_REQUESTS", 2)
+    body = [{"resume_skills": skills} for skills in RESUMES[:3]]
+    assert client.post("/api/match/batch", json=body).status_code == 413
+    assert client.post("/api/match/batch", json=body[:2]).status_code == 200
+
+    ndjson = "\n".join(json.dumps(row) for row in body)
+    response = client.post("/api/match/batch", content=ndjson, headers={"content-type": "application/x-ndjson"})
+    assert response.status_code == 413
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from services.bls_batcher import SeriesBatcher
+
+
+class FakeBLS:
+    """Answers like the BLS timeseries API, recording each call"""
+
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, series_ids, start_year, end_year):
+        self.calls.append((list(series_ids), start_year, end_year))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        return {"status": "REQUEST_SUCCEEDED", "message": [], "Results": {"series": [
+            {"seriesID": series_id, "data": [{"year": str(end_year), "value": "1.0"}]}
+            for series_id in series_ids if series_id != "MISSING"
+        ]}}
+
+
+def series_ids(response):
+    return [series["seriesID"] for series in response["Results"]["series"]]
+
+
+def test_concurrent_lookups_share_one_call():
+    bls = FakeBLS()
+    batcher = SeriesBatcher(bls, window=0.01)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.get("A", 2020, 2024), batcher.get("B", 2020, 2024), batcher.get("A", 2020, 2024),
+            batcher.get("MISSING", 2020, 2024), batcher.get("C", 2019, 2024))
+
+    a, b, a_again, missing, c = asyncio.run(run())
+    # One call per year range; "A" is sent once for both callers
+    assert sorted(bls.calls) == [(["A", "B", "MISSING"], 2020, 2024), (["C"], 2019, 2024)]
+    assert series_ids(a) == series_ids(a_again) == ["A"]
+    assert series_ids(b) == ["B"] and series_ids(c) == ["C"]
+    assert missing["Results"]["series"] == [] and missing["status"] == "REQUEST_SUCCEEDED"
+    assert batcher.info()["calls_saved"] == 3
+
+
+def test_full_batches_go_out_at_once():
+    bls = FakeBLS()
+    batcher = SeriesBatcher(bls, max_series=2, window=60)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.get(s, 2020, 2024) for s in ("A", "B", "C", "D"))), timeout=5)
+
+    assert [series_ids(r) for r in asyncio.run(run())] == [["A"], ["B"], ["C"], ["D"]]
+    assert [ids for ids, _, _ in bls.calls] == [["A", "B"], ["C", "D"]]
+
+
+def test_errors_reach_every_caller():
+    batcher = SeriesBatcher(FakeBLS(fail=True), window=0)
+
+    async def run():
+        return await asyncio.gather(batcher.get("A", 2020, 2024), batcher.get("B", 2020, 2024),
+                                    return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+
+def test_a_cancelled_caller_leaves_the_others_served():
+    bls = FakeBLS()
+    batcher = SeriesBatcher(bls, window=0.01)
+
+    async def run():
+        first = asyncio.ensure_future(batcher.get("A", 2020, 2024))
+        second = asyncio.ensure_future(batcher.get("A", 2020, 2024))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert series_ids(asyncio.run(run())) == ["A"]
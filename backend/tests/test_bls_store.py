@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+from services.bls_service import BLSService
+from services.bls_store import BLSStore
+
+
+def point(year, value="1.0"):
+    return {"year": str(year), "period": "A01", "periodName": "Annual", "value": value}
+
+
+def test_daily_quota(tmp_path):
+    store = BLSStore(tmp_path / "bls.sqlite3")
+    assert [store.use_query(2) for _ in range(3)] == [True, True, False]
+    assert store.queries_today() == 2  # the refused query is not counted
+    assert store.use_query(3)
+
+
+def test_incremental_refresh_keeps_the_earliest_range(tmp_path):
+    store = BLSStore(tmp_path / "bls.sqlite3")
+    assert store.coverage("S") is None
+    store.write("S", 2015, [point(2015), point(2016)])
+    store.write("S", 2016, [point(2016, "2.0"), point(2017)])  # a refresh from the latest year
+
+    coverage = store.coverage("S")
+    assert (coverage.start_year, coverage.latest_year) == (2015, 2017)
+    assert [(p["year"], p["value"]) for p in store.read("S", 2015, 2020)] == [
+        ("2017", "1.0"), ("2016", "2.0"), ("2015", "1.0")]
+    assert store.read("S", 2016, 2016) == [point(2016, "2.0")]
+
+    store.write("EMPTY", 2015, [])  # known to have no data, so not re-requested
+    assert store.coverage("EMPTY").latest_year is None
+    assert store.stale_series(60) == []
+    assert {c.series_id for c in store.stale_series(-60)} == {"S", "EMPTY"}
+
+
+class FakeBatcher:
+    """Answers single-series lookups in the BLS API format, recording each call"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get(self, series_id, start_year, end_year):
+        self.calls.append((series_id, start_year, end_year))
+        return {"status": "REQUEST_SUCCEEDED", "message": [], "Results": {"series": [
+            {"seriesID": series_id, "data": [point(end_year)]}]}}
+
+
+def test_series_are_stored_off_the_event_loop(tmp_path, monkeypatch):
+    service = BLSService(store_path=tmp_path / "bls.sqlite3")
+    service.batcher = FakeBatcher()
+    threads = set()
+    coverage = service.store.coverage
+
+    def tracked(series_id):
+        threads.add(threading.get_ident())
+        return coverage(series_id)
+
+    monkeypatch.setattr(service.store, "coverage", tracked)
+
+    async def run():
+        first = await service.get_series_async("S", 2020, 2021)
+        again = await service.get_series_async("S", 2020, 2021)
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert first == again
+    assert len(service.batcher.calls) == 1  # the second lookup is served from the store
+    assert threads and threading.get_ident() not in threads
@@ -0,0 +1,50 @@
+from services.company_directory import CompanyIndex, bounded_edit_distance
+
+# SEC's order: largest companies first
+COMPANIES = [
+    {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    {"cik_str": 789019, "ticker": "MSFT", "title": "Microsoft Corp"},
+    {"cik_str": 1318605, "ticker": "TSLA", "title": "Tesla, Inc."},
+    {"cik_str": 1652044, "ticker": "GOOGL", "title": "Alphabet Inc."},
+    {"cik_str": 1652044, "ticker": "GOOG", "title": "Alphabet Inc."},
+    {"cik_str": 1418091, "ticker": "APLD", "title": "Applied Digital Corp."},
+    {"cik_str": 6951, "ticker": "AMAT", "title": "Applied Materials Inc"},
+    {"cik_str": 1000001, "ticker": "APLE", "title": "Apple Hospitality REIT, Inc."},
+]
+
+
+def tickers(companies):
+    return [company["ticker"] for company in companies]
+
+
+def test_edit_distance():
+    assert bounded_edit_distance("tesla", "tesla", 1) == 0
+    assert bounded_edit_distance("tesal", "tesla", 1) == 1  # transposition
+    assert bounded_edit_distance("teslaa", "tesla", 1) == 1
+    assert bounded_edit_distance("tssla", "tesla", 0) is None
+    assert bounded_edit_distance("microsfot", "microsoft corp", 2, prefix=True) == 1
+
+
+def test_prefix_search_ranks_whole_words_and_popularity():
+    index = CompanyIndex(COMPANIES)
+    assert tickers(index.search("app", 10)) == ["AAPL", "APLE", "APLD", "AMAT"]
+    assert tickers(index.search("apple", 10)) == ["AAPL", "APLE"]
+    assert tickers(index.search("applied mat", 10)) == ["AMAT"]
+    assert tickers(index.search("apple", 1)) == ["AAPL"]
+    assert index.search("", 10) == [] and index.search("apple", 0) == []
+
+
+def test_fuzzy_search_only_without_exact_matches():
+    index = CompanyIndex(COMPANIES)
+    assert tickers(index.search("microsfot", 10)) == ["MSFT"]
+    assert tickers(index.search("tesal", 10)) == ["TSLA"]
+    assert tickers(index.search("alphabte inc", 10)) == ["GOOGL", "GOOG"]
+    assert index.search("xyzzy", 10) == []
+
+
+def test_ticker_matches():
+    index = CompanyIndex(COMPANIES)
+    assert tickers(index.search("tsla", 3))[0] == "TSLA"
+    assert tickers(index.search("GOOG", 3))[:2] == ["GOOG", "GOOGL"]
+    assert index.get_by_ticker(" msft ")["title"] == "Microsoft Corp"
+    assert tickers(index.get_by_cik("0001652044")) == ["GOOGL", "GOOG"]
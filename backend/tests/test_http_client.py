@@ -0,0 +1,27 @@
+import asyncio
+
+import httpx
+
+from services.http_client import AsyncHTTPClient
+
+
+def test_each_event_loop_gets_its_own_client():
+    seen = []
+
+    async def handler(request):
+        await asyncio.sleep(0.001)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    http = AsyncHTTPClient(per_host_limit=1, transport=httpx.MockTransport(handler))
+
+    async def fetch():
+        # Contended, so the per-host semaphore has to wait on this loop
+        responses = await asyncio.gather(*(http.get(f"https://data.test/{i}") for i in range(3)))
+        seen.append(http.client)
+        await http.aclose()
+        return [response.json()["path"] for response in responses]
+
+    # As in a script or test calling asyncio.run() more than once
+    assert asyncio.run(fetch()) == ["/0", "/1", "/2"]
+    assert asyncio.run(fetch()) == ["/0", "/1", "/2"]
+    assert seen[0] is not seen[1] and seen[0].is_closed
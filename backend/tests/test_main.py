@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+import main
+
+
+def test_search_streams_the_same_rows(client):
+    page = client.get("/api/occupations/search", params={"q": "nurse", "limit": 5}).json()
+    ndjson = client.get("/api/occupations/search", params={"q": "nurse", "limit": 5, "format": "ndjson"})
+    array = client.get("/api/occupations/search", params={"q": "nurse", "limit": 5, "format": "json-array"})
+
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == page["results"]
+    assert array.json() == page["results"]
+    assert client.get("/api/occupations/search", params={"q": "zzqx", "format": "json-array"}).json() == []
+    assert client.get("/api/occupations/search", params={"q": "nurse", "format": "xml"}).status_code == 400
+
+
+@pytest.mark.parametrize("body", [{"resumes": []}, {"requests": "nope"}, "nope"])
+def test_batch_rejects_malformed_bodies(client, body):
+    assert client.post("/api/match/batch", json=body).status_code == 400
+
+
+def test_company_search_clamps_the_limit(client, monkeypatch):
+    from services.company_directory import CompanyIndex
+
+    monkeypatch.setattr(main.sec_service.directory, "_index", CompanyIndex([
+        {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+        {"cik_str": 1000001, "ticker": "APLE", "title": "Apple Hospitality REIT, Inc."},
+    ]))
+    for format in ("json", "json-array"):
+        response = client.get("/api/companies/search", params={"q": "apple", "limit": -1, "format": format})
+        assert response.status_code == 200
+        assert (response.json()["results"] if format == "json" else response.json()) == []
+    assert client.get("/api/companies/search", params={"q": "apple"}).json()["count"] == 2
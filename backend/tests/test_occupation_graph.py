@@ -0,0 +1,104 @@
+import heapq
+import random
+
+import pytest
+
+from services.occupation_graph import RANK_COST, TIER_COSTS, TIERS, OccupationGraph
+
+SHORT, _, SUPPLEMENTAL = TIERS
+
+
+@pytest.fixture
+def graph() -> OccupationGraph:
+    # a -> b -> c -> d is cheap; a -> d directly is a supplemental step
+    return OccupationGraph.from_rows([
+        ("a", "b", SHORT, "1"),
+        ("a", "d", SUPPLEMENTAL, "20"),
+        ("a", "a", SHORT, "3"),  # self-links are dropped
+        ("b", "c", SHORT, "1"),
+        ("c", "d", SHORT, "1"),
+        ("d", "e", "Unknown", "1"),  # so are unknown tiers
+        ("e", "a", SHORT, "1"),
+    ])
+
+
+def test_related_in_tier_order(graph):
+    assert len(graph) == 5 and graph.edge_count == 5
+    assert graph.related("a") == ["b", "d"]
+    assert graph.related("a", OccupationGraph.tier_limit("primary-short")) == ["b"]
+    assert graph.related("d") == [] and graph.related("zz") == []
+    with pytest.raises(ValueError, match="Unknown relatedness tier"):
+        OccupationGraph.tier_limit("Secondary")
+
+
+def test_neighborhood_is_limited_by_hops(graph):
+    one = graph.neighborhood("a")
+    assert [(n.code, n.hops, n.tier) for n in one] == [("b", 1, SHORT), ("d", 1, SUPPLEMENTAL)]
+    assert one[1].cost == round(TIER_COSTS[2] + 20 * RANK_COST, 4)
+
+    three = graph.neighborhood("a", hops=3)
+    assert [n.code for n in three] == ["b", "c", "d"]
+    # d is one hop away, but cheapest through b and c
+    d = three[2]
+    assert (d.hops, d.tier) == (1, SHORT)
+    assert d.cost == round(3 * (TIER_COSTS[0] + RANK_COST), 4)
+
+    assert graph.neighborhood("a", hops=3, limit=1)[0].code == "b"
+    # within two short steps, d is only reachable by its supplemental edge
+    assert [n.code for n in graph.neighborhood("a", hops=2, max_tier=0)] == ["b", "c"]
+    assert graph.neighborhood("a", hops=2)[2].cost == one[1].cost
+    assert graph.neighborhood("e", hops=10)[-1].code == "d"  # never back to the source
+
+
+def test_shortest_path(graph):
+    path = graph.shortest_path("a", "d")
+    assert (path.codes, path.tiers) == (["a", "b", "c", "d"], [SHORT] * 3)
+    assert graph.shortest_path("b", "a") is None
+    assert graph.shortest_path("e", "d", max_tier=0).codes == ["e", "a", "b", "c", "d"]
+    assert graph.shortest_path("d", "a") is None  # edges are one-way
+    assert graph.shortest_path("a", "a").codes == ["a"]
+    assert graph.shortest_path("a", "zz") is None
+
+
+def dijkstra(graph, source, target):
+    costs, heap = {source: 0.0}, [(0.0, source)]
+    while heap:
+        c, node = heapq.heappop(heap)
+        if node == target:
+            return c
+        for e in range(graph.offsets[node], graph.offsets[node + 1]):
+            nc = c + graph.weights[e]
+            if nc < costs.get(graph.targets[e], float("inf")):
+                costs[graph.targets[e]] = nc
+                heapq.heappush(heap, (nc, graph.targets[e]))
+    return None
+
+
+def test_bidirectional_search_matches_dijkstra():
+    rng = random.Random(7)
+    codes = [f"{i:02d}-0000.00" for i in range(60)]
+    rows = [(code, rng.choice(codes), rng.choice(TIERS), str(rank))
+            for code in codes for rank in range(1, rng.randint(1, 5))]
+    graph = OccupationGraph.from_rows(rows)
+    for _ in range(200):
+        source, target = rng.sample(graph.nodes, 2)
+        path = graph.shortest_path(source, target)
+        expected = dijkstra(graph, graph.node_index[source], graph.node_index[target])
+        if expected is None:
+            assert path is None
+        else:
+            assert path.cost == pytest.approx(expected, abs=1e-3)
+            assert (path.codes[0], path.codes[-1]) == (source, target)
+            assert len(path.tiers) == len(path.codes) - 1
+
+
+def test_career_path_endpoint(client, onet):
+    related = onet.get_related_occupations("15-1252", hops=2, limit=20)
+    assert related and all(r["hops"] in (1, 2) for r in related)
+    assert [r["cost"] for r in related] == sorted(r["cost"] for r in related)
+
+    target = related[-1]["code"]
+    response = client.get(f"/api/occupations/15-1252.00/path/{target}")
+    assert response.status_code == 200
+    path = response.json()["path"]
+    assert path[0]["code"] == "15-1252.00" and path[-1]["code"] == target
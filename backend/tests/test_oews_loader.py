@@ -0,0 +1,108 @@
+import zipfile
+
+import pytest
+import requests
+
+import ingest_oews
+from services.oews_loader import normalize_soc_code, read_oews_table
+
+HEADER = ["AREA", "NAICS", "OWN_CODE", "OCC_CODE", "OCC_TITLE", "O_GROUP", "TOT_EMP",
+          "H_MEAN", "A_MEAN", "H_MEDIAN", "A_MEDIAN"]
+ROWS = [
+    ["99", "000000", "1235", "00-0000", "All Occupations", "total", "151,853,870", "31.48", "65470", "23.80", "49500"],
+    ["99", "000000", "1235", "15-1252", "Software Developers", "detailed", "1,654,440", "69.50", "144570", "63.59", "132270"],
+    ["99", "000000", "1235", "25-2021", "Elementary School Teachers", "detailed", "1,340,830", "*", "70740", "*", "63680"],
+    ["99", "000000", "1235", "29-1141", "Registered Nurses", "detailed", "**", "#", "#", "~", "~"],
+    ["99", "541500", "1235", "15-1252", "Software Developers", "detailed", "900,000", "75.00", "156000", "70.00", "145600"],
+]
+
+NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+REL_NS = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+
+
+def sheet_xml(rows):
+    cells = "".join(
+        f'<row r="{i + 1}">' + "".join(
+            f'<c r="{chr(65 + j)}{i + 1}" t="inlineStr"><is><t>{value}</t></is></c>' for j, value in enumerate(row)
+        ) + "</row>"
+        for i, row in enumerate(rows))
+    return f'<?xml version="1.0"?><worksheet {NS}><sheetData>{cells}</sheetData></worksheet>'
+
+
+def write_workbook(path, sheets):
+    """An .xlsx whose sheet files are numbered in reverse of the workbook order"""
+    members = [(name, f"worksheets/sheet{len(sheets) - i}.xml", rows) for i, (name, rows) in enumerate(sheets)]
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("xl/workbook.xml", f'<workbook {NS} {REL_NS}><sheets>' + "".join(
+            f'<sheet name="{name}" sheetId="{i + 1}" r:id="rId{i + 1}"/>' for i, (name, _, _) in enumerate(members)
+        ) + "</sheets></workbook>")
+        archive.writestr("xl/_rels/workbook.xml.rels",
+                         '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">' + "".join(
+                             f'<Relationship Id="rId{i + 1}" Target="{target}"/>'
+                             for i, (_, target, _) in enumerate(members)
+                         ) + "</Relationships>")
+        for _, target, rows in members:
+            archive.writestr(f"xl/{target}", sheet_xml(rows))
+    return path
+
+
+def test_normalize_soc_code():
+    assert [normalize_soc_code(code) for code in ("15-1252.00", "151252", " 15-1252 ", "15-125", "abc")] == [
+        "15-1252", "15-1252", "15-1252", None, None]
+
+
+def test_reads_the_data_sheet_of_a_workbook(tmp_path):
+    path = write_workbook(tmp_path / "national_M2024_dl.xlsx", [
+        ("Field Descriptions", [["Field", "Field Description"], ["OCC_CODE", "The 6-digit SOC code"]]),
+        ("national_M2024_dl", [HEADER] + ROWS),
+    ])
+    wages = {wage.soc_code: wage for wage in read_oews_table(path)}
+
+    assert list(wages) == ["00-0000", "15-1252", "25-2021", "29-1141"]  # the industry row is skipped
+    developers = wages["15-1252"]
+    assert (developers.year, developers.occ_group, developers.total_employment) == (2024, "detailed", 1654440)
+    assert (developers.hourly_mean, developers.hourly_median) == (69.50, 63.59)
+    teachers = wages["25-2021"]  # published with annual wages only
+    assert (teachers.hourly_mean, teachers.hourly_median) == (round(70740 / 2080, 2), round(63680 / 2080, 2))
+    nurses = wages["29-1141"]  # suppressed estimates
+    assert (nurses.total_employment, nurses.hourly_mean, nurses.hourly_median) == (None, None, None)
+
+
+def test_reads_the_table_inside_the_release_archive(tmp_path):
+    csv_text = "\n".join(",".join(f'"{value}"' for value in row) for row in [HEADER] + ROWS[:2])
+    with zipfile.ZipFile(tmp_path / "oesm24nat.zip", "w") as archive:
+        archive.writestr("oesm24nat/field_descriptions.csv", "Field,Description\n")
+        archive.writestr("oesm24nat/national_M2024_dl.csv", csv_text)
+    assert [(w.soc_code, w.year) for w in read_oews_table(tmp_path / "oesm24nat.zip")] == [
+        ("00-0000", 2024), ("15-1252", 2024)]
+
+    (tmp_path / "national_M2024_dl.csv").write_text("OCC_TITLE,TOT_EMP\n")
+    with pytest.raises(ValueError, match="OCC_CODE"):
+        list(read_oews_table(tmp_path / "national_M2024_dl.csv"))
+
+
+class Response:
+    content = b"<html>Access Denied</html>"
+
+    def raise_for_status(self):
+        pass
+
+
+def test_failed_download_keeps_the_cached_table(tmp_path, monkeypatch):
+    cached = tmp_path / "oesm24nat.zip"
+    cached.write_bytes(b"cached")
+    monkeypatch.setattr(ingest_oews.requests, "get", lambda *args, **kwargs: Response())
+    with pytest.raises(ValueError, match="zip"):
+        ingest_oews.download_table(directory=tmp_path)
+    assert cached.read_bytes() == b"cached"
+    assert [p.name for p in tmp_path.iterdir()] == ["oesm24nat.zip"]
+
+    def offline(*args, **kwargs):
+        raise requests.ConnectionError("offline")
+
+    ingested = []
+    monkeypatch.setattr(ingest_oews, "download_table", offline)
+    monkeypatch.setattr(ingest_oews, "find_table", lambda: cached)
+    monkeypatch.setattr(ingest_oews, "ingest", lambda path: ingested.append(path) or 1)
+    assert ingest_oews.main(["--download"])
+    assert ingested == [cached]
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from services import onet_service
+from services.onet_service import OnetService
+from services.onet_snapshot import SnapshotWriter, open_snapshot
+
+
+def test_search_pages_line_up(onet):
+    for query in ("software", "nurse"):
+        full = onet.search_occupations(query, limit=10)
+        assert onet.search_occupations(query, limit=5, offset=5) == full[5:]
+    assert [row["code"] for row in onet.search_occupations("  ", limit=3)] == sorted(onet.occupations)[:3]
+
+
+def test_skills_are_serialized_only_for_returned_rows(onet, monkeypatch):
+    serialized = []
+    serialize = onet._serialize_skill
+    monkeypatch.setattr(onet, "_serialize_skill", lambda skill: serialized.append(skill) or serialize(skill))
+
+    assert all("skills" not in row for row in onet.search_occupations("work", limit=50))
+    assert serialized == []
+    rows = onet.search_occupations("work", limit=3, offset=2, include_skills=True)
+    assert len(rows) == 3
+    assert len(serialized) == sum(len(row["skills"]) for row in rows)
+    assert rows[0]["skills"][0].keys() >= {"id", "name", "importance"}
+
+
+def test_search_endpoint_pages(client):
+    body = client.get("/api/occupations/search", params={"q": "work"}).json()
+    assert body["count"] == 10 and "skills" not in body["results"][0]  # DEFAULT_LIMIT
+    page = client.get("/api/occupations/search", params={"q": "work", "limit": 5, "offset": 5,
+                                                         "include_skills": True}).json()
+    assert [row["code"] for row in page["results"]] == [row["code"] for row in body["results"][5:]]
+    assert all("skills" in row for row in page["results"])
+
+
+@pytest.fixture(scope="module")
+def snapshot_path(onet, tmp_path_factory):
+    return onet.write_snapshot(tmp_path_factory.mktemp("onet") / "onet.snapshot")
+
+
+def test_service_loads_its_snapshot(onet, snapshot_path, monkeypatch):
+    monkeypatch.setattr(onet_service, "SNAPSHOT_PATH", snapshot_path)
+    loaded = OnetService()
+
+    assert loaded.data_path == str(snapshot_path)
+    assert list(loaded.occupations) == list(onet.occupations)
+    assert loaded.skill_matrix.codes == onet.skill_matrix.codes
+    assert np.array_equal(loaded.skill_matrix.importance, onet.skill_matrix.importance)
+    assert loaded.search_occupations("nurse", limit=5) == onet.search_occupations("nurse", limit=5)
+    assert ([m.occupation_code for m in loaded.match_skills(["Programming", "Python"], 5)]
+            == [m.occupation_code for m in onet.match_skills(["Programming", "Python"], 5)])
+
+
+def test_mismatched_section_leaves_service_untouched(onet, snapshot_path, tmp_path, monkeypatch):
+    source = open_snapshot(snapshot_path)
+    sections = {name: bytes(view) for name, view in source.sections.items()}
+    digest = source.source_digest
+    source.close()
+    sections["occ.title"] = sections["occ.title"][:-4]  # one occupation short
+    writer = SnapshotWriter()
+    for name, data in sections.items():
+        writer.add(name, data)
+    writer.write(tmp_path / "onet.snapshot", digest)
+    monkeypatch.setattr(onet_service, "SNAPSHOT_PATH", tmp_path / "onet.snapshot")
+
+    before = dict(vars(onet))
+    assert not onet._load_snapshot()
+    assert vars(onet) == before
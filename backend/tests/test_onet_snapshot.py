@@ -0,0 +1,93 @@
+import os
+from array import array
+
+import numpy as np
+import pytest
+
+from services.onet_snapshot import (HEADER, SNAPSHOT_VERSION, SnapshotError, SnapshotWriter, StringTable,
+                                    compute_source_digest, open_snapshot)
+
+DIGEST = b"\x01" * 20
+
+
+def write(path, sections, digest=DIGEST):
+    writer = SnapshotWriter()
+    for name, data in sections.items():
+        writer.add(name, data)
+    writer.write(path, digest)
+    return path
+
+
+def test_round_trip(tmp_path):
+    strings = StringTable()
+    ids = array("I", (strings.intern(s) for s in ("cook", "nurse", "cook")))
+    writer = SnapshotWriter()
+    writer.add("ids", ids)
+    writer.add("plane", array("f", [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]))
+    writer.add_strings("strings", strings)
+    writer.write(tmp_path / "t.snapshot", DIGEST)
+
+    snapshot = open_snapshot(tmp_path / "t.snapshot", DIGEST)
+    table = snapshot.strings("strings")
+    assert [table[i] for i in snapshot.array("ids", "I", 3)] == ["cook", "nurse", "cook"]
+    assert len(table) == 2
+    assert snapshot.matrix("plane", np.float32, (2, 3)).tolist() == [[1, 2, 3], [4, 5, 6]]
+    snapshot.close()
+
+
+def test_rejects_stale_or_foreign_files(tmp_path):
+    path = write(tmp_path / "t.snapshot", {"ids": array("I", [1])})
+    with pytest.raises(SnapshotError, match="stale"):
+        open_snapshot(path, b"\x02" * 20)
+    with pytest.raises(SnapshotError):
+        open_snapshot(tmp_path / "missing.snapshot")
+
+    # Another layout version: the header is outside the checksummed payload
+    data = bytearray(path.read_bytes())
+    magic, _, *rest = HEADER.unpack_from(data)
+    HEADER.pack_into(data, 0, magic, SNAPSHOT_VERSION - 1, *rest)
+    path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError, match="version"):
+        open_snapshot(path)
+
+
+def test_source_digest_tracks_size_and_mtime(tmp_path):
+    source = tmp_path / "Occupation Data.txt"
+    source.write_text("11-1011.00\tChief Executives\n")
+    digest = compute_source_digest([source])
+    assert compute_source_digest([source]) == digest
+
+    os.utime(source, ns=(0, 10 ** 9))
+    touched = compute_source_digest([source])
+    assert touched != digest
+    source.write_text("11-1011.00\tChief Executives!\n")
+    os.utime(source, ns=(0, 10 ** 9))
+    assert compute_source_digest([source]) != touched
+
+
+def test_checksum_is_only_read_when_verifying(tmp_path):
+    path = write(tmp_path / "t.snapshot", {"ids": array("I", [1, 2])})
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    open_snapshot(path).close()  # a boot maps the file without reading every page
+    with pytest.raises(SnapshotError, match="checksum"):
+        open_snapshot(path, verify=True)
+
+    path.write_bytes(bytes(data[:-4]))
+    with pytest.raises(SnapshotError, match="truncated"):
+        open_snapshot(path)
+
+
+def test_rejects_sections_of_another_size(tmp_path):
+    snapshot = open_snapshot(write(tmp_path / "t.snapshot", {"ids": array("I", [1, 2, 3]), "odd": b"\0" * 6}))
+    with pytest.raises(SnapshotError, match="ids"):
+        snapshot.array("ids", "I", 4)
+    with pytest.raises(SnapshotError, match="odd"):
+        snapshot.array("odd", "I")
+    with pytest.raises(SnapshotError, match="ids"):
+        snapshot.matrix("ids", np.float32, (2, 2))
+    with pytest.raises(SnapshotError, match="nope"):
+        snapshot.section("nope")
+    snapshot.close()
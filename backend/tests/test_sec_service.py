@@ -0,0 +1,14 @@
+import time
+
+import main
+
+
+def test_companies_wait_for_the_listing(client, monkeypatch):
+    # Not loaded, and not retrying the download for another minute
+    directory = main.sec_service.directory
+    monkeypatch.setattr(directory, "_index", None)
+    monkeypatch.setattr(directory, "_retry_at", time.time() + 60)
+    for path in ("/api/companies/search?q=apple", "/api/companies/ticker/AAPL"):
+        response = client.get(path)
+        assert response.status_code == 503
+        assert int(response.headers["retry-after"]) > 0
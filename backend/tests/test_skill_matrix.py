@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from services.skill_matrix import SkillMatrix
+
+ELEMENTS = ["Programming", "Critical Thinking", "Speaking", "Welding"]
+
+
+@pytest.fixture
+def matrix() -> SkillMatrix:
+    importance = np.array([
+        [4.5, 3.5, 3.0, 0.0],  # developer
+        [0.0, 3.0, 3.5, 0.0],  # model: a short profile of generic skills
+        [0.0, 3.0, 2.5, 4.0],  # welder
+    ], dtype=np.float32)
+    return SkillMatrix(["dev", "model", "welder"], [f"e{j}" for j in range(len(ELEMENTS))], ELEMENTS,
+                       importance, importance * 0.8)
+
+
+def codes(matches):
+    return [match.occupation_code for match in matches]
+
+
+def test_rare_requirements_outweigh_short_profiles(matrix):
+    # Both cover every requirement of "model"; only "dev" needs Programming
+    matches = matrix.match(["Programming", "Critical Thinking", "Speaking"])
+    assert codes(matches) == ["dev", "model", "welder"]
+    assert matches[0].missing_skills == []
+
+
+def test_scores_are_bounded_and_explained(matrix):
+    scores = matrix.score(matrix.vectorize(["Critical Thinking", "welding"]))
+    assert ((scores >= 0) & (scores <= 1)).all()
+
+    [match] = matrix.match(["Welding"], n=1)
+    assert match.occupation_code == "welder"
+    assert match.matched_skills == ["Welding"]
+    assert [gap.name for gap in match.missing_skills] == ["Critical Thinking", "Speaking"]
+
+
+def test_batch_and_targeted_scores_agree(matrix):
+    resumes = [["Programming"], ["Speaking", "Welding"], ["Unknown skill"]]
+    batch = matrix.match_batch(resumes, n=3)
+    assert batch == [matrix.match(resume, n=3) for resume in resumes]
+    assert batch[2] == []  # nothing recognised, nothing listed
+
+    for resume, matches in zip(resumes[:2], batch):
+        for match in matches:
+            [targeted] = matrix.match(resume, occupation_code=match.occupation_code)
+            assert targeted.match_score == match.match_score
+    assert matrix.match(["Programming"], occupation_code="nurse") == []
+
+
+SOFTWARE_RESUME = ["Python programming", "comms", "Critical Thinking", "Kubernetes", "SQL"]
+
+
+def test_match_resumes(onet):
+    software, targeted, unrated, nothing = onet.match_resumes([
+        (SOFTWARE_RESUME, None, 5),
+        (SOFTWARE_RESUME, "15-1252.00", 10),
+        (SOFTWARE_RESUME, "00-0000.00", 10),
+        (["zzqx"], None, 3),
+    ])
+
+    assert len(software) == 5
+    assert [m.match_score for m in software] == sorted((m.match_score for m in software), reverse=True)
+    assert all(m.occupation_code.startswith("15-") for m in software)
+    assert "15-1252.00" in codes(software)
+    assert "Programming" in software[0].matched_skills
+    assert "Kubernetes" in software[0].matched_technologies
+
+    [match] = targeted
+    assert match.occupation_code == "15-1252.00" and match.match_score > 0
+    assert [(m.occupation_code, m.match_score) for m in unrated] == [("00-0000.00", 0)]
+    assert isinstance(nothing, list)
+
+
+def test_match_endpoint(client):
+    response = client.post("/api/match", json={"resume_skills": ["Python programming", "SQL"], "top_n": 3})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["matches"]) == 3
+    assert body["occupation_code"] == body["matches"][0]["occupation_code"]
+    assert body["recommendation"]
@@ -0,0 +1,88 @@
+import pytest
+
+from services.skill_normalizer import SkillElement, SkillNormalizerBuilder, normalize_skill
+
+ELEMENTS = [
+    SkillElement("2.A.1.e", "Mathematics", "Skill"),
+    SkillElement("2.B.3.e", "Programming", "Skill"),
+    SkillElement("2.C.4.a", "Mathematics", "Knowledge"),
+    SkillElement("2.C.8.a", "Public Safety and Security", "Knowledge"),
+    SkillElement("2.C.1.f", "Food Production", "Knowledge"),
+    SkillElement("2.C.4.c", "Medicine and Dentistry", "Knowledge"),
+    SkillElement("2.C.3.a", "Computers and Electronics", "Knowledge"),
+]
+
+
+@pytest.fixture
+def normalizer():
+    builder = SkillNormalizerBuilder([element.name for element in ELEMENTS])
+    for name in ("Python", "Oracle Java", "Structured query language SQL", "Salesforce software"):
+        builder.add_technology(name)
+    return builder.build(ELEMENTS)
+
+
+def resolve(normalizer, skill):
+    [result] = normalizer.normalize([skill])
+    return result.method, [(e.name, e.category) for e in result.elements], [t.name for t in result.technologies]
+
+
+def test_normalize_skill():
+    assert normalize_skill("Strong MS-Excel skills") == "microsoft excel"
+    assert normalize_skill("Python programming") == "python programm"
+
+
+def test_layers(normalizer):
+    assert resolve(normalizer, "Python") == ("exact", [], ["Python"])
+    assert resolve(normalizer, "sql") == ("exact", [], ["Structured query language SQL"])
+    assert resolve(normalizer, "Salesforce") == ("exact", [], ["Salesforce software"])
+    assert resolve(normalizer, "coding") == ("alias", [("Programming", "Skill")], [])
+    assert resolve(normalizer, "Python programming") == ("phrase", [("Programming", "Skill")], ["Python"])
+    assert resolve(normalizer, "Progamming")[:2] == ("fuzzy", [("Programming", "Skill")])
+    assert resolve(normalizer, "zzqx") == ("", [], [])
+
+
+def test_shared_names_name_one_column(normalizer):
+    # Mathematics is a Skill and a Knowledge area; like SkillMatrix.name_index, the first column wins
+    assert resolve(normalizer, "Mathematics") == ("exact", [("Mathematics", "Skill")], [])
+    assert resolve(normalizer, "maths")[1] == [("Mathematics", "Skill")]
+    assert normalizer.columns(["Mathematics", "statistics", "applied mathematics"]) == [0]
+
+
+def test_generic_words_do_not_stand_for_longer_skills(normalizer):
+    assert resolve(normalizer, "safety")[1] == [("Public Safety and Security", "Knowledge")]
+    assert resolve(normalizer, "food safety") == ("alias", [("Food Production", "Knowledge")], [])
+    assert resolve(normalizer, "customer safety") == ("", [], [])
+    assert resolve(normalizer, "cyber security")[1] == [
+        ("Computers and Electronics", "Knowledge"), ("Public Safety and Security", "Knowledge")]
+    # Still counted when the rest of the skill is recognised too
+    assert resolve(normalizer, "clinical research") == ("phrase", [("Medicine and Dentistry", "Knowledge")], [])
+
+
+def test_healthcare_aliases(normalizer):
+    for skill in ("nursing", "patient care", "vital signs", "CPR", "pediatric nursing"):
+        assert ("Medicine and Dentistry", "Knowledge") in resolve(normalizer, skill)[1], skill
+
+
+def test_normalize_skills(onet):
+    k8s, typo, comms, phrase, unknown = onet.normalize_skills(
+        ["k8s", "Progamming", "comms", "Python programming", "zzqx"])
+    assert [t.name for t in k8s.technologies] == ["Kubernetes"]
+    assert (typo.method, [e.name for e in typo.elements]) == ("fuzzy", ["Programming"])
+    assert {e.name for e in comms.elements} == {"Speaking", "Writing"}
+    assert [e.name for e in phrase.elements] == ["Programming"]
+    assert [t.name for t in phrase.technologies] == ["Python"]
+    assert (unknown.method, unknown.elements, unknown.technologies) == ("", [], [])
+
+
+def test_shared_names_are_scored_once(onet):
+    [[match]] = onet.match_resumes([(["Mathematics"], "15-2041.00", 1)])
+    assert match.matched_skills == ["Mathematics"]
+
+
+def test_nursing_resume_ranks_nurses(onet):
+    [matches] = onet.match_resumes([(["nursing", "patient care", "medication administration", "vital signs", "CPR"],
+                                     None, 10)])
+    codes = [match.occupation_code for match in matches]
+    assert "29-1141.00" in codes  # Registered Nurses
+    assert sum(code.startswith("29-") for code in codes) >= 5
+    assert "Medicine and Dentistry" in matches[0].matched_skills
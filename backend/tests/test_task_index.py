@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from services.task_index import MAX_BULLETS, TaskIndexBuilder, split_bullets, stem, terms
+
+CODES = ["11-3031.00", "35-2014.00", "15-1252.00", "29-1141.00"]
+
+
+@pytest.fixture
+def index():
+    builder = TaskIndexBuilder()
+    builder.add_task("11-3031.00", "t1", "Prepare operational and budget reports for management.")
+    builder.add_task("11-3031.00", "t2", "Supervise employees performing financial reporting.")
+    builder.add_task("35-2014.00", "t3", "Cook meats and vegetables on the grill.")
+    builder.add_task("35-2014.00", "t4", "Inspect food preparation areas for sanitation.")
+    builder.add_task("15-1252.00", "t5", "Modify existing software to correct errors.")
+    builder.add_dwa("t5", "Debug computer programs")
+    builder.add_task("99-9999.00", "t6", "Not an indexed occupation.")
+    return builder.build(CODES)
+
+
+def test_terms():
+    assert [stem(word) for word in ("budgets", "coordinating", "supplies", "boxes", "bus")] == [
+        "budget", "coordinat", "supply", "box", "bus"]
+    assert terms("Prepared the budgets") == ["prepar", "budget", "prepar budget"]
+    assert split_bullets("• Led a team\n- Cut costs 10%. Shipped v2;\nok") == [
+        "Led a team", "Cut costs 10%.", "Shipped v2;"]
+    assert len(split_bullets("line\n" * 100)) == MAX_BULLETS
+
+
+def test_similarities_are_cosines(index):
+    assert len(index) == 5 and index.info()["tasks"] == 5
+    sims = index.similarities(list(index.texts) + ["zzqx"])
+    assert np.allclose(np.diag(sims)[:4], 1.0, atol=1e-5)
+    assert sims[4, 4] < 0.99  # its DWA title adds terms the text lacks
+    assert ((sims >= 0) & (sims <= 1 + 1e-5)).all()
+    assert not sims[5].any()  # nothing known, nothing similar
+
+
+def test_match_aligns_bullets_with_tasks(index):
+    bullets = ["Prepared budget reports for senior management", "Grilled meats on the line"]
+    top, second = index.match(bullets, limit=2, tasks_per_occupation=1)
+    assert (top.occupation_code, second.occupation_code) in {
+        ("11-3031.00", "35-2014.00"), ("35-2014.00", "11-3031.00")}
+    managers = top if top.occupation_code == "11-3031.00" else second
+    [task] = managers.tasks
+    assert task.task.startswith("Prepare operational") and task.bullet == bullets[0]
+    assert 0 < managers.score <= 0.5  # one of two bullets matched
+
+    # A task's DWA titles count too
+    [developer] = index.match(["Debugged programs"], limit=5)
+    assert developer.occupation_code == "15-1252.00"
+
+    [targeted] = index.match(bullets, occupation_code="11-3031.00")
+    assert targeted.score == managers.score
+    assert index.match(bullets, occupation_code="29-1141.00") == []  # no tasks
+    assert index.match(["zzqx"]) == [] and index.match(["  "]) == []
+
+
+def test_match_tasks(onet):
+    matches = onet.match_tasks("- Administered medications to patients\n- Monitored patient vital signs", limit=5)
+    assert matches and any(m.occupation_code.startswith("29-") for m in matches)
+    assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
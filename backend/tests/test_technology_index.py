@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from services.skill_matrix import TECHNOLOGY_ONLY_WEIGHT, TECHNOLOGY_WEIGHT, SkillMatrix
+from services.technology_index import HOT_WEIGHT, MAX_WEIGHT, TOOL_WEIGHT, TechnologyIndexBuilder
+
+CODES = ["15-1252.00", "15-1244.00", "47-2111.00"]
+
+
+@pytest.fixture
+def index():
+    builder = TechnologyIndexBuilder()
+    builder.add_technology("15-1252.00", "Python", "43232405", "Object or component oriented development software",
+                           True, True)
+    builder.add_technology("15-1252.00", "Kubernetes", "43233004", "Operating system software", True, False)
+    builder.add_technology("15-1244.00", "Kubernetes", "43233004", "Operating system software", False, False)
+    builder.add_technology("15-1244.00", "Bash", "43233004", "Operating system software", False, False)
+    builder.add_tool("47-2111.00", "Multimeters", "41113640", "Multimeters")
+    builder.add_tool("15-1244.00", "Multimeters", "41113640", "Multimeters")
+    builder.add_technology("99-9999.00", "Python", "43232405", "", True, True)  # not an indexed code
+    return builder.build(CODES)
+
+
+def test_entries_and_users(index):
+    assert index.technology_names("15-1252.00") == ["Python", "Kubernetes"]  # hot and in-demand first
+    assert [(e.name, e.kind) for e in index.entries("15-1244.00", include_tools=True)] == [
+        ("Kubernetes", "technology"), ("Bash", "technology"), ("Multimeters", "tool")]
+    assert index.entries("00-0000.00") == []
+
+    assert index.resolve(" KUBERNETES ") == index.resolve("Kubernetes") is not None
+    assert [(u.code, u.hot_technology) for u in index.users("kubernetes")] == [
+        ("15-1252.00", True), ("15-1244.00", False)]
+    assert [u.code for u in index.users("Kubernetes", hot_only=True)] == ["15-1252.00"]
+    assert index.users("Cobol") == []
+    assert not index.is_software(index.resolve("Multimeters"))
+
+
+def test_overlap_and_ranking(index):
+    name_ids = index.resolve_all(["Python", "Kubernetes", "Cobol"])
+    assert len(name_ids) == 2
+    overlap = index.overlap(name_ids)
+    assert overlap[0] == pytest.approx((MAX_WEIGHT + 1 + HOT_WEIGHT) / (2 * MAX_WEIGHT))
+    assert overlap[1] == pytest.approx(1 / (2 * MAX_WEIGHT))
+    assert overlap[2] == 0
+
+    ranked = index.rank_occupations(["Kubernetes", "Multimeters"])
+    assert [code for code, _, _ in ranked] == ["15-1252.00", "15-1244.00", "47-2111.00"]
+    assert ranked[1][1] == pytest.approx(1 + TOOL_WEIGHT)
+    assert ranked[1][2] == ["Kubernetes", "Multimeters"]
+    assert index.matching_names("15-1244.00", name_ids) == ["Kubernetes"]
+    assert index.rank_occupations(["Cobol"]) == []
+
+
+def test_technology_overlap_blends_in():
+    importance = np.array([[4.0, 3.0], [0.0, 3.5], [2.0, 2.5]], dtype=np.float32)
+    matrix = SkillMatrix(["dev", "model", "welder"], ["e0", "e1"], ["Programming", "Speaking"],
+                         importance, importance * 0.8)
+    resumes = [["Speaking"], []]
+    vectors = matrix.vectorize_batch(resumes)
+    technologies = np.array([[0.0, 0.0, 1.0], [1.0, 0.5, 0.0]], dtype=np.float32)
+
+    plain = matrix.score(vectors)
+    blended = matrix.blend(plain, vectors, technologies)
+    assert np.allclose(blended[0], (1 - TECHNOLOGY_WEIGHT) * plain[0] + TECHNOLOGY_WEIGHT * technologies[0])
+    # Technologies alone never make a perfect match
+    assert np.allclose(blended[1], TECHNOLOGY_ONLY_WEIGHT * technologies[1])
+
+    with_tech, tech_only = matrix.match_batch(resumes, vectors=vectors, technologies=technologies)
+    assert [m.occupation_code for m in with_tech] == [matrix.codes[i] for i in np.argsort(-blended[0], kind="stable")]
+    assert [(m.occupation_code, m.match_score) for m in tech_only] == [
+        ("dev", round(100 * TECHNOLOGY_ONLY_WEIGHT)), ("model", round(50 * TECHNOLOGY_ONLY_WEIGHT))]
+    [[targeted]] = matrix.match_batch(resumes[:1], occupation_code="welder", vectors=vectors[:1],
+                                      technologies=technologies[:1])
+    assert targeted.match_score == {m.occupation_code: m.match_score for m in with_tech}["welder"]
+
+
+def test_match_resumes_by_technologies(onet):
+    [technologies_only] = onet.match_resumes([(["Kubernetes", "Docker", "Amazon Web Services AWS"], None, 3)])
+    assert 0 < len(technologies_only) <= 3
+    assert all("Kubernetes" in m.matched_technologies for m in technologies_only)
+    assert all(m.match_score <= 100 * TECHNOLOGY_ONLY_WEIGHT for m in technologies_only)
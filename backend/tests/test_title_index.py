@@ -0,0 +1,78 @@
+import pytest
+
+from services.title_index import (ALTERNATE_TITLE_SCORE, PREFIX_WEIGHT, UNQUALIFIED_WEIGHT, VARIANT_WEIGHT,
+                                  TitleIndex, TitleIndexBuilder, title_variants)
+
+CODES = ["11-3031.00", "15-1252.00", "35-2014.00", "11-1011.00"]
+
+
+@pytest.fixture
+def index() -> TitleIndex:
+    builder = TitleIndexBuilder()
+    builder.add_official("11-3031.00", "Financial Managers")
+    builder.add_official("15-1252.00", "Software Developers")
+    builder.add_alternate("15-1252.00", "Software Engineer", sources="03,08")
+    builder.add_reported("15-1252.00", "Software Developer", shown=True)
+    builder.add_official("35-2014.00", "Cooks, Restaurant")
+    builder.add_alternate("35-2014.00", "Line Cook")
+    builder.add_alternate("11-1011.00", "Chief Financial Officer (CFO)")
+    builder.add_official("99-9999.00", "Not In The Index")
+    return builder.build(CODES)
+
+
+def lookup(index, query, limit=10):
+    return [(m.code, m.layer) for m in index.lookup(query, limit)]
+
+
+def test_title_variants():
+    assert title_variants("Chief Financial Officer (CFO)", "Finance Chief") == [
+        ("Chief Financial Officer (CFO)", 1.0), ("Chief Financial Officer", VARIANT_WEIGHT),
+        ("CFO", VARIANT_WEIGHT), ("Finance Chief", VARIANT_WEIGHT)]
+
+
+def test_exact_titles(index):
+    [match] = index.lookup("Line Cook ")
+    assert (match.code, match.layer, match.title) == ("35-2014.00", "exact", "Line Cook")
+    assert match.score == pytest.approx(ALTERNATE_TITLE_SCORE)
+    assert lookup(index, "cfo") == [("11-1011.00", "exact")]
+    assert lookup(index, "Not in the index") == []  # codes outside the index are dropped
+
+    [senior] = index.lookup("Sr. SWE")  # shorthand, then seniority words
+    assert (senior.code, senior.title) == ("15-1252.00", "Software Engineer")
+    assert senior.score == pytest.approx(UNQUALIFIED_WEIGHT * (ALTERNATE_TITLE_SCORE + 0.04))
+
+
+def test_prefix_and_typo_layers(index):
+    # "Software Developer" is shorter than "Software Developers" and so ranks first
+    matches = index.lookup("software devel")
+    assert [(m.code, m.layer, m.title) for m in matches] == [("15-1252.00", "prefix", "Software Developer")]
+    assert matches[0].score < PREFIX_WEIGHT
+    assert lookup(index, "fin") == [("11-3031.00", "prefix")]
+    assert lookup(index, "so") == []  # too short to be a prefix
+
+    assert lookup(index, "sofware developers") == [("15-1252.00", "trigram")]
+    assert lookup(index, "plumber") == []
+    assert lookup(index, "", 5) == [] and lookup(index, "software", 0) == []
+
+
+def titles(rows):
+    return [row["title"] for row in rows]
+
+
+@pytest.mark.parametrize("query", ["software", "work", "managment", "data scien", "nurse", "line cook"])
+def test_search_scores_never_increase(onet, query):
+    rows = onet.search_occupations(query, limit=25)
+    assert rows
+    scores = [row["score"] for row in rows]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_ranks_titles_with_full_text(onet):
+    # An exact title comes first, with the title it matched
+    [top] = onet.search_occupations("registered nurse", limit=1)
+    assert top["code"] == "29-1141.00"
+    assert top["matched_title"]
+
+    assert "Software Developers" in titles(onet.search_occupations("software", limit=3))
+    # A typo still finds occupations through the title it most likely meant
+    assert sum("Management" in title for title in titles(onet.search_occupations("managment", limit=10))) >= 3
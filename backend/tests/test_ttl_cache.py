@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services import ttl_cache
+from services.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+class Loader:
+    def __init__(self, value="v"):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f"{self.value}{self.calls}"
+
+
+def test_expiry_and_lru_eviction(clock):
+    cache = TTLCache(max_entries=2, ttl=10, stale_ttl=0)
+    load = Loader()
+    assert cache.get("a", load) == "v1"
+    assert cache.get("a", load) == "v1"
+    clock[0] += 11
+    assert cache.get("a", load) == "v2"  # expired, nothing stale to serve
+
+    cache.get("b", load)
+    cache.get("a", load)  # "a" is now the most recently used
+    cache.get("c", load)
+    assert set(cache._entries) == {"a", "c"}
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (2, 4, 1)
+
+
+def test_stale_while_revalidate(clock):
+    cache = TTLCache(ttl=10, stale_ttl=60)
+    load = Loader()
+    assert cache.get("k", load) == "v1"
+    clock[0] += 30
+    assert cache.get("k", load) == "v1"  # stale, refreshed in the background
+    cache._refresher.shutdown(wait=True)
+    assert cache.get("k", load) == "v2"
+    assert (cache.stats.stale_hits, cache.stats.refreshes) == (1, 1)
+
+    clock[0] += 100  # past the stale window: a plain miss
+    assert cache.get("k", load) == "v3"
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache()
+    release, calls = threading.Event(), []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("k", slow))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.time() + 5
+    while cache.stats.misses + cache.stats.coalesced < 4 and time.time() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["value"] * 4
+    assert len(calls) == 1 and cache.stats.coalesced == 3
+
+
+def test_async_coalescing_and_errors():
+    cache = TTLCache()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        assert await asyncio.gather(*(cache.get_async("k", load) for _ in range(3))) == ["value"] * 3
+        errors = await asyncio.gather(*(cache.get_async("bad", fail) for _ in range(2)), return_exceptions=True)
+        assert all(isinstance(error, RuntimeError) for error in errors)
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert "bad" not in cache._entries  # failures are not cached
+    assert cache.stats.errors == 1
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from services.vector_index import VectorIndexBuilder
+
+THEMES = {
+    "35": "cook meals grill kitchen food preparation sanitation",
+    "29": "nurse patient care medication hospital vital signs",
+    "15": "software code programming debug database systems",
+}
+QUALIFIERS = ["senior", "line", "lead", "night", "relief", "head"]
+
+
+@pytest.fixture(scope="module")
+def index():
+    builder = VectorIndexBuilder()
+    codes = []
+    for group, text in THEMES.items():
+        for i, qualifier in enumerate(QUALIFIERS):
+            code = f"{group}-10{i:02d}.00"
+            codes.append(code)
+            builder.add(code, f"{qualifier} {text}", 1.0)
+            builder.add(code, text.split()[i % 4], 3.0)  # a title word of its own
+    return builder.build(codes, dimensions=8, n_lists=3)
+
+
+def test_vectors_are_unit_length(index):
+    assert len(index) == 18
+    assert np.allclose(np.linalg.norm(index.vectors, axis=1), 1.0, atol=1e-5)
+    assert index.info()["lists"] == 3
+    assert int(index.offsets[-1]) == 18 and sorted(index.rows.tolist()) == list(range(18))  # every row in one cell
+
+
+def test_search_finds_the_closest_theme(index):
+    for group, query in (("35", "grilled food in a busy kitchen"), ("29", "gave patients medication"),
+                         ("15", "debugged database code")):
+        matches = index.search(query, limit=6)
+        assert matches and all(m.occupation_code.startswith(group) for m in matches[:3])
+        assert [m.similarity for m in matches] == sorted((m.similarity for m in matches), reverse=True)
+    assert index.search("zzqx quux") == [] and index.search("") == []
+    assert index.search("kitchen", limit=0) == []
+
+
+def test_probing_every_cell_is_exact(index):
+    query = index.vectorize("patient care in a hospital")
+    exact = index.search_vector(query, limit=5, exact=True)
+    assert index.search_vector(query, limit=5, probes=3, exact=False) == exact
+    assert len(index.search_vector(query, limit=18, probes=1, exact=False)) < 18
+    assert index.recall([query], limit=5, probes=3) == 1.0
+
+
+def test_match_text(onet):
+    matches = onet.match_text("Registered nurse. Administered medications and monitored patient vital signs.",
+                              limit=5)
+    assert any(m.occupation_code.startswith("29-") for m in matches[:3])
+    assert onet.match_text("zzqx") == []
@@ -5,6 +5,13 @@
 echo "Installing Python dependencies..."
 pip install -r backend/requirements.txt
 
+echo "Compiling O*NET snapshot..."
+python backend/build_onet_snapshot.py
+
+echo "Loading OEWS wage table..."
+# Not fatal: a failed download falls back to the cached table, then to the BLS API
+python backend/ingest_oews.py --download || echo "OEWS wage table not loaded"
+
 echo "Building frontend..."
 npm install
 npm run build
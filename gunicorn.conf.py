@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration - picked up automatically when started from the repo root:
+    gunicorn wsgi:app
+"""
+import os
+import subprocess
+import sys
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Workers import the app themselves; the O*NET data they share is the
+# memory-mapped snapshot, not objects inherited from the master.
+preload_app = False
+
+
+def on_starting(server):
+    """
+    Compile the O*NET snapshot once, before any worker boots, if it is
+    missing or stale. It runs in a child process so the master never loads
+    O*NET data and forks workers without it.
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend", "build_onet_snapshot.py")
+    # Not fatal: workers compile it themselves (one at a time) if this fails
+    subprocess.run([sys.executable, script, "--if-stale"], check=False)
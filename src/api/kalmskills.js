@@ -4,7 +4,7 @@ const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 class KalmSkillsAPI {
   async searchOccupations(query) {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/occupations/search?q=${encodeURIComponent(query)}&limit=10`);
+      const response = await fetch(`${API_BASE_URL}/api/occupations/search?q=${encodeURIComponent(query)}&limit=10&include_skills=true`);
       if (!response.ok) throw new Error('Failed to fetch occupations');
       return await response.json();
     } catch (error) {